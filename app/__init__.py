@@ -1,17 +1,18 @@
 import os
 import json
 from pathlib import Path
-import logging
-from logging.handlers import RotatingFileHandler
 from datetime import datetime
 from flask import Flask, render_template, request, session, g  # + request, session
 from .extensions import db, migrate, login_manager, csrf, mail, babel  # + babel
 from .config import Config
+from .database import configure_engine_options, install_engine_hooks, install_replica_routing
+from .cli import register_cli
+from .page_cache import cache_page
+from . import image_pipeline, logging_queue, profiler, request_id, shared_cache, static_assets, template_cache
+from .services import rating_aggregates
 from .models.user import User
 from flask_login import current_user  # for locale selector
 from flask_babel import get_locale
-from sqlalchemy import func
-from app.models.feedback import Rating
 
 # Blueprints
 from .blueprints.errors import errors_bp
@@ -47,42 +48,9 @@ def _init_sentry(app):
         app.logger.warning(f"Sentry init failed: {e}")
 
 def _init_logging(app):
-    # Base level
-    level_name = app.config.get("LOG_LEVEL", "INFO").upper()
-    level = getattr(logging, level_name, logging.INFO)
-    app.logger.setLevel(level)
-
-    # Ensure log dir exists
-    log_dir = Path(app.config.get("LOG_DIR", "logs"))
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_path = log_dir / app.config.get("LOG_FILENAME", "taskdesk.log")
+    # Queue-backed: request threads never wait on log I/O (see logging_queue.py)
+    logging_queue.init_app(app)
     Path(app.instance_path, "resumes").mkdir(parents=True, exist_ok=True)
-
-
-    # Formatter: text or JSON
-    if app.config.get("LOG_JSON", False):
-        try:
-            import json_log_formatter
-            formatter = json_log_formatter.JSONFormatter()
-        except Exception:
-            formatter = logging.Formatter("[%(asctime)s] %(levelname)s in %(module)s: %(message)s")
-    else:
-        formatter = logging.Formatter("[%(asctime)s] %(levelname)s in %(module)s: %(message)s")
-
-    # Rotating file handler (5MB x 5)
-    file_handler = RotatingFileHandler(
-        log_path, maxBytes=5_000_000, backupCount=5, encoding="utf-8"
-    )
-    file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
-    app.logger.addHandler(file_handler)
-
-    # Stream to stdout as well (useful on dev/heroku/docker)
-    stream_handler = logging.StreamHandler()
-    stream_handler.setLevel(level)
-    stream_handler.setFormatter(formatter)
-    app.logger.addHandler(stream_handler)
-
     app.logger.info("Logging initialized.")
 
 def create_app(config_object=None):
@@ -116,8 +84,14 @@ def create_app(config_object=None):
     app.config.setdefault("ALLOWED_EXTENSIONS", {"pdf","doc","docx","xls","xlsx","ppt","pptx","txt","zip","png","jpg","jpeg"})
     default_upload_dir.mkdir(parents=True, exist_ok=True)
 
+    # First before_request hook, so everything after it logs under the request's ID
+    request_id.init_app(app)
+
     # Extensions
+    configure_engine_options(app)
     db.init_app(app)
+    install_engine_hooks(app, db)
+    install_replica_routing(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     csrf.init_app(app)
@@ -155,20 +129,12 @@ def create_app(config_object=None):
     def inject_now():
         return {"now": datetime.utcnow}
     
-    from time import time
-    _ratings_cache = {"t": 0, "avg": 0.0, "cnt": 0}
-
     @app.context_processor
     def inject_ratings_aggregate():
-        now = time()
-        if now - _ratings_cache["t"] > 60:
-            avg, cnt = db.session.query(
-                func.coalesce(func.avg(Rating.stars), 0.0),
-                func.count(Rating.id)
-            ).filter(Rating.is_deleted.is_(False), Rating.is_public.is_(True)).one()
-            _ratings_cache.update({"t": now, "avg": round(float(avg or 0.0), 1), "cnt": int(cnt or 0)})
-        return {"rating_avg": _ratings_cache["avg"], "rating_count": _ratings_cache["cnt"]}
-    
+        # Shared by all workers and only read when a template touches it
+        return {"site_ratings": shared_cache.lazy(
+            lambda: shared_cache.get_or_compute(rating_aggregates.SITE_CACHE_KEY, rating_aggregates.site_summary, ttl=60))}
+
     @app.before_request
     def _load_cookie_consent():
         raw = request.cookies.get("td.consent")
@@ -198,8 +164,15 @@ def create_app(config_object=None):
     app.register_blueprint(payments_bp, url_prefix="/payments")
     app.register_blueprint(pesapal_ipn_bp)
 
+    register_cli(app)
+    image_pipeline.init_app(app)
+    static_assets.init_app(app)
+    template_cache.init_app(app)
+    profiler.init_app(app)
+
     # Simple index
     @app.route("/")
+    @cache_page()
     def index():
         from flask_login import current_user
         return render_template("home.html")
@@ -220,4 +193,10 @@ def create_app(config_object=None):
     def forbidden_error(error):
         return render_template("errors/403.html"), 403
 
+    @app.errorhandler(429)
+    def too_many_requests_error(error):
+        # keep Retry-After from the rate limiter (app/ratelimit.py)
+        headers = [(k, v) for k, v in error.get_headers() if k == "Retry-After"]
+        return render_template("errors/429.html", retry_after=getattr(error, "retry_after", None)), 429, headers
+
     return app
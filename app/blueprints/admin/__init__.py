@@ -18,3 +18,9 @@ from . import support
 from . import marketing
 from . import routes_ratings
 from . import careers
+from . import exports
+from . import analytics
+from . import audit
+from . import trace
+from . import profiles
+from . import memory
@@ -0,0 +1,42 @@
+from datetime import date
+from flask import render_template, request
+from flask_login import login_required
+from sqlalchemy import desc
+from ...security import roles_required
+from ...extensions import db
+from ...database import read_only
+from ...models.task_history import TaskStatusRollup
+from . import admin_bp
+
+
+@admin_bp.get('/analytics/status-times')
+@login_required
+@roles_required('admin')
+@read_only()
+def analytics_status_times():
+    """Time-in-status percentiles, read straight from the daily rollup rows."""
+    days = [d for (d,) in db.session.query(TaskStatusRollup.day)
+            .distinct().order_by(desc(TaskStatusRollup.day)).limit(60).all()]
+
+    day = None
+    raw_day = (request.args.get('day') or '').strip()
+    if raw_day:
+        try:
+            day = date.fromisoformat(raw_day)
+        except ValueError:
+            day = None
+    if day is None and days:
+        day = days[0]
+
+    status = (request.args.get('status') or '').strip()
+
+    rows = []
+    if day is not None:
+        qry = TaskStatusRollup.query.filter(TaskStatusRollup.day == day)
+        if status:
+            qry = qry.filter(TaskStatusRollup.status == status)
+        rows = qry.order_by(TaskStatusRollup.status, TaskStatusRollup.category,
+                            TaskStatusRollup.priority).all()
+
+    return render_template('admin/analytics_status_times.html',
+                           rows=rows, days=days, day=day, status=status)
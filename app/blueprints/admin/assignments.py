@@ -7,6 +7,7 @@ from ...models.task import TaskRequest
 from ...models.user import User
 from ...models.assignment import Assignment
 from ...services.email_service import send_email
+from ...services.task_workflow import transition
 from . import admin_bp
 
 @admin_bp.post('/tasks/<int:task_id>/assignments')
@@ -43,10 +44,8 @@ def assignment_create(task_id):
         accept_expires_at=accept_expires_at,
         status='pending',
     )
-    if t.status in ('submitted', 'quoted', 'pending_accept'):
-        t.status = 'pending_accept'
-
     db.session.add(a)
+    transition([t.id], 'pending_accept', commit=False)  # no-op unless the task is still pre-assignment
     db.session.commit()
 
     try:
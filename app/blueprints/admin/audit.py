@@ -0,0 +1,40 @@
+from flask import render_template, request
+from flask_login import login_required
+from sqlalchemy import desc, false
+from ...security import roles_required
+from ...extensions import db
+from ...database import read_only
+from ...models.audit import AdminAudit
+from ...models.user import User
+from . import admin_bp
+from .read_models import AuditRow, paginate_rows
+
+
+@admin_bp.get('/audit')
+@login_required
+@roles_required('admin')
+@read_only()
+def audit_list():
+    actor     = (request.args.get('actor') or '').strip()
+    action    = (request.args.get('action') or '').strip()
+    target    = (request.args.get('target') or '').strip()
+    page      = max(int(request.args.get('page', 1) or 1), 1)
+    per_page  = 50
+
+    qry = AuditRow.select()
+    if actor:
+        if actor.isdigit():
+            qry = qry.where(AdminAudit.actor_id == int(actor))
+        else:
+            actor_id = db.session.query(User.id).filter(User.email == actor.lower()).scalar()
+            qry = qry.where(AdminAudit.actor_id == actor_id) if actor_id else qry.where(false())
+    if action:
+        qry = qry.where(AdminAudit.action == action)
+    if target.isdigit():
+        qry = qry.where(AdminAudit.target_type == 'user', AdminAudit.target_id == int(target))
+
+    entries = paginate_rows(AuditRow, qry.order_by(desc(AdminAudit.created_at), desc(AdminAudit.id)),
+                            page=page, per_page=per_page)
+    actions = [a for (a,) in db.session.query(AdminAudit.action).distinct().order_by(AdminAudit.action).all()]
+    return render_template('admin/audit_list.html', entries=entries, actions=actions,
+                           actor=actor, action=action, target=target)
@@ -7,12 +7,13 @@ from app.models.careers import JobPosting, JobApplication
 from sqlalchemy import desc
 
 from . import admin_bp
+from .read_models import JobRow, fetch_rows
 
 @admin_bp.route("/careers")
 @login_required
 @roles_required('admin')
 def careers_list():
-    jobs = JobPosting.query.order_by(desc(JobPosting.created_at)).all()
+    jobs = fetch_rows(JobRow, JobRow.select().order_by(desc(JobPosting.created_at)))
     return render_template("admin/careers_list.html", jobs=jobs)
 
 @admin_bp.route("/careers/new", methods=["GET","POST"])
@@ -0,0 +1,110 @@
+from flask import abort
+from flask_login import login_required
+from ...security import roles_required
+from ...models.user import User
+from ...models.task import TaskRequest
+from ...models.invoice import Invoice
+from ...models.feedback import Rating
+from ...models.support import SupportTicket
+from ...models.marketing import Subscriber
+from ...services.export_service import ExportSpec, csv_response
+from . import admin_bp
+
+# name -> projection; only these columns are read, rows are never hydrated
+EXPORTS = {
+    "subscribers": ExportSpec(
+        filename="subscribers.csv",
+        columns=[
+            ("email", Subscriber.email),
+            ("name", Subscriber.name),
+            ("is_active", Subscriber.is_active),
+            ("source", Subscriber.source),
+            ("created_at", Subscriber.created_at),
+        ],
+        order_by=Subscriber.created_at.desc(),
+    ),
+    "users": ExportSpec(
+        filename="users.csv",
+        columns=[
+            ("id", User.id),
+            ("name", User.name),
+            ("email", User.email),
+            ("phone", User.phone),
+            ("role", User.role),
+            ("status", User.status),
+            ("is_email_verified", User.is_email_verified),
+            ("created_at", User.created_at),
+            ("last_login_at", User.last_login_at),
+            ("deleted_at", User.deleted_at),
+        ],
+        order_by=User.id.asc(),
+    ),
+    "tasks": ExportSpec(
+        filename="tasks.csv",
+        columns=[
+            ("id", TaskRequest.id),
+            ("client_id", TaskRequest.client_id),
+            ("title", TaskRequest.title),
+            ("category", TaskRequest.category),
+            ("priority", TaskRequest.priority),
+            ("status", TaskRequest.status),
+            ("client_budget", TaskRequest.client_budget),
+            ("deadline_at", TaskRequest.deadline_at),
+            ("created_at", TaskRequest.created_at),
+        ],
+        order_by=TaskRequest.id.asc(),
+    ),
+    "invoices": ExportSpec(
+        filename="invoices.csv",
+        columns=[
+            ("id", Invoice.id),
+            ("task_id", Invoice.task_id),
+            ("amount", Invoice.amount),
+            ("currency", Invoice.currency),
+            ("status", Invoice.status),
+            ("issued_at", Invoice.issued_at),
+            ("paid_at", Invoice.paid_at),
+            ("gateway", Invoice.gateway),
+            ("gateway_status", Invoice.gateway_status),
+            ("merchant_ref", Invoice.pesapal_merchant_ref),
+        ],
+        order_by=Invoice.id.asc(),
+    ),
+    "ratings": ExportSpec(
+        filename="ratings.csv",
+        columns=[
+            ("id", Rating.id),
+            ("stars", Rating.stars),
+            ("name", Rating.name),
+            ("email", Rating.email),
+            ("comment", Rating.comment),
+            ("is_public", Rating.is_public),
+            ("is_deleted", Rating.is_deleted),
+            ("created_at", Rating.created_at),
+        ],
+        order_by=Rating.id.asc(),
+    ),
+    "tickets": ExportSpec(
+        filename="tickets.csv",
+        columns=[
+            ("ticket_id", SupportTicket.ticket_id),
+            ("name", SupportTicket.name),
+            ("email", SupportTicket.email),
+            ("category", SupportTicket.category),
+            ("status", SupportTicket.status),
+            ("created_at", SupportTicket.created_at),
+            ("updated_at", SupportTicket.updated_at),
+        ],
+        order_by=SupportTicket.id.asc(),
+    ),
+}
+
+
+@admin_bp.get('/exports/<name>.csv')
+@login_required
+@roles_required('admin')
+def export_csv(name):
+    spec = EXPORTS.get(name)
+    if spec is None:
+        abort(404)
+    return csv_response(spec)
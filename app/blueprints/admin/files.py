@@ -1,6 +1,5 @@
 from io import BytesIO
 import os
-from PIL import Image
 from flask import send_file
 from flask_login import login_required
 from ...security import roles_required
@@ -48,6 +47,8 @@ def secure_thumb(file_id):
     thumb_path = os.path.join(_THUMBS_ROOT(), f"{fa.id}_320.jpg")
 
     if not os.path.exists(thumb_path):
+        from PIL import Image  # only thumbnails need Pillow; keep it out of startup
+
         img = Image.open(stream)
         img.thumbnail((320, 320))
         img = img.convert("RGB")
@@ -1,20 +1,20 @@
-from flask import render_template, request, redirect, url_for
+from flask import render_template, request, redirect, url_for, flash
 from flask_login import login_required
 from sqlalchemy.orm import selectinload
 from sqlalchemy import or_, asc, desc, func
 from ...security import roles_required
 from ...extensions import db
+from ...database import read_only
 from ...models.task import TaskRequest
 from ...models.user import User
 from ...models.assignment import Assignment
+from ...services.task_workflow import TRANSITIONS, normalize, transition
 from . import admin_bp
-from datetime import datetime
-from ...models.invoice import Invoice
-from ...models.quote import Quote
 
 @admin_bp.route('/inbox')
 @login_required
 @roles_required('admin')
+@read_only()
 def inbox():
     q        = (request.args.get('q') or '').strip()
     status   = (request.args.get('status') or '').strip()
@@ -97,78 +97,22 @@ def dashboard():
     return redirect(url_for('admin.inbox'))
 
 
-def _ensure_review_invoice(task):
-    """If task has an accepted pay_on_delivery quote and no unpaid invoice, create one."""
-    # already have an unpaid invoice?
-    if any(getattr(inv, "status", None) == "unpaid" for inv in (task.invoices or [])):
-        return None
-
-    # find most-recent accepted quote
-    accepted = None
-    if getattr(task, "quotes", None):
-        for q in sorted(task.quotes, key=lambda x: x.id, reverse=True):
-            if (q.status or "").lower() == "accepted":
-                accepted = q
-                break
-    if not accepted:
-        return None
-
-    if (accepted.pay_option or "").lower() != "pay_on_delivery":
-        return None
-
-    inv = Invoice(
-        task_id=task.id,
-        amount=accepted.proposed_price,
-        currency=accepted.currency,
-        status="unpaid",
-        issued_at=datetime.utcnow(),
-    )
-    db.session.add(inv)
-    db.session.commit()
-    return inv
-
-
 # --- route to update the status from inbox ---
 @admin_bp.post("/tasks/<int:task_id>/status")
 @login_required
 @roles_required("admin")
 def inbox_set_status(task_id):
-    t = TaskRequest.query.options(
-        selectinload(TaskRequest.quotes),
-        selectinload(TaskRequest.invoices),
-    ).get_or_404(task_id)
+    t = TaskRequest.query.get_or_404(task_id)
 
     # Expect values like: submitted, quoted, in_progress, review, review_scheduled, delivered, closed, cancelled
-    new_status = (request.form.get("status") or "").strip().lower()
-
-    allowed = {
-        "submitted",
-        "quoted",
-        "pending_accept",
-        "in_progress",
-        "review",
-        "review_scheduled",
-        "awaiting_payment",
-        "delivered",
-        "closed",
-        "cancelled",
-        "canceled",   # tolerate US spelling from UI
-    }
-    if new_status not in allowed:
+    new_status = normalize(request.form.get("status"))
+    if new_status not in TRANSITIONS:
         # fall back to current to avoid bad writes
         return redirect(request.referrer or url_for("admin.inbox"))
 
-    # Normalize spelling
-    if new_status == "canceled":
-        new_status = "cancelled"
-
-    t.status = new_status
-
-    # If entering review, ensure invoice exists for pay_on_delivery
-    if new_status in {"review", "review_scheduled"}:
-        _ensure_review_invoice(t)
-
-    db.session.commit()
+    result = transition([t.id], new_status)
+    if not result.changed and normalize(t.status) != new_status:
+        flash(f"Can't move task #{t.id} from {t.status} to {new_status}.", "warning")
 
     # go back to inbox (preserve filters if any)
     return redirect(request.referrer or url_for("admin.inbox"))
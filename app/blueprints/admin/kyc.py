@@ -4,9 +4,11 @@ from flask_login import login_required, current_user
 from sqlalchemy import or_, func
 from ...security import roles_required
 from ...extensions import db
+from ...database import read_only
 from ...models.user import User, KycSubmission
 from ...services.email_service import send_email
 from . import admin_bp
+from .read_models import KycRow, paginate_rows
 
 @admin_bp.post('/users/<int:user_id>/kyc/review')
 @login_required
@@ -66,35 +68,29 @@ def kyc_review(user_id):
 @admin_bp.get('/kyc')
 @login_required
 @roles_required('admin')
+@read_only()
 def kyc_queue():
     q        = (request.args.get('q') or '').strip()
     status   = (request.args.get('status') or 'submitted').strip()
     page     = max(int(request.args.get('page', 1) or 1), 1)
     per_page = 20
 
-    base = KycSubmission.query.order_by(KycSubmission.submitted_at.desc())
+    base = KycRow.select().order_by(KycSubmission.submitted_at.desc())
 
     if status in ('submitted', 'approved', 'rejected'):
-        base = base.filter(KycSubmission.status == status)
+        base = base.where(KycSubmission.status == status)
 
     if q:
         like = f"%{q}%"
-        base = (base.join(User, KycSubmission.user_id == User.id)
-                    .filter(or_(
-                        User.name.ilike(like),
-                        User.email.ilike(like),
-                        func.cast(User.id, db.String).ilike(like),
-                        func.coalesce(KycSubmission.id_number, '').ilike(like),
-                    )))
+        base = base.where(or_(
+            User.name.ilike(like),
+            User.email.ilike(like),
+            func.cast(User.id, db.String).ilike(like),
+            func.coalesce(KycSubmission.id_number, '').ilike(like),
+        ))
 
-    total = base.count()
-    pages = max((total + per_page - 1)//per_page, 1)
-    page  = min(page, pages)
-    subs  = base.offset((page-1)*per_page).limit(per_page).all()
-
-    user_ids = {s.user_id for s in subs if s.user_id}
-    users_map = {u.id: u for u in User.query.filter(User.id.in_(user_ids)).all()}
+    subs_page = paginate_rows(KycRow, base, page=page, per_page=per_page)
 
     return render_template('admin/kyc_queue.html',
-                           subs=subs, users_map=users_map,
-                           page=page, pages=pages, total=total, status=status, q=q)
+                           subs=subs_page.items, page=subs_page.page, pages=subs_page.pages,
+                           total=subs_page.total, status=status, q=q)
@@ -3,6 +3,8 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_required, current_user
 from ...security import roles_required
 from app.extensions import db, mail
+from app.database import read_only
+from app.services.export_service import csv_response
 from app.models.marketing import Subscriber, EmailCampaign
 from app.models.user import User  # your user model
 from sqlalchemy import func
@@ -10,6 +12,7 @@ from datetime import datetime
 from flask_mail import Message
 
 from . import admin_bp
+from .exports import EXPORTS
 
 def admin_guard():
     return current_user.is_authenticated and getattr(current_user, "is_admin", False)
@@ -22,6 +25,7 @@ def _guard():
 
 # ---- Subscribers ----
 @admin_bp.route("/subscribers")
+@read_only()
 def subscribers_list():
     q = (request.args.get("q") or "").strip().lower()
     status = request.args.get("status", "")
@@ -41,13 +45,7 @@ def subscribers_list():
 
 @admin_bp.route("/subscribers/export.csv")
 def subscribers_export_csv():
-    rows = Subscriber.query.order_by(Subscriber.created_at.desc()).all()
-    def gen():
-        yield "email,name,is_active,source,created_at\n"
-        for s in rows:
-            yield f"{s.email},{(s.name or '').replace(',',' ')},{1 if s.is_active else 0},{s.source or ''},{s.created_at.isoformat()}Z\n"
-    return Response(gen(), mimetype="text/csv",
-                    headers={"Content-Disposition": "attachment; filename=subscribers.csv"})
+    return csv_response(EXPORTS["subscribers"])
 
 # ---- Campaigns ----
 @admin_bp.route("/campaigns")
@@ -0,0 +1,87 @@
+import os
+
+from flask import abort, current_app, flash, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+
+from ...security import roles_required
+from ... import memory_diag
+from ...worker import memory_usage
+from . import admin_bp
+from .utils import _record_admin_audit
+
+GROUP_BY = ('lineno', 'filename')
+
+
+@admin_bp.get('/memory')
+@login_required
+@roles_required('admin')
+def memory_overview():
+    """Diagnostics for the worker that answers this request (see app/memory_diag.py)."""
+    snapshots = memory_diag.list_snapshots(current_app)
+    snap = request.args.get('snap') or ''
+    by = request.args.get('by') if request.args.get('by') in GROUP_BY else 'lineno'
+    top = []
+    if snap:
+        try:
+            top = memory_diag.top_allocations(current_app, snap, by)
+        except (OSError, ValueError):
+            abort(404)
+    return render_template(
+        'admin/memory.html',
+        pid=os.getpid(),
+        usage=memory_usage(),
+        status=memory_diag.tracing_status(),
+        auto_interval=memory_diag.autosnapshot_running(),
+        default_interval=current_app.config.get('MEMDIAG_AUTOSNAPSHOT_SECONDS') or 600,
+        snapshots=snapshots,
+        snap=snap, by=by, top=top,
+        objects=memory_diag.object_counts() if request.args.get('objects') else None,
+        sessions=memory_diag.session_stats(),
+    )
+
+
+@admin_bp.get('/memory/diff')
+@login_required
+@roles_required('admin')
+def memory_diff():
+    old, new = request.args.get('old') or '', request.args.get('new') or ''
+    by = request.args.get('by') if request.args.get('by') in GROUP_BY else 'lineno'
+    try:
+        rows = memory_diag.diff_snapshots(current_app, old, new, by)
+    except (OSError, ValueError):
+        abort(404)
+    return render_template('admin/memory_diff.html', old=old, new=new, by=by, rows=rows,
+                           total_diff=sum(r['size_diff'] for r in rows))
+
+
+@admin_bp.post('/memory/<action>')
+@login_required
+@roles_required('admin')
+def memory_action(action):
+    if action == 'start':
+        memory_diag.start_tracing(current_app)
+        flash(f'tracemalloc started in worker {os.getpid()}.', 'success')
+    elif action == 'stop':
+        memory_diag.stop_autosnapshot()
+        memory_diag.stop_tracing()
+        flash(f'tracemalloc stopped in worker {os.getpid()}.', 'info')
+    elif action == 'snapshot':
+        try:
+            name = memory_diag.take_snapshot(current_app, request.form.get('label') or 'manual')
+        except RuntimeError as e:
+            flash(str(e), 'warning')
+            return redirect(url_for('admin.memory_overview'))
+        flash(f'Snapshot {name} saved.', 'success')
+    elif action == 'auto-start':
+        interval = request.form.get('interval', type=float)
+        if not memory_diag.start_autosnapshot(current_app._get_current_object(), interval):
+            flash('Give an interval in seconds.', 'warning')
+            return redirect(url_for('admin.memory_overview'))
+        flash(f'Auto-snapshots every {memory_diag.autosnapshot_running():g} s in worker {os.getpid()}.', 'success')
+    elif action == 'auto-stop':
+        memory_diag.stop_autosnapshot()
+        flash('Auto-snapshots stopped (tracing is still on).', 'info')
+    else:
+        abort(404)
+    _record_admin_audit(current_user.id, f'memdiag_{action.replace("-", "_")}', [], {'pid': os.getpid()})
+    return redirect(url_for('admin.memory_overview'))
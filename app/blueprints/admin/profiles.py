@@ -0,0 +1,45 @@
+from flask import abort, current_app, render_template, send_file
+from flask_login import current_user, login_required
+
+from ...security import roles_required
+from ... import profiler
+from . import admin_bp
+
+
+@admin_bp.get('/profiles')
+@login_required
+@roles_required('admin')
+def profiles_list():
+    enabled = bool(current_app.config.get('PROFILER_ENABLED'))
+    return render_template(
+        'admin/profiles_list.html',
+        enabled=enabled,
+        profiles=profiler.list_profiles(current_app),
+        token=profiler.issue_token(current_user.id) if enabled else None,
+        header=profiler.HEADER,
+        ttl=int(current_app.config.get('PROFILER_TOKEN_TTL', 3600)),
+        sample_rate=current_app.config.get('PROFILER_SAMPLE_RATE') or 0,
+        endpoints=current_app.config.get('PROFILER_ENDPOINTS') or '',
+    )
+
+
+@admin_bp.get('/profiles/<name>')
+@login_required
+@roles_required('admin')
+def profile_detail(name):
+    loaded = profiler.load_profile(current_app, name)
+    if loaded is None:
+        abort(404)
+    meta, counts = loaded
+    return render_template('admin/profile_detail.html', meta=meta, name=name,
+                           top=profiler.top_frames(counts), samples=sum(counts.values()), stacks=len(counts))
+
+
+@admin_bp.get('/profiles/<name>/collapsed')
+@login_required
+@roles_required('admin')
+def profile_download(name):
+    path = profiler.profile_path(current_app, name)
+    if path is None:
+        abort(404)
+    return send_file(path, mimetype='text/plain', as_attachment=True, download_name=f'{name}.collapsed')
@@ -8,6 +8,7 @@ from ...extensions import db
 from ...models.task import TaskRequest
 from ...models.quote import Quote
 from ...services.email_service import send_email
+from ...services.task_workflow import transition
 from . import admin_bp
 
 
@@ -51,8 +52,8 @@ def quote_create(task_id):
         # Include this only if your model has it:
         **({'valid_until': valid_until} if hasattr(Quote, 'valid_until') else {})
     )
-    t.status = 'quoted'
     db.session.add(q)
+    transition([t.id], 'quoted', commit=False)
     db.session.commit()
 
     try:
@@ -82,7 +83,7 @@ def admin_accept_client_counter(quote_id):
     # Mark accepted
     q.client_counter_status = "accepted"
     q.status = "accepted"
-    q.task.status = "in_progress"
+    transition([q.task_id], "in_progress", commit=False)
 
     # If the original quote had a pay_now option, issue invoice with counter amount
     if (q.pay_option or "").lower() == "pay_now":
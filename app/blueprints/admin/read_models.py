@@ -0,0 +1,223 @@
+# app/blueprints/admin/read_models.py
+"""
+Read models for admin list pages.
+
+Each row class is a slotted dataclass whose fields line up with a column
+projection, so list views run one narrow SELECT and build small tuples-with-
+names instead of hydrating mapped objects (and their joined/selectin
+relationships) into the identity map.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar
+
+from sqlalchemy import func, select
+
+from ...extensions import db
+from ...models.audit import AdminAudit
+from ...models.careers import JobPosting
+from ...models.feedback import Rating
+from ...models.support import SupportTicket
+from ...models.user import User, KycSubmission
+
+
+# -----------------------------
+# Shared paginator
+# -----------------------------
+
+class Page:
+    """Duck-types the bits of Flask-SQLAlchemy's Pagination the templates use."""
+    __slots__ = ("items", "page", "per_page", "total")
+
+    def __init__(self, items, page, per_page, total):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+
+    @property
+    def pages(self) -> int:
+        return max((self.total + self.per_page - 1) // self.per_page, 1)
+
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self.page < self.pages
+
+    @property
+    def prev_num(self):
+        return self.page - 1 if self.has_prev else None
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def paginate_rows(row_cls, stmt, *, page: int, per_page: int) -> Page:
+    """COUNT over the filtered statement, then fetch one page straight into row_cls."""
+    total = db.session.execute(
+        select(func.count()).select_from(stmt.order_by(None).subquery())
+    ).scalar() or 0
+    pages = max((total + per_page - 1) // per_page, 1)
+    page = min(max(page, 1), pages)
+    rows = db.session.execute(stmt.limit(per_page).offset((page - 1) * per_page))
+    return Page([row_cls(*r) for r in rows], page, per_page, total)
+
+
+def fetch_rows(row_cls, stmt) -> list:
+    return [row_cls(*r) for r in db.session.execute(stmt)]
+
+
+# -----------------------------
+# Row models (field order == column order)
+# -----------------------------
+
+@dataclass(slots=True)
+class UserRow:
+    id: int
+    name: str | None
+    email: str
+    phone: str | None
+    role: str
+    status: str | None
+    is_email_verified: bool | None
+    mfa_enabled: bool | None
+    created_at: datetime | None
+    last_login_at: datetime | None
+    deleted_at: datetime | None
+
+    columns: ClassVar[tuple] = (
+        User.id, User.name, User.email, User.phone, User.role, User.status,
+        User.is_email_verified, User.mfa_enabled, User.created_at,
+        User.last_login_at, User.deleted_at,
+    )
+
+    @classmethod
+    def select(cls):
+        return select(*cls.columns)
+
+
+@dataclass(slots=True)
+class KycRow:
+    id: int
+    user_id: int
+    doc_type: str | None
+    id_number: str | None
+    country: str | None
+    file_id_front: int | None
+    file_id_back: int | None
+    file_id_selfie: int | None
+    status: str | None
+    submitted_at: datetime | None
+    user_name: str | None
+    user_email: str | None
+
+    columns: ClassVar[tuple] = (
+        KycSubmission.id, KycSubmission.user_id, KycSubmission.doc_type,
+        KycSubmission.id_number, KycSubmission.country, KycSubmission.file_id_front,
+        KycSubmission.file_id_back, KycSubmission.file_id_selfie, KycSubmission.status,
+        KycSubmission.submitted_at, User.name, User.email,
+    )
+
+    @classmethod
+    def select(cls):
+        return select(*cls.columns).outerjoin(User, KycSubmission.user_id == User.id)
+
+
+@dataclass(slots=True)
+class RatingRow:
+    id: int
+    created_at: datetime
+    stars: int
+    name: str | None
+    email: str | None
+    ip: str | None
+    comment: str | None
+    is_public: bool
+    is_deleted: bool
+
+    columns: ClassVar[tuple] = (
+        Rating.id, Rating.created_at, Rating.stars, Rating.name, Rating.email,
+        Rating.ip, Rating.comment, Rating.is_public, Rating.is_deleted,
+    )
+
+    @classmethod
+    def select(cls):
+        return select(*cls.columns)
+
+
+@dataclass(slots=True)
+class JobRow:
+    id: int
+    title: str
+    department: str | None
+    employment_type: str | None
+    location: str | None
+    is_active: bool
+    created_at: datetime
+
+    columns: ClassVar[tuple] = (
+        JobPosting.id, JobPosting.title, JobPosting.department,
+        JobPosting.employment_type, JobPosting.location, JobPosting.is_active,
+        JobPosting.created_at,
+    )
+
+    @classmethod
+    def select(cls):
+        return select(*cls.columns)
+
+
+@dataclass(slots=True)
+class TicketRow:
+    id: int
+    ticket_id: str
+    name: str
+    email: str
+    category: str
+    status: str | None
+    created_at: datetime
+
+    columns: ClassVar[tuple] = (
+        SupportTicket.id, SupportTicket.ticket_id, SupportTicket.name,
+        SupportTicket.email, SupportTicket.category, SupportTicket.status,
+        SupportTicket.created_at,
+    )
+
+    @classmethod
+    def select(cls):
+        return select(*cls.columns)
+
+
+@dataclass(slots=True)
+class AuditRow:
+    id: int
+    created_at: datetime
+    actor_id: int | None
+    action: str
+    target_type: str
+    target_id: int | None
+    group_id: str | None
+    ip: str | None
+    meta: dict | None
+    actor_email: str | None
+
+    columns: ClassVar[tuple] = (
+        AdminAudit.id, AdminAudit.created_at, AdminAudit.actor_id, AdminAudit.action,
+        AdminAudit.target_type, AdminAudit.target_id, AdminAudit.group_id, AdminAudit.ip,
+        AdminAudit.meta, User.email,
+    )
+
+    @classmethod
+    def select(cls):
+        return select(*cls.columns).outerjoin(User, AdminAudit.actor_id == User.id)
@@ -2,36 +2,42 @@ from flask import render_template, request, redirect, url_for, flash
 from flask_login import login_required
 from ...security import roles_required
 from app.extensions import db
+from app.database import read_only
 from app.models.feedback import Rating
+from app.services import rating_aggregates
 from sqlalchemy import desc
 
 from . import admin_bp
+from .read_models import RatingRow, paginate_rows
 
 @admin_bp.route("/ratings")
 @login_required
 @roles_required('admin')
+@read_only()
 def ratings_list():
     q = (request.args.get("q") or "").strip()
     vis = (request.args.get("vis") or "").strip()   # public / hidden / deleted / all
     page = max(int(request.args.get("page", 1)), 1)
 
-    qry = Rating.query
+    qry = RatingRow.select()
     if q:
         like = f"%{q}%"
-        qry = qry.filter(db.or_(Rating.comment.ilike(like),
+        qry = qry.where(db.or_(Rating.comment.ilike(like),
                                 Rating.name.ilike(like),
                                 Rating.email.ilike(like)))
     if vis == "public":
-        qry = qry.filter(Rating.is_deleted.is_(False), Rating.is_public.is_(True))
+        qry = qry.where(Rating.is_deleted.is_(False), Rating.is_public.is_(True))
     elif vis == "hidden":
-        qry = qry.filter(Rating.is_deleted.is_(False), Rating.is_public.is_(False))
+        qry = qry.where(Rating.is_deleted.is_(False), Rating.is_public.is_(False))
     elif vis == "deleted":
-        qry = qry.filter(Rating.is_deleted.is_(True))
+        qry = qry.where(Rating.is_deleted.is_(True))
     else:
-        qry = qry.filter(Rating.is_deleted.is_(False))  # default exclude deleted
+        qry = qry.where(Rating.is_deleted.is_(False))  # default exclude deleted
 
-    ratings = qry.order_by(desc(Rating.created_at)).paginate(page=page, per_page=30)
-    return render_template("admin/ratings_list.html", ratings=ratings)
+    ratings = paginate_rows(RatingRow, qry.order_by(desc(Rating.created_at)), page=page, per_page=30)
+    return render_template("admin/ratings_list.html", ratings=ratings,
+                           summary=rating_aggregates.get(*rating_aggregates.SITE),
+                           daily=rating_aggregates.daily(14))
 
 @admin_bp.route("/ratings/<int:rid>/hide", methods=["POST"])
 @login_required
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_required, current_user
 from sqlalchemy import func
 from app.extensions import db, mail
+from app.database import read_only
 from ...security import roles_required
 from app.models.support import SupportTicket, SupportMessage, SupportAttachment
 from datetime import datetime
@@ -9,27 +10,29 @@ import os, uuid, mimetypes
 from werkzeug.utils import secure_filename
 from .utils import email_support_ack, email_support_alert
 from . import admin_bp
+from .read_models import TicketRow, paginate_rows
 
 
 
 @admin_bp.route("/tickets")
 @login_required
 @roles_required('admin')
+@read_only()
 def tickets_list():
     q = (request.args.get("q") or "").strip()
     status = (request.args.get("status") or "").strip().lower()
     page = max(int(request.args.get("page", 1)), 1)
-    qry = SupportTicket.query
+    qry = TicketRow.select()
     if q:
         like = f"%{q}%"
-        qry = qry.filter(db.or_(SupportTicket.ticket_id.ilike(like),
+        qry = qry.where(db.or_(SupportTicket.ticket_id.ilike(like),
                                 SupportTicket.email.ilike(like),
                                 SupportTicket.name.ilike(like),
                                 SupportTicket.category.ilike(like),
                                 SupportTicket.message.ilike(like)))
     if status in {"open","pending","closed"}:
-        qry = qry.filter(SupportTicket.status == status)
-    tickets = qry.order_by(SupportTicket.created_at.desc()).paginate(page=page, per_page=20)
+        qry = qry.where(SupportTicket.status == status)
+    tickets = paginate_rows(TicketRow, qry.order_by(SupportTicket.created_at.desc()), page=page, per_page=20)
     return render_template("admin/tickets_list.html", tickets=tickets)
 
 @admin_bp.route("/tickets/<int:ticket_id>")
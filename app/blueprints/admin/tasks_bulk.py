@@ -1,12 +1,15 @@
 from datetime import datetime
 from flask import request, redirect, url_for, flash
 from flask_login import login_required, current_user
-from sqlalchemy import func
+from sqlalchemy import func, insert, select
 from ...security import roles_required
 from ...extensions import db
 from ...models.task import TaskRequest
 from ...models.assignment import Assignment
 from ...models.user import User
+from ...services.assignment_notifications import email_assignment_invites
+from ...services.jobs import enqueue
+from ...services.task_workflow import TRANSITIONS, normalize, transition
 from . import admin_bp
 
 @admin_bp.post('/tasks/bulk-assign')
@@ -34,33 +37,41 @@ def bulk_assign():
             flash('Invalid accept-by date. Use YYYY-MM-DDTHH:MM).', 'warning')
             return redirect(url_for('admin.inbox'))
 
-    created, skipped = 0, 0
-    for tid in task_ids:
-        t = TaskRequest.query.get(tid)
-        if not t:
-            skipped += 1
-            continue
+    task_ids = list(dict.fromkeys(task_ids))  # de-dupe, keep order
 
-        already = Assignment.query.filter_by(task_id=tid, assignee_id=assignee.id).first()
-        if already and already.status in ('pending', 'pending_accept', 'accepted'):
-            skipped += 1
-            continue
-
-        a = Assignment(
-            task_id=tid,
-            assignee_id=assignee.id,
-            assigned_by=current_user.id,
-            accept_expires_at=accept_expires_at,
-            status='pending',
+    # Two set-based reads: which tasks exist, and which already have a live assignment
+    existing_ids = set(db.session.scalars(
+        select(TaskRequest.id).where(TaskRequest.id.in_(task_ids))
+    ))
+    busy_ids = set(db.session.scalars(
+        select(Assignment.task_id).where(
+            Assignment.task_id.in_(existing_ids),
+            Assignment.assignee_id == assignee.id,
+            Assignment.status.in_(('pending', 'pending_accept', 'accepted')),
         )
-        if t.status in ('submitted', 'quoted', 'pending_accept'):
-            t.status = 'pending_accept'
+    )) if existing_ids else set()
+
+    targets = [tid for tid in task_ids if tid in existing_ids and tid not in busy_ids]
+    skipped = len(task_ids) - len(targets)
 
-        db.session.add(a)
-        created += 1
+    new_ids = []
+    if targets:
+        new_ids = db.session.scalars(
+            insert(Assignment).returning(Assignment.id),
+            [dict(task_id=tid,
+                  assignee_id=assignee.id,
+                  assigned_by=current_user.id,
+                  accept_expires_at=accept_expires_at,
+                  status='pending') for tid in targets],
+        ).all()
+        transition(targets, 'pending_accept', commit=False)
 
     db.session.commit()
-    flash(f'Bulk assign complete: {created} created, {skipped} skipped.', 'success')
+
+    if new_ids:
+        enqueue(email_assignment_invites, list(new_ids))
+
+    flash(f'Bulk assign complete: {len(targets)} created, {skipped} skipped.', 'success')
     return redirect(url_for('admin.inbox'))
 
 @admin_bp.post('/tasks/bulk-status')
@@ -74,19 +85,13 @@ def bulk_status():
         flash('Select at least one task.', 'warning')
         return redirect(url_for('admin.inbox'))
 
-    allowed = {
-        'submitted', 'quoted', 'pending_accept',
-        'in_progress', 'review', 'delivered',
-        'archived', 'canceled'
-    }
-    if new_status not in allowed:
+    if normalize(new_status) not in TRANSITIONS:
         flash('Invalid status selected.', 'danger')
         return redirect(url_for('admin.inbox'))
 
-    tasks = TaskRequest.query.filter(TaskRequest.id.in_(task_ids)).all()
-    for t in tasks:
-        t.status = new_status
-
-    db.session.commit()
-    flash(f'Updated {len(tasks)} task(s) to "{new_status}".', 'success')
+    result = transition(task_ids, new_status)
+    msg = f'Updated {len(result.changed)} task(s) to "{result.status}".'
+    if result.skipped:
+        msg += f' {result.skipped} skipped (not allowed from their current status).'
+    flash(msg, 'success' if result.changed else 'warning')
     return redirect(url_for('admin.inbox'))
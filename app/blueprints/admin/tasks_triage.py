@@ -8,8 +8,7 @@ from ...models.user import User
 from ...models.assignment import Assignment
 from ...models.quote import Quote
 from ...models.invoice import Invoice
-from ...services.billing_notifications import email_invoice_created
-from .utils import ensure_review_invoice  # should return Invoice or None
+from ...services.task_workflow import TRANSITIONS, normalize, transition
 from . import admin_bp
 
 
@@ -32,9 +31,10 @@ def task_triage(task_id):
 @roles_required('admin')
 def task_archive(task_id):
     t = TaskRequest.query.get_or_404(task_id)
-    t.status = 'archived'
-    db.session.commit()
-    flash('Task archived.', 'info')
+    if transition([t.id], 'archived').changed:
+        flash('Task archived.', 'info')
+    else:
+        flash(f'Task is already {t.status}.', 'warning')
     return redirect(url_for('admin.inbox'))
 
 
@@ -43,9 +43,10 @@ def task_archive(task_id):
 @roles_required('admin')
 def task_unarchive(task_id):
     t = TaskRequest.query.get_or_404(task_id)
-    t.status = 'submitted'
-    db.session.commit()
-    flash('Task restored.', 'success')
+    if transition([t.id], 'submitted').changed:
+        flash('Task restored.', 'success')
+    else:
+        flash(f"Can't restore a task that is {t.status}.", 'warning')
     return redirect(url_for('admin.inbox'))
 
 
@@ -56,45 +57,17 @@ def task_set_status(task_id):
     t = TaskRequest.query.get_or_404(task_id)
 
     # Normalize and validate new status
-    new_status = (request.form.get("status") or "").strip().lower()
-    if new_status == "canceled":
-        new_status = "cancelled"
-
-    allowed = {
-        "submitted",
-        "quoted",
-        "pending_accept",
-        "in_progress",
-        "review",
-        "review_scheduled",
-        "awaiting_payment",
-        "delivered",
-        "closed",
-        "cancelled",
-        "archived",
-    }
-    if new_status not in allowed:
+    new_status = normalize(request.form.get("status"))
+    if new_status not in TRANSITIONS:
         flash("Invalid status.", "warning")
         return redirect(url_for("admin.task_triage", task_id=t.id))
 
-    # Apply transition
-    t.status = new_status
-
-    # If entering review/review_scheduled, ensure an unpaid invoice exists
-    inv_created = None
-    if new_status in {"review", "review_scheduled"}:
-        # ensure_review_invoice is idempotent and returns the created Invoice or None
-        inv_created = ensure_review_invoice(t)
-
-    db.session.commit()
-
-    # Notify client only if we actually issued a new invoice now
-    if inv_created:
-        try:
-            email_invoice_created(t, inv_created)
-        except Exception:
-            # Avoid breaking the admin flow if email generation fails
-            pass
-
-    flash(f"Status set to {new_status}.", "success")
+    # Apply transition; entering review/review_scheduled issues the delivery
+    # invoice (and queues the client email) inside the workflow.
+    if transition([t.id], new_status).changed:
+        flash(f"Status set to {new_status}.", "success")
+    elif normalize(t.status) == new_status:
+        flash(f"Status is already {new_status}.", "info")
+    else:
+        flash(f"Can't move from {t.status} to {new_status}.", "warning")
     return redirect(url_for("admin.task_triage", task_id=t.id))
@@ -0,0 +1,38 @@
+from flask import current_app, render_template, request
+from flask_login import login_required
+from sqlalchemy import String, cast
+
+from ...security import roles_required
+from ...extensions import db
+from ...database import read_only
+from ...models.invoice import Invoice
+from ...request_id import is_valid
+from ...services.request_trace import find_trace
+from . import admin_bp
+
+
+@admin_bp.get('/trace')
+@login_required
+@roles_required('admin')
+@read_only()
+def request_trace():
+    """Timeline of everything logged under one X-Request-ID; or an invoice's request trail."""
+    rid = (request.args.get('id') or '').strip()
+    invoice_id = request.args.get('invoice', type=int)
+
+    invoice = db.session.get(Invoice, invoice_id) if invoice_id else None
+    trail = []
+    if invoice is not None and isinstance(invoice.gateway_meta, dict):
+        trail = invoice.gateway_meta.get('request_ids') or []
+        if not rid and trail:
+            rid = trail[-1].get('id') or ''
+
+    trace = find_trace(current_app, rid) if rid else None
+    invoices = []
+    if rid and is_valid(rid):
+        # Invoices whose request trail mentions this ID (gateway_meta is JSON; match on its text)
+        invoices = (db.session.query(Invoice.id, Invoice.task_id, Invoice.status, Invoice.gateway_status)
+                    .filter(cast(Invoice.gateway_meta, String).contains(rid, autoescape=True))  # '_' is a LIKE wildcard
+                    .order_by(Invoice.id.desc()).limit(20).all())
+    return render_template('admin/trace.html', rid=rid, trace=trace, invoice=invoice, trail=trail,
+                           invoices=invoices, valid=not rid or is_valid(rid))
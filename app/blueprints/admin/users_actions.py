@@ -1,14 +1,19 @@
+import re
 from datetime import datetime
-from flask import request, redirect, url_for, flash
+from flask import request, redirect, url_for, flash, abort, send_from_directory
 from flask_login import login_required, current_user
 from ...security import roles_required
 from ...extensions import db
 from ...models.user import User, KycSubmission
 from ...services.email_service import send_email
+from ...services.compliance_service import erase_user_data, export_dir, export_user_data
+from ...services.jobs import enqueue
 from ..auth.routes import _issue_reset_token, send_password_reset_email
 from . import admin_bp
 from .utils import _record_admin_audit
 
+_EXPORT_NAME = re.compile(r'user-\d+-\d{8}T\d{6}-[0-9a-f]{16}\.zip')
+
 # ---- BULK suspend / unsuspend ----
 
 @admin_bp.post('/users/bulk-suspend')
@@ -164,6 +169,7 @@ def users_bulk_role():
         flash('Select at least one user.', 'warning'); return redirect(url_for('admin.users_list'))
     User.query.filter(User.id.in_(ids)).update({User.role: role}, synchronize_session=False)
     db.session.commit()
+    _record_admin_audit(actor_id=current_user.id, action='bulk_change_role', targets=ids, meta={'role': role})
     flash(f'Updated role to {role} for {len(ids)} user(s).', 'success')
     return redirect(url_for('admin.users_list'))
 
@@ -176,8 +182,11 @@ def user_change_role(user_id):
         flash('Invalid role.', 'warning')
         return redirect(request.referrer or url_for('admin.users_list'))
     u = User.query.get_or_404(user_id)
+    old_role = u.role
     u.role = role
     db.session.commit()
+    _record_admin_audit(actor_id=current_user.id, action='change_role', targets=[u.id],
+                        meta={'from': old_role, 'to': role})
     flash(f'Role updated to {role} for {u.email}.', 'success')
     return redirect(request.referrer or url_for('admin.user_detail', user_id=u.id))
 
@@ -199,13 +208,28 @@ def user_notes_save(user_id):
 def user_compliance_action(user_id):
     u = User.query.get_or_404(user_id)
     if request.form.get('erase'):
-        # enqueue erasure job here as per your policy
+        if u.id == current_user.id:
+            flash('You cannot erase your own account.', 'warning')
+            return redirect(url_for('admin.user_detail', user_id=u.id))
+        enqueue(erase_user_data, u.id, current_user.id)
+        _record_admin_audit(actor_id=current_user.id, action='gdpr_erase_requested', targets=[u.id])
         flash('PII erasure queued.', 'warning')
     else:
-        # enqueue export job here
-        flash('Data export started.', 'info')
+        enqueue(export_user_data, u.id, current_user.id)
+        _record_admin_audit(actor_id=current_user.id, action='gdpr_export_requested', targets=[u.id])
+        flash("Data export started. You'll get an email with the download link.", 'info')
     return redirect(url_for('admin.user_detail', user_id=u.id))
 
+@admin_bp.get('/compliance/exports/<name>')
+@login_required
+@roles_required('admin')
+def compliance_download(name):
+    if not _EXPORT_NAME.fullmatch(name):
+        abort(404)
+    _record_admin_audit(actor_id=current_user.id, action='gdpr_export_download', targets=[],
+                        meta={'file': name})
+    return send_from_directory(export_dir(), name, as_attachment=True, mimetype='application/zip')
+
 @admin_bp.post('/users/send-reset')
 @login_required
 @roles_required('admin')
@@ -235,8 +259,6 @@ def user_send_reset():
 @login_required
 @roles_required('admin')
 def user_new():
-    from werkzeug.security import generate_password_hash
-
     name   = (request.form.get('name') or '').strip()
     email  = (request.form.get('email') or '').strip().lower()
     phone  = (request.form.get('phone') or '').strip()
@@ -261,7 +283,7 @@ def user_new():
         created_at=datetime.utcnow()
     )
     if raw_pw:
-        u.password_hash = generate_password_hash(raw_pw)
+        u.set_password(raw_pw)
 
     db.session.add(u)
     db.session.commit()
@@ -283,5 +305,6 @@ def user_delete():
     u.is_suspended = True
 
     db.session.commit()
+    _record_admin_audit(actor_id=current_user.id, action='delete', targets=[u.id])
     flash(f'User {u.email} soft-deleted.', 'warning')
     return redirect(url_for('admin.users_list'))
@@ -1,14 +1,17 @@
 from flask import render_template, request
 from flask_login import login_required
-from sqlalchemy import or_, asc, desc, func
+from sqlalchemy import or_, asc, desc, func, case, select
 from ...security import roles_required
 from ...extensions import db
+from ...database import read_only
 from ...models.user import User
 from . import admin_bp
+from .read_models import UserRow, paginate_rows
 
 @admin_bp.get('/users')
 @login_required
 @roles_required('admin')
+@read_only()
 def users_list():
     q        = (request.args.get('q') or '').strip()
     role     = (request.args.get('role') or '').strip()
@@ -18,26 +21,26 @@ def users_list():
     page     = max(int(request.args.get('page', 1) or 1), 1)
     per_page = 20
 
-    base = User.query
+    base = UserRow.select()
 
     if q:
         like = f"%{q}%"
-        base = base.filter(or_(User.name.ilike(like), User.email.ilike(like), User.phone.ilike(like)))
+        base = base.where(or_(User.name.ilike(like), User.email.ilike(like), User.phone.ilike(like)))
 
     if role:
-        base = base.filter(User.role == role)
+        base = base.where(User.role == role)
 
     if status == 'active':
-        base = base.filter(User.deleted_at.is_(None), User.status == 'active')
+        base = base.where(User.deleted_at.is_(None), User.status == 'active')
     elif status == 'suspended':
-        base = base.filter(User.status == 'suspended')
+        base = base.where(User.status == 'suspended')
     elif status == 'deleted':
-        base = base.filter(User.deleted_at.isnot(None))
+        base = base.where(User.deleted_at.isnot(None))
     elif status == 'unverified':
-        base = base.filter(User.is_email_verified.is_(False))
+        base = base.where(User.is_email_verified.is_(False))
 
-    if vetted:
-        base = base.filter(User.vetted_status == vetted)
+    if vetted and hasattr(User, 'vetted_status'):
+        base = base.where(User.vetted_status == vetted)
 
     if sort == 'created':
         base = base.order_by(asc(User.created_at))
@@ -52,20 +55,28 @@ def users_list():
     else:
         base = base.order_by(desc(User.created_at))
 
-    total = base.count()
-    pages = max((total + per_page - 1) // per_page, 1)
-    page = min(page, pages)
-    users = base.offset((page - 1) * per_page).limit(per_page).all()
+    users_page = paginate_rows(UserRow, base, page=page, per_page=per_page)
 
+    # KPI chips in one pass instead of five COUNT queries
+    kpi = db.session.execute(
+        select(
+            func.sum(case((User.role == 'client', 1), else_=0)),
+            func.sum(case((User.role == 'freelancer', 1), else_=0)),
+            func.sum(case((User.role == 'admin', 1), else_=0)),
+            func.sum(case((User.status == 'suspended', 1), else_=0)),
+            func.sum(case((User.deleted_at.isnot(None), 1), else_=0)),
+        )
+    ).one()
     counts = {
-        'all': total,
-        'client': User.query.filter_by(role='client').count(),
-        'freelancer': User.query.filter_by(role='freelancer').count(),
-        'admin': User.query.filter_by(role='admin').count(),
-        'suspended': User.query.filter(User.status == 'suspended').count(),
-        'deleted': User.query.filter(User.deleted_at.isnot(None)).count(),
+        'all': users_page.total,
+        'client': kpi[0] or 0,
+        'freelancer': kpi[1] or 0,
+        'admin': kpi[2] or 0,
+        'suspended': kpi[3] or 0,
+        'deleted': kpi[4] or 0,
     }
-    return render_template('admin/users_list.html', users=users, page=page, pages=pages, counts=counts, users_total=total)
+    return render_template('admin/users_list.html', users=users_page.items, page=users_page.page,
+                           pages=users_page.pages, counts=counts, users_total=users_page.total)
 
 @admin_bp.get('/users/<int:user_id>')
 @login_required
@@ -2,11 +2,9 @@ import os, mimetypes
 from io import BytesIO
 from hashlib import md5
 from flask import abort, current_app
-from datetime import datetime
-from ...extensions import db, mail
+from ...extensions import mail
 from ...models.fileasset import FileAsset
-from ...models.invoice import Invoice
-from ...models.quote import Quote
+from ...services import audit_log
 from flask_mail import Message
 # ----- Private storage roots (outside static/) -----
 
@@ -38,44 +36,8 @@ def _etag(b: bytes) -> str:
     return md5(b).hexdigest()
 
 def _record_admin_audit(actor_id: int, action: str, targets: list[int], meta: dict | None = None):
-    # Example stub; adapt to your audit model/table if you have one.
-    # from ...models.audit import AdminAudit
-    # db.session.add(AdminAudit(actor_id=actor_id, action=action, targets=targets, meta=meta))
-    # db.session.commit()
-    pass
-
-def ensure_review_invoice(task):
-    """If the task has an accepted pay_on_delivery quote and no unpaid invoice,
-    create one. Safe to call multiple times (idempotent)."""
-    # already has an unpaid invoice?
-    if any(getattr(inv, "status", None) == "unpaid" for inv in (task.invoices or [])):
-        return None
-
-    # find accepted quote
-    accepted = None
-    if getattr(task, "quotes", None):
-        # latest accepted
-        for q in sorted(task.quotes, key=lambda x: x.id, reverse=True):
-            if getattr(q, "status", "") == "accepted":
-                accepted = q
-                break
-
-    if not accepted:
-        return None
-
-    if (accepted.pay_option or "").lower() != "pay_on_delivery":
-        return None
-
-    inv = Invoice(
-        task_id=task.id,
-        amount=accepted.proposed_price,
-        currency=accepted.currency,
-        status="unpaid",
-        issued_at=datetime.utcnow(),
-    )
-    db.session.add(inv)
-    db.session.commit()
-    return inv
+    """Buffered write to admin_audit (see services/audit_log.py); never raises."""
+    audit_log.record(actor_id=actor_id, action=action, targets=targets, meta=meta)
 
 def email_support_ack(ticket):
     """
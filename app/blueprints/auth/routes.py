@@ -1,4 +1,5 @@
 # app/blueprints/auth/routes.py
+import math
 from datetime import datetime
 from typing import Optional
 
@@ -6,6 +7,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_user, logout_user, login_required, current_user
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 from ...services.email_service import send_email
+from ...services import login_guard
 from ...extensions import db
 from ...models.user import User, ClientProfile, FreelancerProfile
 from ...models.fileasset import FileAsset
@@ -107,10 +109,25 @@ def login():
     form = LoginForm()
     if form.validate_on_submit():
         email = form.email.data.strip().lower()
+        ip = request.remote_addr or "0.0.0.0"  # ProxyFix'd peer; X-Forwarded-For is client-controlled
+
+        # Locked-out IP/account: answer before loading the user or running the KDF
+        wait = login_guard.blocked(ip, email)
+        if wait:
+            flash('Too many failed sign-in attempts. Please try again later.', 'warning')
+            return render_template('auth/login.html', form=form), 429, {"Retry-After": str(max(1, math.ceil(wait)))}
+
         user = User.query.filter_by(email=email).first()
-        if not user or not user.check_password(form.password.data):
+        try:
+            ok = bool(user) and login_guard.check_password(user, form.password.data)
+        except login_guard.KdfBusy:
+            flash('We are busy right now. Please try again in a moment.', 'warning')
+            return render_template('auth/login.html', form=form), 503, {"Retry-After": "5"}
+        if not ok:
+            login_guard.record_failure(ip, email)
             flash('Invalid email or password.', 'danger')
             return render_template('auth/login.html', form=form)
+        login_guard.record_success(email)
 
         if user.status == 'suspended':
             flash('Your account is suspended. Contact support.', 'warning')
@@ -120,6 +137,10 @@ def login():
             flash('This account was deleted.', 'warning')
             return render_template('auth/login.html', form=form)
 
+        # Upgrade hashes made with older cost parameters while we have the password
+        if user.password_needs_rehash():
+            user.set_password(form.password.data)
+
         login_user(user, remember=bool(form.remember.data))
         # Optional: update last login signal if present
         if hasattr(user, 'mark_login'):
@@ -16,6 +16,7 @@ from ...models.quote import Quote
 from ...models.invoice import Invoice
 from ...models.fileasset import FileAsset
 from ...services.storage_service import save_upload, allowed_ext
+from ...services.task_workflow import transition
 
 
 # -----------------
@@ -128,10 +129,7 @@ def task_new():
             )
             db.session.add(asset)
 
-        # New tasks start in awaiting_quote so admin can triage
-        if not t.status:
-            t.status = 'awaiting_quote'
-
+        # New tasks start as 'submitted' (model default) for admin triage
         db.session.commit()
         flash('Task submitted. You will receive a quote shortly.', 'success')
         return redirect(url_for('client.dashboard'))
@@ -220,7 +218,7 @@ def quote_accept(quote_id):
 
     # Accept quote
     q.status = "accepted"
-    t.status = "in_progress"  # or "awaiting_payment" if you prefer to block until paid for pay_now
+    transition([t.id], "in_progress", commit=False)  # or "awaiting_payment" to block until paid for pay_now
 
     inv = None  # IMPORTANT: initialize so we can safely check later
 
@@ -343,7 +341,8 @@ def task_cancel(task_id):
         flash('Task cannot be canceled at this stage.', 'warning')
         return redirect(url_for('client.task_view', task_id=t.id))
 
-    t.status = 'canceled'
-    db.session.commit()
+    if not transition([t.id], 'cancelled').changed:
+        flash('Task cannot be canceled at this stage.', 'warning')
+        return redirect(url_for('client.task_view', task_id=t.id))
     flash('Task canceled.', 'info')
     return redirect(url_for('client.dashboard'))
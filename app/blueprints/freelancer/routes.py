@@ -16,6 +16,7 @@ from ...models.user import (
     FreelancerEducation,
 )
 from ...services.email_service import send_email
+from ...services.task_workflow import transition
 from ...services.storage_service import save_upload, allowed_ext
 from ...models.fileasset import FileAsset
 from ...models.work import WorkSubmission
@@ -84,7 +85,7 @@ def assignment_accept(assignment_id):
     # Ensure related task moves to in_progress
     t = TaskRequest.query.get(a.task_id)
     if t and t.status in ('quoted', 'submitted', 'pending_accept', 'awaiting_quote'):
-        t.status = 'in_progress'
+        transition([t.id], 'in_progress', commit=False)
 
     db.session.commit()
 
@@ -184,10 +185,8 @@ def submit_work(task_id):
         )
         db.session.add(ws)
 
-        # Nudge task status to review if appropriate
-        t = TaskRequest.query.get(task_id)
-        if t and t.status == 'in_progress':
-            t.status = 'review'
+        # Nudge task status to review if appropriate (issues the pay-on-delivery invoice)
+        transition([task_id], 'review', commit=False)
 
         db.session.commit()
         flash('Work submitted.', 'success')
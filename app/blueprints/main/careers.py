@@ -5,18 +5,22 @@ import os, uuid, mimetypes
 
 from app.models.careers import JobPosting, JobApplication
 from app.extensions import db, csrf
+from app.page_cache import cache_page
 
 from . import main_bp
 
 @main_bp.route("/about")
+@cache_page()
 def about():
     return render_template("about.html")
 
 @main_bp.route("/cookies")
+@cache_page()
 def cookies():
     return render_template("cookies.html")
 
 @main_bp.route("/careers")
+@cache_page(args=("q", "department"))
 def careers():
     q = (request.args.get("q") or "").strip()
     dept = (request.args.get("department") or "").strip()
@@ -1,12 +1,35 @@
-from datetime import datetime, timedelta
 from flask import request, redirect, url_for, flash, current_app
 from flask_login import current_user
 from app.extensions import db
+from app.models.assignment import Assignment
 from app.models.feedback import Rating
+from app.models.task import TaskRequest
+from app.ratelimit import client_ip, rate_limit
 
 from . import main_bp
 
+# Task statuses after which a client may rate the freelancer who did the work
+_RATEABLE_STATUSES = ("delivered", "closed")
+
+
+def _rateable_freelancer(freelancer_id):
+    """``freelancer_id`` if the signed-in client has a completed task with that freelancer, else None."""
+    if not freelancer_id or not current_user.is_authenticated:
+        return None
+    done = (db.session.query(Assignment.id)
+            .join(TaskRequest, TaskRequest.id == Assignment.task_id)
+            .filter(Assignment.assignee_id == freelancer_id,
+                    Assignment.status == "accepted",
+                    TaskRequest.client_id == current_user.id,
+                    TaskRequest.status.in_(_RATEABLE_STATUSES))
+            .first())
+    return freelancer_id if done else None
+
+def _rating_limit():
+    return f"1/{int(current_app.config.get('RATING_THROTTLE_SECONDS') or 60)}s"
+
 @main_bp.route("/rate", methods=["POST"], endpoint="rating_post")
+@rate_limit(_rating_limit, key="user", scope="rating")  # spam throttle (by user or IP)
 def rating_post():
     # Basic validation
     try:
@@ -25,24 +48,15 @@ def rating_post():
         flash("Comment is too long.", "warning")
         return redirect(request.referrer or url_for("main.index"))
 
-    # Spam throttle (by user or IP)
-    window = int(current_app.config.get("RATING_THROTTLE_SECONDS", 60))
-    since = datetime.utcnow() - timedelta(seconds=window)
-    ip = request.headers.get("X-Forwarded-For", request.remote_addr or "")
-    ua = (request.user_agent.string or "")[:300]
-
-    qry = Rating.query.filter(Rating.created_at >= since)
-    if current_user.is_authenticated:
-        qry = qry.filter(Rating.user_id == current_user.id)
-    else:
-        qry = qry.filter(Rating.ip == ip)
+    # Optional: rating a specific freelancer rather than the site; only their own clients may
+    freelancer_id = _rateable_freelancer(request.form.get("freelancer_id", type=int))
 
-    if qry.count() >= 1:
-        flash("You’re sending feedback too quickly. Please try again shortly.", "warning")
-        return redirect(request.referrer or url_for("main.index"))
+    ip = client_ip()
+    ua = (request.user_agent.string or "")[:300]
 
     r = Rating(
         user_id=(current_user.id if current_user.is_authenticated else None),
+        freelancer_id=freelancer_id,
         name=name or (getattr(current_user, "name", None) if current_user.is_authenticated else None),
         email=email or (getattr(current_user, "email", None) if current_user.is_authenticated else None),
         stars=stars,
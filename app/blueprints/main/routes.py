@@ -9,15 +9,19 @@ import os, uuid, mimetypes
 from werkzeug.utils import secure_filename
 from urllib.parse import urlparse
 from app.extensions import db, mail
+from app.page_cache import cache_page
+from app.ratelimit import client_ip, rate_limit
 from app.models.support import SupportTicket, SupportAttachment, SupportMessage
 
 from . import main_bp
 
 @main_bp.route("/privacy")
+@cache_page()
 def privacy():
     return render_template("static/privacy.html")
 
 @main_bp.route("/terms")
+@cache_page()
 def terms():
     return render_template("static/terms.html")
 
@@ -34,9 +38,8 @@ def support():
                    .all())
     return render_template("static/support.html", tickets=tickets)
 
-# ---- Spam throttle config (simple DB-based) ----
-THROTTLE_WINDOW_MIN = 10
-THROTTLE_MAX = 3  # max tickets per email/IP in window
+# ---- Spam throttle: max tickets per email/IP in window (see app/ratelimit.py) ----
+SUPPORT_LIMIT = "3/10m"
 ALLOWED_EXTS = {"png","jpg","jpeg","gif","pdf","mp4","txt","zip"}
 MAX_FILES = 5
 MAX_EACH_FILE_MB = 10
@@ -44,11 +47,11 @@ MAX_EACH_FILE_MB = 10
 def _allowed_file(filename: str) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTS
 
-def _client_ip():
-    h = request.headers.get("X-Forwarded-For", "")  # respect proxy
-    return (h.split(",")[0].strip() if h else request.remote_addr) or "0.0.0.0"
+_client_ip = client_ip
 
 @main_bp.route("/support/new", methods=["POST"])
+@rate_limit(SUPPORT_LIMIT, key="ip", scope="support")
+@rate_limit(SUPPORT_LIMIT, key="email", scope="support")
 def support_new():
     # Honeypot
     if request.form.get("website"):
@@ -61,16 +64,6 @@ def support_new():
     message = (request.form.get("message") or "").strip()
     ip = _client_ip()
 
-    # ---- Throttle by email/IP in last N minutes ----
-    window_start = datetime.utcnow() - timedelta(minutes=THROTTLE_WINDOW_MIN)
-    recent_count = (SupportTicket.query
-                    .filter(SupportTicket.created_at >= window_start)
-                    .filter((SupportTicket.email == email) | (SupportTicket.ip_address == ip))
-                    .count())
-    if recent_count >= THROTTLE_MAX:
-        flash("You’ve reached the submission limit. Please try again later.", "warning")
-        return redirect(url_for("main.support") + "#contact")
-
     # Validation
     errors = []
     if not name: errors.append("Name is required.")
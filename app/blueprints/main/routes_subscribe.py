@@ -1,20 +1,16 @@
 from flask import request, redirect, url_for, flash, current_app, render_template
 from sqlalchemy import func
 from app.models.marketing import Subscriber
-from datetime import datetime, timedelta
+from datetime import datetime
 from app.extensions import db
 from flask_mail import Message
 from app.extensions import mail
+from app.ratelimit import rate_limit
 
 from . import main_bp
 
 # basic throttle: 5 requests / 10 minutes per IP/email
-SUB_THROTTLE_MAX = 5
-SUB_THROTTLE_WINDOW_MIN = 10
-
-def _client_ip():
-    h = request.headers.get("X-Forwarded-For")
-    return (h.split(",")[0].strip() if h else request.remote_addr) or "0.0.0.0"
+SUB_LIMIT = "5/10m"
 
 @main_bp.route("/subscribe", methods=["GET"])
 def subscribe_form():
@@ -22,6 +18,8 @@ def subscribe_form():
     # If you only use the footer form, you can skip this view/template.
 
 @main_bp.route("/subscribe", methods=["POST"])
+@rate_limit(SUB_LIMIT, key="ip", scope="subscribe")
+@rate_limit(SUB_LIMIT, key="email", scope="subscribe")
 def subscribe_post():
     email = (request.form.get("email") or "").strip().lower()
     name = (request.form.get("name") or "").strip() or None
@@ -31,16 +29,6 @@ def subscribe_post():
         flash("Please enter a valid email.", "warning")
         return redirect(request.referrer or url_for("main.index"))
 
-    # throttle
-    window_start = datetime.utcnow() - timedelta(minutes=SUB_THROTTLE_WINDOW_MIN)
-    recent = Subscriber.query.filter(
-        Subscriber.created_at >= window_start,
-        Subscriber.email == email
-    ).count()
-    if recent >= SUB_THROTTLE_MAX:
-        flash("Please try again later.", "info")
-        return redirect(request.referrer or url_for("main.index"))
-
     sub = Subscriber.query.filter_by(email=email).first()
     if sub:
         if not sub.is_active:
@@ -2,9 +2,10 @@
 from datetime import datetime
 from types import SimpleNamespace
 
-from flask import redirect, url_for, flash, request, current_app
+from flask import redirect, url_for, flash, request, current_app, has_request_context
 from flask_login import login_required, current_user
 
+from ... import request_id
 from ...extensions import db
 from ...models.invoice import Invoice
 from ...models.task import TaskRequest
@@ -12,8 +13,6 @@ from ...services.payment_service import submit_order_request, get_transaction_st
 from ...services.billing_notifications import email_payment_received
 from . import payments_bp
 
-import json
-
 
 # -----------------
 # Helpers
@@ -43,6 +42,25 @@ def _build_payment_for_email(inv: Invoice, *, method="online", reference=None):
     )
 
 
+def _with_request_trail(meta, previous=None) -> dict:
+    """``meta`` plus the correlation IDs of every request that touched the invoice.
+
+    Kept under ``request_ids`` (newest last) so /admin/trace can go from an
+    invoice to the pay request, the return/IPN hits and the receipt email.
+    """
+    meta = dict(meta) if isinstance(meta, dict) else {}
+    trail = list((previous if isinstance(previous, dict) else meta).get("request_ids") or [])
+    rid = request_id.current()
+    if rid and not any(t.get("id") == rid for t in trail):
+        trail.append({
+            "id": rid,
+            "endpoint": request.endpoint if has_request_context() else None,
+            "at": datetime.utcnow().isoformat(timespec="seconds"),
+        })
+    meta["request_ids"] = trail[-20:]
+    return meta
+
+
 def _safe_flash(msg: str, category: str = "info"):
     """Only flash when there's a request context that can store it (skip IPN)."""
     try:
@@ -76,6 +94,7 @@ def pay_invoice(invoice_id):
         uniq_ref = f"{base_ref}-{int(datetime.utcnow().timestamp())}"
 
     inv.pesapal_merchant_ref = uniq_ref
+    inv.gateway_meta = _with_request_trail(inv.gateway_meta)
     db.session.commit()
 
     desc = f"Task #{inv.task_id} invoice #{inv.id}"
@@ -124,16 +143,8 @@ def _sync_status_from_pesapal(inv: Invoice, tracking_id: str, *, with_flash: boo
             _safe_flash("We couldn't verify the payment at the moment. Please refresh in a moment.", "warning")
         return
 
-    # Persist gateway payload for auditing
-    try:
-        # If your column is JSON, assigning dict is fine; if it's Text, serialize:
-        inv.gateway_meta = data if hasattr(type(inv), "gateway_meta").type.python_type is dict else json.dumps(data)
-    except Exception:
-        # Fallback to text
-        try:
-            inv.gateway_meta = json.dumps(data)
-        except Exception:
-            pass
+    # Persist gateway payload for auditing (JSON column), keeping the request trail
+    inv.gateway_meta = _with_request_trail(data, previous=inv.gateway_meta)
 
     inv.pesapal_tracking_id = tracking_id or inv.pesapal_tracking_id
     status_desc = (data.get("payment_status_description") or "").upper()  # COMPLETED/PENDING/FAILED/REVERSED
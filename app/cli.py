@@ -0,0 +1,479 @@
+# app/cli.py
+"""Flask CLI commands (`flask bench ...`, `flask analytics ...`, `flask security ...`, `flask ratings ...`,
+`flask assets ...`, `flask templates ...`, `flask compliance ...`)."""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import click
+from flask.cli import AppGroup
+
+from .database import apply_sqlite_pragmas, sqlite_pragmas
+
+bench_cli = AppGroup("bench", help="Local performance benchmarks.")
+analytics_cli = AppGroup("analytics", help="Scheduled analytics jobs.")
+security_cli = AppGroup("security", help="Login guard and password hashing tools.")
+ratings_cli = AppGroup("ratings", help="Rating aggregate maintenance.")
+assets_cli = AppGroup("assets", help="Static asset build steps.")
+templates_cli = AppGroup("templates", help="Jinja template cache.")
+compliance_cli = AppGroup("compliance", help="GDPR export housekeeping.")
+
+
+def _pct(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def _sqlite_contention_run(path, *, tuned, config, writers, readers, seconds):
+    """Hammer one SQLite file with concurrent writers/readers; return stats dict."""
+    setup = sqlite3.connect(path)
+    if tuned:
+        apply_sqlite_pragmas(setup, sqlite_pragmas(config))
+    setup.execute("CREATE TABLE IF NOT EXISTS bench (id INTEGER PRIMARY KEY, body TEXT, created_at REAL)")
+    setup.commit()
+    setup.close()
+
+    stop = time.monotonic() + seconds
+    lock = threading.Lock()
+    stats = {"writes": 0, "reads": 0, "errors": 0, "write_lat": []}
+
+    def _connect():
+        # Same busy timeout on both sides so the comparison is journal/sync mode only
+        conn = sqlite3.connect(path, timeout=int(config.get("SQLITE_BUSY_TIMEOUT_MS", 5000)) / 1000)
+        if tuned:
+            apply_sqlite_pragmas(conn, sqlite_pragmas(config))
+        return conn
+
+    def writer():
+        conn = _connect()
+        local_lat, n, err = [], 0, 0
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            try:
+                conn.execute("INSERT INTO bench (body, created_at) VALUES (?, ?)", ("x" * 200, time.time()))
+                conn.commit()
+                n += 1
+                local_lat.append(time.perf_counter() - t0)
+            except sqlite3.OperationalError:
+                conn.rollback()
+                err += 1
+        conn.close()
+        with lock:
+            stats["writes"] += n
+            stats["errors"] += err
+            stats["write_lat"].extend(local_lat)
+
+    def reader():
+        conn = _connect()
+        n, err = 0, 0
+        while time.monotonic() < stop:
+            try:
+                conn.execute("SELECT COUNT(*), MAX(id) FROM bench").fetchone()
+                n += 1
+            except sqlite3.OperationalError:
+                err += 1
+        conn.close()
+        with lock:
+            stats["reads"] += n
+            stats["errors"] += err
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return stats
+
+
+@bench_cli.command("sqlite-writes")
+@click.option("--writers", default=4, show_default=True, help="Concurrent writer threads.")
+@click.option("--readers", default=4, show_default=True, help="Concurrent reader threads.")
+@click.option("--seconds", default=5.0, show_default=True, help="Duration of each run.")
+def bench_sqlite_writes(writers, readers, seconds):
+    """Compare default rollback-journal SQLite with the tuned (WAL) pragmas."""
+    from flask import current_app
+
+    cfg = current_app.config
+    click.echo(f"writers={writers} readers={readers} seconds={seconds}")
+    click.echo(f"{'mode':<10}{'writes/s':>10}{'reads/s':>12}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+    for label, tuned in (("default", False), ("tuned", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            s = _sqlite_contention_run(
+                os.path.join(tmp, "bench.db"),
+                tuned=tuned, config=cfg, writers=writers, readers=readers, seconds=seconds,
+            )
+        click.echo(
+            f"{label:<10}{s['writes'] / seconds:>10.0f}{s['reads'] / seconds:>12.0f}"
+            f"{_pct(s['write_lat'], 0.50) * 1000:>9.2f}{_pct(s['write_lat'], 0.95) * 1000:>9.2f}{s['errors']:>8}"
+        )
+
+
+@bench_cli.command("list-rows")
+@click.option("--rows", default=1000, show_default=True, help="Rows fetched per run.")
+@click.option("--repeat", default=5, show_default=True, help="Runs per variant (best time is reported).")
+def bench_list_rows(rows, repeat):
+    """Compare ORM hydration with the admin read models on one list page."""
+    import tracemalloc
+
+    from .blueprints.admin.read_models import RatingRow, UserRow, fetch_rows
+    from .extensions import db
+    from .models.feedback import Rating
+    from .models.user import User
+
+    cases = (
+        ("users", lambda: User.query.limit(rows).all(),
+         lambda: fetch_rows(UserRow, UserRow.select().limit(rows))),
+        ("ratings", lambda: Rating.query.limit(rows).all(),
+         lambda: fetch_rows(RatingRow, RatingRow.select().limit(rows))),
+    )
+    click.echo(f"{'list':<10}{'variant':<10}{'rows':>7}{'ms':>9}{'KiB':>10}")
+    for name, orm_fn, row_fn in cases:
+        for label, fn in (("orm", orm_fn), ("rows", row_fn)):
+            best, peak, n = float("inf"), 0, 0
+            for _ in range(repeat):
+                db.session.expunge_all()
+                tracemalloc.start()
+                t0 = time.perf_counter()
+                n = len(fn())
+                best = min(best, time.perf_counter() - t0)
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            click.echo(f"{name:<10}{label:<10}{n:>7}{best * 1000:>9.2f}{peak / 1024:>10.0f}")
+    db.session.remove()
+
+
+def _compress_samples(paths, csv_rows):
+    import csv
+    import io
+    from datetime import datetime, timedelta
+
+    from flask import current_app
+
+    samples = []
+    client = current_app.test_client()
+    for path in paths:
+        resp = client.get(path)
+        samples.append((f"GET {path}", resp.get_data(), 0))
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["id", "email", "name", "role", "status", "created_at"])
+    start = datetime(2024, 1, 1)
+    for i in range(csv_rows):
+        writer.writerow([i, f"user{i}@example.com", f"User {i}", ("client", "freelancer")[i % 2],
+                         ("active", "pending", "blocked")[i % 3], (start + timedelta(minutes=7 * i)).isoformat() + "Z"])
+    samples.append((f"csv {csv_rows} rows", buf.getvalue().encode(), 64 * 1024))
+    return samples
+
+
+@bench_cli.command("compression")
+@click.option("--path", "paths", multiple=True, default=("/", "/about"), show_default=True,
+              help="Pages rendered as HTML samples.")
+@click.option("--csv-rows", default=20000, show_default=True, help="Rows in the synthetic CSV export sample.")
+@click.option("--repeat", default=5, show_default=True, help="Runs per setting (best time is reported).")
+def bench_compression(paths, csv_rows, repeat):
+    """CPU time vs bytes saved for each gzip level / brotli quality on real pages and a CSV export."""
+    from .compression import CompressionMiddleware, brotli
+
+    mw = CompressionMiddleware(None)
+    settings = [("gzip", level) for level in (1, 3, 6, 9)]
+    if brotli is not None:
+        settings += [("br", q) for q in (1, 4, 6, 9, 11)]
+    else:
+        click.echo("brotli not installed: gzip only")
+
+    click.echo(f"{'sample':<18}{'setting':<10}{'KiB in':>9}{'KiB out':>9}{'ratio':>7}{'ms':>9}{'MiB/s':>8}")
+    for name, body, chunk in _compress_samples(paths, csv_rows):
+        chunks = [body[i:i + chunk] for i in range(0, len(body), chunk)] if chunk else [body]
+        for encoding, level in settings:
+            mw.level = mw.brotli_quality = level
+            best, out = float("inf"), 0
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                out = sum(map(len, mw._stream(mw.compressor(encoding), chunks)))
+                best = min(best, time.perf_counter() - t0)
+            click.echo(
+                f"{name:<18}{f'{encoding}-{level}':<10}{len(body) / 1024:>9.1f}{out / 1024:>9.1f}"
+                f"{len(body) / max(out, 1):>7.1f}{best * 1000:>9.2f}{len(body) / 1048576 / best:>8.0f}"
+            )
+
+
+# Loaded on first use only; importing any of them from create_app() is a regression
+LAZY_MODULES = ("weasyprint", "pdfkit", "reportlab", "PIL", "sentry_sdk", "requests", "alembic", "flask_migrate")
+
+_STARTUP_SNIPPET = (
+    "import time; t0 = time.perf_counter()\n"
+    "from app import create_app; create_app()\n"
+    "import sys; print('startup_ms=%s' % ((time.perf_counter() - t0) * 1000)); "
+    "print('eager=' + ','.join(sorted(m for m in sys.modules if m.split('.')[0] in {lazy})))"
+)
+
+
+def _startup_run(root):
+    """create_app() in a fresh interpreter under -X importtime: (ms, {module: cumulative us}, eager lazies)."""
+    import subprocess
+    import sys
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _STARTUP_SNIPPET.format(lazy=set(LAZY_MODULES))],
+        cwd=root, capture_output=True, text=True, check=True,
+    )
+    out = dict(line.split("=", 1) for line in proc.stdout.splitlines() if line.startswith(("startup_ms=", "eager=")))
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if cumulative.strip().isdigit() and depth <= 1:  # the app package and what it imports directly
+            modules[name.strip()] = int(cumulative)
+    return float(out["startup_ms"]), modules, [m for m in out["eager"].split(",") if m]
+
+
+@bench_cli.command("startup")
+@click.option("--runs", default=3, show_default=True, help="Fresh interpreters (best time is reported).")
+@click.option("--top", default=15, show_default=True, help="Slowest top-level imports to list.")
+@click.option("--budget-ms", type=float, default=None,
+              help="Fail (exit 1) when create_app() takes longer than this. Default: STARTUP_BUDGET_MS.")
+def bench_startup(runs, top, budget_ms):
+    """Cold-start time of create_app() with an -X importtime breakdown; fails over budget (CI)."""
+    from flask import current_app
+
+    root = os.path.dirname(current_app.root_path)
+    best_ms, best_modules, eager = float("inf"), {}, []
+    for _ in range(runs):
+        ms, modules, eager = _startup_run(root)
+        if ms < best_ms:
+            best_ms, best_modules = ms, modules
+
+    click.echo(f"{'module':<48}{'ms':>9}")
+    for name, us in sorted(best_modules.items(), key=lambda kv: -kv[1])[:top]:
+        click.echo(f"{name:<48}{us / 1000:>9.1f}")
+    click.echo(f"\ncreate_app() cold start: {best_ms:.0f} ms (best of {runs})")
+
+    failed = False
+    if eager:
+        click.echo(f"FAIL: imported at startup but should load lazily: {', '.join(eager)}")
+        failed = True
+    budget_ms = budget_ms if budget_ms is not None else current_app.config.get("STARTUP_BUDGET_MS")
+    if budget_ms and best_ms > budget_ms:
+        click.echo(f"FAIL: over the {budget_ms:.0f} ms budget")
+        failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+_MEMORY_CHILD = (
+    "import json, sys\n"
+    "from app import create_app\n"
+    "from app.worker import memory_usage\n"
+    "client = create_app().test_client()\n"
+    "for path in sys.argv[1:]: client.get(path)\n"
+    "print('ready', flush=True); sys.stdin.readline()\n"
+    "print(json.dumps(memory_usage()), flush=True)\n"
+)
+
+
+def _forked_worker(app, pages):
+    """Fork a child that behaves like a preloaded gunicorn worker; returns (pid, go_fd, out_file)."""
+    import json
+
+    from .worker import after_fork, memory_usage
+
+    r_go, w_go = os.pipe()
+    r_out, w_out = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(w_go)
+            os.close(r_out)
+            after_fork(app)
+            client = app.test_client()
+            for path in pages:
+                client.get(path)
+            os.write(w_out, b"ready\n")
+            os.read(r_go, 1)
+            os.write(w_out, json.dumps(memory_usage()).encode() + b"\n")
+        finally:
+            os._exit(0)
+    os.close(r_go)
+    os.close(w_out)
+    return pid, w_go, os.fdopen(r_out)
+
+
+@bench_cli.command("fork-memory")
+@click.option("--workers", default=4, show_default=True)
+@click.option("--page", "pages", multiple=True, default=("/", "/about", "/login"), show_default=True,
+              help="Pages each worker renders before it is measured.")
+def bench_fork_memory(workers, pages):
+    """Per-worker memory: app loaded in each worker vs preloaded in the parent and forked (Linux)."""
+    import json
+    import subprocess
+    import sys
+
+    from flask import current_app
+
+    from .template_cache import warm_templates
+    from .worker import memory_usage
+
+    def _row(label, mems, extra_pss=0):
+        avg = {k: sum(m[k] for m in mems) / len(mems) for k in ("rss", "pss", "uss")}
+        total = sum(m["pss"] for m in mems) + extra_pss
+        click.echo(f"{label:<12}{avg['rss'] / 1024:>10.1f}{avg['pss'] / 1024:>10.1f}{avg['uss'] / 1024:>10.1f}"
+                   f"{total / 1024:>12.1f}")
+
+    click.echo(f"{'mode':<12}{'RSS MiB':>10}{'PSS MiB':>10}{'USS MiB':>10}{'total PSS':>12}")
+
+    # Without preload: every worker imports and builds the app itself
+    root = os.path.dirname(current_app.root_path)
+    procs = [subprocess.Popen([sys.executable, "-c", _MEMORY_CHILD, *pages], cwd=root, text=True,
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+             for _ in range(workers)]
+    for p in procs:
+        for line in p.stdout:
+            if line.strip() == "ready":
+                break
+        else:
+            raise click.ClickException("a worker exited before rendering its pages (is the database migrated?)")
+    mems = []
+    for p in procs:  # measure while all are alive: PSS splits shared pages between them
+        p.stdin.write("\n")
+        p.stdin.flush()
+    for p in procs:
+        mems.append(json.loads(p.stdout.readline()))
+        p.wait()
+    _row("per-worker", mems)
+
+    # With preload: build once here (templates compiled), fork the workers
+    app = current_app._get_current_object()
+    warm_templates(app)
+    children = [_forked_worker(app, pages) for _ in range(workers)]
+    for _, _, out in children:
+        if out.readline().strip() != "ready":
+            raise click.ClickException("a forked worker exited before rendering its pages")
+    for _, go, _ in children:
+        os.write(go, b"g")
+    parent = memory_usage()
+    mems = [json.loads(out.readline()) for _, _, out in children]
+    for pid, go, out in children:
+        os.waitpid(pid, 0)
+        os.close(go)
+        out.close()
+    _row("preload", mems, extra_pss=parent["pss"])
+    click.echo("total PSS = real memory of all workers (+ the preloading parent)")
+
+
+@analytics_cli.command("rollup")
+@click.option("--rebuild", is_flag=True, help="Drop the rollups and recompute from the full history.")
+def analytics_rollup(rebuild):
+    """Fold new task status events into the daily time-in-status rollups (run from cron)."""
+    from .services.task_analytics import rollup_status_times
+
+    stats = rollup_status_times(rebuild=rebuild)
+    click.echo(f"events={stats['events']} days={stats['days']} rows={stats['rows']}")
+
+
+@security_cli.command("login-stats")
+def security_login_stats():
+    """Host-wide login guard counters (failures, lockouts, rejected attempts)."""
+    from .services.login_guard import metrics
+
+    for name, count in metrics().items():
+        click.echo(f"{name:<18}{count:>10}")
+
+
+@security_cli.command("hash-bench")
+@click.option("--target-ms", default=250.0, show_default=True, help="Acceptable verify time per login.")
+@click.option("--rounds", default=5, show_default=True)
+@click.option("--method", "methods", multiple=True, help="Extra Werkzeug method strings to time.")
+def security_hash_bench(target_ms, rounds, methods):
+    """Time password hash/verify per method here and recommend PASSWORD_HASH_METHOD."""
+    from .services.password_hashing import CANDIDATES, benchmark, configured_method, canonical, recommend
+
+    results = benchmark(tuple(dict.fromkeys(CANDIDATES + methods)), rounds=rounds)
+    current = canonical(configured_method())
+    click.echo(f"{'method':<26}{'hash ms':>10}{'verify ms':>11}")
+    for r in results:
+        mark = " <- current" if r["method"] == current else ""
+        click.echo(f"{r['method']:<26}{r['hash_ms']:>10.1f}{r['verify_ms']:>11.1f}{mark}")
+
+    best = recommend(results, target_ms)
+    if best is None:
+        click.echo(f"No candidate verifies within {target_ms:.0f} ms on this machine.")
+        return
+    click.echo(f"\nRecommended for <= {target_ms:.0f} ms: PASSWORD_HASH_METHOD={best['method']}")
+    if best["method"] != current:
+        click.echo("Existing hashes are upgraded on each user's next login.")
+
+
+@ratings_cli.command("rebuild")
+def ratings_rebuild():
+    """Recompute the rating aggregates (site, per freelancer, per day) from scratch."""
+    from .services.rating_aggregates import rebuild
+
+    click.echo(f"rows={rebuild()}")
+
+
+@assets_cli.command("images")
+@click.option("--force", is_flag=True, help="Rebuild every variant, not just stale ones.")
+def assets_images(force):
+    """Generate AVIF/WebP/PNG size variants of the landing images and their manifest."""
+    from flask import current_app
+    from .image_pipeline import build_images
+
+    stats = build_images(current_app, force=force)
+    click.echo(f"built={len(stats['built'])} fresh={len(stats['fresh'])} removed={stats['removed']}")
+    for rel in stats["built"]:
+        click.echo(f"  {rel}")
+
+
+@assets_cli.command("build")
+@click.option("--minify/--no-minify", default=None, help="Minify CSS/JS first (default: ASSETS_MINIFY).")
+def assets_build(minify):
+    """Write content-hashed, precompressed copies of the static CSS/JS/icons and their manifest."""
+    from flask import current_app
+    from .static_assets import brotli, build_assets
+
+    if minify is None:
+        minify = current_app.config.get("ASSETS_MINIFY", True)
+    manifest = build_assets(current_app, minify=minify)
+    for rel, hashed in sorted(manifest.items()):
+        click.echo(f"  {rel} -> {hashed}")
+    click.echo(f"files={len(manifest)} minify={int(minify)} brotli={int(brotli is not None)}")
+
+
+@templates_cli.command("warm")
+def templates_warm():
+    """Compile every template into the bytecode cache (run at deploy time)."""
+    from flask import current_app
+    from .template_cache import warm_templates
+
+    stats = warm_templates(current_app)
+    for name, error in stats["errors"].items():
+        click.echo(f"  {name}: {error}", err=True)
+    click.echo(f"loaded={stats['loaded']} errors={len(stats['errors'])} ms={stats['seconds'] * 1000:.0f}")
+    if stats["errors"]:
+        raise SystemExit(1)
+
+
+@compliance_cli.command("sweep-exports")
+@click.option("--days", type=float, default=None, help="Retention in days (default: GDPR_EXPORT_RETENTION_DAYS).")
+def compliance_sweep_exports(days):
+    """Delete GDPR export ZIPs older than the retention period (run daily from cron)."""
+    from .services.compliance_service import sweep_exports
+
+    click.echo(f"removed={sweep_exports(days)}")
+
+
+def register_cli(app):
+    app.cli.add_command(bench_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(security_cli)
+    app.cli.add_command(ratings_cli)
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(templates_cli)
+    app.cli.add_command(compliance_cli)
@@ -0,0 +1,196 @@
+# app/compression.py
+"""
+WSGI response compression (gzip, or brotli when the ``brotli`` package is
+installed), so HTML and CSV exports are compressed whether or not the proxy
+in front is configured for it.
+
+    app.wsgi_app = CompressionMiddleware.from_config(app.wsgi_app, app.config)
+
+A response is left alone when the client doesn't accept either encoding, it
+is a HEAD/204/304, already has a ``Content-Encoding`` (e.g. precompressed
+static assets), says ``Cache-Control: no-transform``, or its MIME type is not
+in ``COMPRESS_MIMETYPES`` (PDFs, images and archives are compressed already).
+
+The middleware reads the body up to ``COMPRESS_MIN_SIZE`` bytes before
+deciding: bodies that end before that are sent as-is. Bodies of known length
+(rendered pages) are compressed in one go with a new ``Content-Length``;
+streamed bodies (CSV exports) are compressed chunk by chunk. Output is flushed
+at least every ``COMPRESS_FLUSH_BYTES`` of input, so a streamed download keeps
+moving and memory stays bounded by the compressor window.
+"""
+from __future__ import annotations
+
+import zlib
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only without it
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    "text/html", "text/css", "text/plain", "text/csv", "text/xml", "text/javascript",
+    "application/javascript", "application/json", "application/xml", "image/svg+xml",
+)
+BUFFER_MAX = 1024 * 1024  # bodies with a known length up to this are compressed in one go
+
+
+class _Gzip:
+    def __init__(self, level):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data):
+        return self._z.compress(data)
+
+    def flush(self):
+        return self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._z.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, quality):
+        self._c = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._c.process(data)
+
+    def flush(self):
+        return self._c.flush()
+
+    def finish(self):
+        return self._c.finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, app, *, level: int = 6, brotli_quality: int = 4, min_size: int = 1024,
+                 flush_bytes: int = 64 * 1024, mimetypes=DEFAULT_MIMETYPES):
+        self.app = app
+        self.level, self.brotli_quality = level, brotli_quality
+        self.min_size, self.flush_bytes = min_size, flush_bytes
+        self.mimetypes = frozenset(mimetypes)
+
+    @classmethod
+    def from_config(cls, app, config):
+        mimetypes = config.get("COMPRESS_MIMETYPES") or DEFAULT_MIMETYPES
+        if isinstance(mimetypes, str):
+            mimetypes = [m.strip() for m in mimetypes.split(",") if m.strip()]
+        return cls(
+            app,
+            level=int(config.get("COMPRESS_LEVEL", 6)),
+            brotli_quality=int(config.get("COMPRESS_BR_QUALITY", 4)),
+            min_size=int(config.get("COMPRESS_MIN_SIZE", 1024)),
+            flush_bytes=int(config.get("COMPRESS_FLUSH_BYTES", 64 * 1024)),
+            mimetypes=mimetypes,
+        )
+
+    def compressor(self, encoding: str):
+        return _Brotli(self.brotli_quality) if encoding == "br" else _Gzip(self.level)
+
+    # --- negotiation ---
+
+    def negotiate(self, accept_encoding: str) -> str | None:
+        accepted = parse_accept_header(accept_encoding)
+        if brotli is not None and accepted["br"]:
+            return "br"
+        if accepted["gzip"]:
+            return "gzip"
+        return None
+
+    def _compressible(self, status: str, headers: Headers) -> bool:
+        code = int(status.split(" ", 1)[0])
+        if code < 200 or code in (204, 206, 304):
+            return False
+        if "Content-Encoding" in headers or "no-transform" in headers.get("Cache-Control", ""):
+            return False
+        mimetype = headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        if mimetype not in self.mimetypes:
+            return False
+        length = headers.get("Content-Length")
+        return not (length and length.isdigit() and int(length) < self.min_size)
+
+    # --- WSGI ---
+
+    def __call__(self, environ, start_response):
+        encoding = self.negotiate(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None or environ.get("REQUEST_METHOD") == "HEAD":
+            return self.app(environ, start_response)
+
+        captured = []
+
+        def _start_response(status, headers, exc_info=None):
+            captured[:] = [status, headers, exc_info]
+            return _write
+
+        def _write(data):  # legacy write() callable; Flask doesn't use it
+            head.append(data)
+
+        head = []
+        app_iter = self.app(environ, _start_response)
+        it = iter(app_iter)
+        close = getattr(app_iter, "close", None)
+
+        # Read up to min_size bytes: enough to decide, and to skip small streamed bodies
+        size, exhausted = sum(map(len, head)), False
+        while not captured or (size < self.min_size and not exhausted):
+            try:
+                chunk = next(it)
+            except StopIteration:
+                exhausted = True
+                if captured:
+                    break
+                raise RuntimeError("WSGI app returned without calling start_response")
+            if chunk:
+                head.append(chunk)
+                size += len(chunk)
+
+        status, header_list, exc_info = captured
+        headers = Headers(header_list)
+        if not self._compressible(status, headers) or (exhausted and size < self.min_size):
+            start_response(status, header_list, exc_info)
+            return ClosingIterator(_chain(head, it), close)
+
+        length = headers.get("Content-Length", "")
+        if not exhausted and length.isdigit() and int(length) <= BUFFER_MAX:
+            head.extend(it)  # the app already holds it in memory
+            exhausted = True
+
+        headers.remove("Content-Length")
+        headers["Content-Encoding"] = encoding
+        vary = headers.get("Vary", "")
+        if "accept-encoding" not in vary.lower():
+            headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+        etag = headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag  # same entity, different bytes
+
+        compressor = self.compressor(encoding)
+        if exhausted:
+            body = compressor.compress(b"".join(head)) + compressor.finish()
+            headers["Content-Length"] = str(len(body))
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return ClosingIterator([body], close)
+
+        start_response(status, headers.to_wsgi_list(), exc_info)
+        return ClosingIterator(self._stream(compressor, _chain(head, it)), close)
+
+    def _stream(self, compressor, chunks):
+        pending = 0
+        for chunk in chunks:
+            out = compressor.compress(chunk)
+            pending += len(chunk)
+            if pending >= self.flush_bytes:
+                out += compressor.flush()
+                pending = 0
+            if out:
+                yield out
+        yield compressor.finish()
+
+
+def _chain(head, it):
+    yield from head
+    yield from it
@@ -27,12 +27,34 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Optional read replica: list/report views wrapped in read_only() read from it
+    SQLALCHEMY_BINDS = (
+        {"replica": os.getenv("DATABASE_REPLICA_URL")} if os.getenv("DATABASE_REPLICA_URL") else {}
+    )
+    DB_REPLICA_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", "10"))  # read-your-writes window
+
+    # SQLite pragmas (applied on every new connection)
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-20000"))  # negative = KiB
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(128 * 1024 * 1024)))
+    SQLITE_FOREIGN_KEYS = _as_bool(os.getenv("SQLITE_FOREIGN_KEYS", "1"))
+
+    # Pool policy for server databases (ignored for SQLite)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = _as_bool(os.getenv("DB_POOL_PRE_PING", "1"))
+
     # CSRF
     WTF_CSRF_TIME_LIMIT = None
 
     # --- Uploads ---
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "instance/uploads")
     MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", str(50 * 1024 * 1024)))  # 50MB
+    GDPR_EXPORT_RETENTION_DAYS = float(os.getenv("GDPR_EXPORT_RETENTION_DAYS", "7"))  # instance/exports/gdpr
 
     # --- Mail ---
     MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
@@ -46,11 +68,102 @@ class Config:
     MAIL_MAX_EMAILS = None
     MAIL_ASCII_ATTACHMENTS = False
 
+    # --- Background jobs (in-process pool; see services/jobs.py) ---
+    JOBS_MAX_WORKERS = int(os.getenv("JOBS_MAX_WORKERS", "2"))
+    JOBS_SYNC = _as_bool(os.getenv("JOBS_SYNC", "0"))  # run jobs inline (tests/scripts)
+
+    # --- Admin audit log (buffered writes; see services/audit_log.py) ---
+    AUDIT_BUFFERED = _as_bool(os.getenv("AUDIT_BUFFERED", "1"))
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "100"))
+    AUDIT_FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", "1.0"))
+    AUDIT_MAX_BUFFER = int(os.getenv("AUDIT_MAX_BUFFER", "10000"))
+
+    # --- Rate limiting (token buckets; see app/ratelimit.py) ---
+    RATELIMIT_ENABLED = _as_bool(os.getenv("RATELIMIT_ENABLED", "1"))
+    RATELIMIT_BACKEND = os.getenv("RATELIMIT_BACKEND")  # mmap | memory | module:Class
+    RATELIMIT_STORAGE = os.getenv("RATELIMIT_STORAGE")  # default: instance/ratelimit.bin
+    RATELIMIT_SLOTS = int(os.getenv("RATELIMIT_SLOTS", "65536"))
+    # per-scope overrides, e.g. "support=5/10m,subscribe=10/1h"
+    RATELIMITS = dict(
+        item.split("=", 1) for item in os.getenv("RATELIMITS", "").split(",") if "=" in item
+    )
+
+    # --- Public page cache (anonymous GETs; see app/page_cache.py) ---
+    PAGE_CACHE_ENABLED = _as_bool(os.getenv("PAGE_CACHE_ENABLED", "1"))
+    PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", "300"))
+    PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "256"))
+    PAGE_CACHE_MAX_DISK_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_DISK_ENTRIES", "2000"))  # files in the shared disk tier
+    PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR")  # default: instance/page_cache
+
+    # --- Shared cache for site-wide values (see app/shared_cache.py) ---
+    SHARED_CACHE_BACKEND = os.getenv("SHARED_CACHE_BACKEND", "sqlite")  # sqlite | mmap | memory | module:Class
+    SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH")  # default: instance/shared_cache.sqlite
+
+    # --- Static assets ---
+    # Rebuild stale image variants at startup (unset = only in debug); see app/image_pipeline.py
+    IMAGE_AUTOBUILD = _as_bool(os.getenv("IMAGE_AUTOBUILD")) if os.getenv("IMAGE_AUTOBUILD") else None
+    # url_for('static') returns the hashed copy from `flask assets build` (see app/static_assets.py)
+    STATIC_FINGERPRINT = _as_bool(os.getenv("STATIC_FINGERPRINT", "1"))
+    ASSETS_MINIFY = _as_bool(os.getenv("ASSETS_MINIFY", "1"))  # default for `flask assets build`
+
+    # --- Templates (see app/template_cache.py, `flask templates warm`) ---
+    TEMPLATES_BYTECODE_CACHE = _as_bool(os.getenv("TEMPLATES_BYTECODE_CACHE", "1"))
+    TEMPLATES_CACHE_DIR = os.getenv("TEMPLATES_CACHE_DIR")  # default: instance/jinja_cache
+    TEMPLATES_PRELOAD = _as_bool(os.getenv("TEMPLATES_PRELOAD", "0"))  # compile all at startup (gunicorn --preload)
+
+    # --- Startup (see `flask bench startup`) ---
+    STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "0")) or None  # cold create_app() budget for CI
+
+    # --- Response compression (wsgi.py; see app/compression.py, `flask bench compression`) ---
+    COMPRESS_ENABLED = _as_bool(os.getenv("COMPRESS_ENABLED", "1"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))  # gzip 1-9
+    COMPRESS_BR_QUALITY = int(os.getenv("COMPRESS_BR_QUALITY", "4"))  # brotli 0-11, if installed
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # bytes; smaller bodies go out as-is
+    COMPRESS_FLUSH_BYTES = int(os.getenv("COMPRESS_FLUSH_BYTES", str(64 * 1024)))  # streamed bodies
+    COMPRESS_MIMETYPES = os.getenv("COMPRESS_MIMETYPES")  # comma-separated; default: text, JSON, JS, SVG
+
+    # --- Password hashing (pick with `flask security hash-bench`) ---
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD")  # default: werkzeug scrypt
+
+    # --- Login guard (failed-login lockouts; see services/login_guard.py) ---
+    LOGIN_GUARD_ENABLED = _as_bool(os.getenv("LOGIN_GUARD_ENABLED", "1"))
+    LOGIN_GUARD_BACKEND = os.getenv("LOGIN_GUARD_BACKEND")  # mmap | memory
+    LOGIN_GUARD_WINDOW = int(os.getenv("LOGIN_GUARD_WINDOW", "900"))
+    LOGIN_GUARD_IP_MAX = int(os.getenv("LOGIN_GUARD_IP_MAX", "20"))
+    LOGIN_GUARD_ACCOUNT_MAX = int(os.getenv("LOGIN_GUARD_ACCOUNT_MAX", "5"))
+    LOGIN_GUARD_LOCKOUT_BASE = int(os.getenv("LOGIN_GUARD_LOCKOUT_BASE", "30"))
+    LOGIN_GUARD_LOCKOUT_MAX = int(os.getenv("LOGIN_GUARD_LOCKOUT_MAX", "3600"))
+    LOGIN_KDF_WORKERS = int(os.getenv("LOGIN_KDF_WORKERS", "0"))  # 0 = verify inline
+    LOGIN_KDF_WAIT = float(os.getenv("LOGIN_KDF_WAIT", "2.0"))
+
     # --- Logging ---
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     LOG_DIR = os.getenv("LOG_DIR", "logs")
     LOG_FILENAME = os.getenv("LOG_FILENAME", "taskdesk.log")
     LOG_JSON = _as_bool(os.getenv("LOG_JSON", "0"))
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", "5000000"))  # rotate at this size (shared by all workers)
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # records buffered before the oldest are dropped
+    # Correlation IDs (see app/request_id.py). Trust an incoming X-Request-ID only behind a proxy that
+    # sets (overwrites) it; otherwise clients can choose IDs and add lines to another request's trace
+    REQUEST_ID_TRUST_HEADER = _as_bool(os.getenv("REQUEST_ID_TRUST_HEADER", "0"))
+    REQUEST_LOG = _as_bool(os.getenv("REQUEST_LOG", "1"))
+
+    # --- Request profiler (see app/profiler.py, /admin/profiles); nothing is hooked in unless enabled ---
+    PROFILER_ENABLED = _as_bool(os.getenv("PROFILER_ENABLED", "0"))
+    PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "0"))  # 0.01 = profile 1% of requests...
+    PROFILER_ENDPOINTS = os.getenv("PROFILER_ENDPOINTS", "")  # ...to these endpoints (comma-separated; empty = all)
+    PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+    PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+    PROFILER_TOKEN_TTL = int(os.getenv("PROFILER_TOKEN_TTL", "3600"))  # lifetime of an X-Profile header token
+    PROFILER_KEEP = int(os.getenv("PROFILER_KEEP", "200"))  # newest profiles kept in instance/profiles
+    PROFILER_DIR = os.getenv("PROFILER_DIR")
+
+    # --- Memory diagnostics (see app/memory_diag.py, /admin/memory) ---
+    MEMDIAG_FRAMES = int(os.getenv("MEMDIAG_FRAMES", "1"))  # tracemalloc traceback depth; more = slower, finer
+    MEMDIAG_AUTOSNAPSHOT_SECONDS = float(os.getenv("MEMDIAG_AUTOSNAPSHOT_SECONDS", "0"))  # >0 (min 30): each gunicorn worker traces and dumps snapshots
+    MEMDIAG_KEEP = int(os.getenv("MEMDIAG_KEEP", "24"))  # snapshots kept per process in instance/memsnaps
+    MEMDIAG_DIR = os.getenv("MEMDIAG_DIR")
 
     # --- Sentry ---
     SENTRY_DSN = os.getenv("SENTRY_DSN", "")
@@ -68,6 +181,7 @@ class Config:
     PESAPAL_IPN_ID = os.getenv("PESAPAL_IPN_ID")  # GUID returned when registering IPN
     PESAPAL_CALLBACK_URL = os.getenv("PESAPAL_CALLBACK_URL")  # e.g. "https://your-domain.com/payments/return"
     PESAPAL_CANCELLATION_URL = os.getenv("PESAPAL_CANCELLATION_URL")  # can reuse callback
+    PESAPAL_TOKEN_REFRESH = _as_bool(os.getenv("PESAPAL_TOKEN_REFRESH", "0"))  # per-worker background refresh
 
     # --- Security cookies (recommended for prod) ---
     SESSION_COOKIE_SECURE = _as_bool(os.getenv("SESSION_COOKIE_SECURE", "1"))
@@ -0,0 +1,164 @@
+# app/database.py
+"""
+Engine bootstrap for the SQLAlchemy extension.
+
+- SQLite (our small-region default): WAL + connection pragmas applied on every
+  new DBAPI connection through the engine ``connect`` event.
+- Server databases (Postgres/MySQL): pool policy (size, overflow, pre-ping,
+  recycle) driven from config.
+- Read-replica routing: SELECTs issued inside ``read_only()`` go to the
+  ``replica`` bind, unless the current user wrote recently (read-your-writes).
+  Raw ``text()`` counts as a write, except a plain SELECT inside
+  ``read_only()``.
+"""
+from __future__ import annotations
+
+import re
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, has_app_context, has_request_context, session as http_session
+from flask_sqlalchemy.session import Session as _BaseSession
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
+
+REPLICA_BIND = "replica"
+_LAST_WRITE_KEY = "_db_w"  # flask session key: epoch seconds of the user's last write
+_READ_SQL = re.compile(r"^\s*SELECT\b", re.IGNORECASE)  # not WITH/EXPLAIN: they can wrap or run DML
+
+
+def _is_memory_sqlite(url) -> bool:
+    db_name = url.database or ""
+    return db_name in ("", ":memory:") or "mode=memory" in str(url)
+
+
+def sqlite_pragmas(config) -> list[tuple[str, object]]:
+    """Ordered pragma list. busy_timeout goes first so the WAL switch can wait for a lock."""
+    pragmas = [
+        ("busy_timeout", int(config.get("SQLITE_BUSY_TIMEOUT_MS", 5000))),
+        ("journal_mode", config.get("SQLITE_JOURNAL_MODE", "WAL")),
+        ("synchronous", config.get("SQLITE_SYNCHRONOUS", "NORMAL")),
+        ("cache_size", int(config.get("SQLITE_CACHE_SIZE", -20000))),  # negative = KiB (~20 MB)
+        ("mmap_size", int(config.get("SQLITE_MMAP_SIZE", 128 * 1024 * 1024))),
+        ("temp_store", "MEMORY"),
+    ]
+    if config.get("SQLITE_FOREIGN_KEYS", True):
+        pragmas.append(("foreign_keys", "ON"))
+    return pragmas
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas, *, in_memory: bool = False) -> None:
+    """Run PRAGMA statements on a raw sqlite3 connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas:
+            # WAL and mmap are meaningless for :memory: databases
+            if in_memory and name in ("journal_mode", "mmap_size"):
+                continue
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def pool_options_for(uri: str, config) -> dict:
+    """Engine options for one database URL. SQLite keeps SQLAlchemy's defaults."""
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": int(config.get("DB_POOL_SIZE", 5)),
+        "max_overflow": int(config.get("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": int(config.get("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(config.get("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": bool(config.get("DB_POOL_PRE_PING", True)),
+    }
+
+
+def configure_engine_options(app) -> None:
+    """Fill SQLALCHEMY_ENGINE_OPTIONS / SQLALCHEMY_BINDS before db.init_app()."""
+    cfg = app.config
+    if "SQLALCHEMY_ENGINE_OPTIONS" not in cfg:
+        cfg["SQLALCHEMY_ENGINE_OPTIONS"] = pool_options_for(cfg["SQLALCHEMY_DATABASE_URI"], cfg)
+
+    binds = cfg.get("SQLALCHEMY_BINDS") or {}
+    cfg["SQLALCHEMY_BINDS"] = {
+        key: ({"url": val, **pool_options_for(val, cfg)} if isinstance(val, str) else val)
+        for key, val in binds.items()
+    }
+
+
+def install_engine_hooks(app, db) -> None:
+    """Attach the SQLite connect hook to every engine (default + binds). Call after db.init_app()."""
+    pragmas = sqlite_pragmas(app.config)
+    with app.app_context():
+        engines = list(db.engines.values())
+
+    for engine in engines:
+        if engine.dialect.name != "sqlite":
+            continue
+        in_memory = _is_memory_sqlite(engine.url)
+
+        def _on_connect(dbapi_connection, connection_record, _in_memory=in_memory):
+            apply_sqlite_pragmas(dbapi_connection, pragmas, in_memory=_in_memory)
+
+        event.listen(engine, "connect", _on_connect)
+
+
+# -----------------------------
+# Read-replica routing
+# -----------------------------
+
+@contextmanager
+def read_only():
+    """Route reads in this block (or decorated view) to the replica bind.
+
+    Usable as ``with read_only():`` or ``@read_only()``. Writes and flushes
+    always go to the primary. No-op when no replica is configured.
+    """
+    prev = g.get("_db_read_only", False)
+    g._db_read_only = True
+    try:
+        yield
+    finally:
+        g._db_read_only = prev
+
+
+def _recent_writer() -> bool:
+    if not has_request_context():
+        return False
+    last = http_session.get(_LAST_WRITE_KEY)
+    window = int(current_app.config.get("DB_REPLICA_STICKY_SECONDS", 10))
+    return bool(last) and (time.time() - last) < window
+
+
+class RoutingSession(_BaseSession):
+    """Flask-SQLAlchemy session that can send read-only work to a replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            read_only_block = has_app_context() and g.get("_db_read_only")
+            is_write = self._flushing or isinstance(clause, UpdateBase) or (
+                isinstance(clause, TextClause) and not (read_only_block and _READ_SQL.match(clause.text))
+            )
+            if is_write:
+                if has_request_context():
+                    g._db_wrote = True
+            elif read_only_block and not _recent_writer():
+                replica = self._db.engines.get(REPLICA_BIND)
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def install_replica_routing(app) -> None:
+    """Stamp the user's session after a write so their next reads stay on the primary."""
+    if REPLICA_BIND not in (app.config.get("SQLALCHEMY_BINDS") or {}):
+        return
+
+    @app.after_request
+    def _stamp_last_write(response):
+        if g.get("_db_wrote"):
+            http_session[_LAST_WRITE_KEY] = int(time.time())
+        return response
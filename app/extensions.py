@@ -1,13 +1,45 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+import click
 from flask_login import LoginManager
 from flask_wtf import CSRFProtect
 from flask_mail import Mail
 from flask_babel import Babel, gettext as _, lazy_gettext as _l
+from .database import RoutingSession
 
 
-db = SQLAlchemy()
-migrate = Migrate()
+class LazyMigrate:
+    """
+    Flask-Migrate, without importing it at startup.
+
+    Flask-Migrate imports Alembic (and through it Mako and Pygments), about a
+    sixth of ``create_app()``; only the ``flask db`` commands need it. This
+    registers a ``db`` group that sets up the real extension and hands over to
+    its group as soon as ``flask db ...`` is invoked.
+    """
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def init_app(self, app, db):
+        ext = self
+
+        class _DbGroup(click.Group):
+            def _real(self):
+                from flask_migrate import Migrate
+                from flask_migrate.cli import db as db_cli_group
+
+                if "migrate" not in app.extensions:
+                    Migrate(app, db, **ext.kwargs)
+                return db_cli_group
+
+            def make_context(self, info_name, args, parent=None, **extra):
+                return self._real().make_context(info_name, args, parent=parent, **extra)
+
+        app.cli.add_command(_DbGroup("db", help="Perform database migrations."))
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+migrate = LazyMigrate()
 login_manager = LoginManager()
 csrf = CSRFProtect()
 mail = Mail()
@@ -0,0 +1,233 @@
+# app/image_pipeline.py
+"""
+Responsive image variants for the static landing images.
+
+``flask assets images`` (run at build/deploy time) resizes every source under
+``static/img`` listed in ``IMAGE_SOURCES`` to the widths in ``WIDTHS`` and
+encodes each size as AVIF, WebP and optimised PNG into
+``static/img/variants``. ``manifest.json`` next to them records the source's
+content hash, so re-running only rebuilds images whose source changed, and
+removes variants that are no longer referenced. With ``IMAGE_AUTOBUILD`` on
+(default in debug) the same stale check runs at app start.
+
+Templates use the ``picture()`` global:
+
+    {{ picture('img/hero.png', 'Team at work', sizes='(min-width: 992px) 50vw, 100vw',
+               loading='eager', cls='w-100') }}
+
+which emits ``<picture>`` with AVIF/WebP ``srcset`` sources and a PNG
+``<img>`` fallback, lazy-loaded by default. Without a manifest entry it falls
+back to a plain ``<img>`` of the original file.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from flask import current_app, url_for
+from markupsafe import Markup, escape
+
+log = logging.getLogger(__name__)
+
+IMAGE_SOURCES = ("img/hero.png", "img/feature-*.png", "img/how-*.png")
+WIDTHS = (480, 768, 1024, 1536)
+VARIANT_DIR = "img/variants"
+FORMATS = {
+    # format: (extension, mime type, Pillow save options)
+    "avif": ("avif", "image/avif", {"quality": 50, "speed": 8}),
+    "webp": ("webp", "image/webp", {"quality": 78, "method": 6}),
+    "png": ("png", "image/png", {"optimize": True}),
+}
+
+
+def _static_root(app=None) -> Path:
+    return Path((app or current_app).static_folder)
+
+
+def _manifest_path(root: Path) -> Path:
+    return root / VARIANT_DIR / "manifest.json"
+
+
+def _sha1(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _sources(root: Path):
+    seen = set()
+    for pattern in IMAGE_SOURCES:
+        for path in sorted(root.glob(pattern)):
+            rel = path.relative_to(root).as_posix()
+            if rel not in seen:
+                seen.add(rel)
+                yield rel, path
+
+
+def _formats():
+    from PIL import features
+    return [f for f in FORMATS if f == "png" or features.check(f)]
+
+
+def _build_one(root: Path, rel: str, src: Path, digest: str, formats) -> dict:
+    from PIL import Image
+
+    out_dir = root / VARIANT_DIR
+    stem = Path(rel).stem
+    with Image.open(src) as im:
+        im.load()
+        width, height = im.size
+        widths = sorted({w for w in WIDTHS if w < width} | {width})
+        entry = {"hash": digest, "width": width, "height": height, "variants": {}}
+        for fmt in formats:
+            ext, _, options = FORMATS[fmt]
+            entry["variants"][fmt] = []
+            for w in widths:
+                h = round(height * w / width)
+                resized = im if w == width else im.resize((w, h), Image.LANCZOS)
+                name = f"{stem}-{digest[:8]}-{w}.{ext}"
+                resized.save(out_dir / name, **options)
+                entry["variants"][fmt].append({"w": w, "file": f"{VARIANT_DIR}/{name}"})
+    return entry
+
+
+def build_images(app=None, *, force: bool = False) -> dict:
+    """Bring variants in line with their sources; returns {"built": [...], "fresh": [...], "removed": n}."""
+    root = _static_root(app)
+    out_dir = root / VARIANT_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = _manifest_path(root)
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        manifest = {}
+
+    formats = _formats()
+    built, fresh, new_manifest, jobs = [], [], {}, {}
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:  # encoders release the GIL
+        for rel, src in _sources(root):
+            digest = _sha1(src)
+            old = manifest.get(rel)
+            if not force and old and old["hash"] == digest and set(old["variants"]) == set(formats) and all(
+                (root / v["file"]).exists() for vs in old["variants"].values() for v in vs
+            ):
+                new_manifest[rel] = old
+                fresh.append(rel)
+                continue
+            jobs[rel] = pool.submit(_build_one, root, rel, src, digest, formats)
+        for rel, job in jobs.items():
+            new_manifest[rel] = job.result()
+            built.append(rel)
+
+    keep = {v["file"] for e in new_manifest.values() for vs in e["variants"].values() for v in vs}
+    removed = 0
+    for path in out_dir.iterdir():
+        if path.name != manifest_path.name and f"{VARIANT_DIR}/{path.name}" not in keep:
+            path.unlink()
+            removed += 1
+
+    tmp = manifest_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(new_manifest, indent=2, sort_keys=True))
+    tmp.replace(manifest_path)
+    return {"built": built, "fresh": fresh, "removed": removed}
+
+
+def stale_images(app=None) -> list[str]:
+    """Sources whose variants are missing or older than the source (mtime check only)."""
+    root = _static_root(app)
+    manifest_path = _manifest_path(root)
+    if not manifest_path.exists():
+        return [rel for rel, _ in _sources(root)]
+    built_at = manifest_path.stat().st_mtime
+    manifest = json.loads(manifest_path.read_text())
+    return [rel for rel, src in _sources(root) if rel not in manifest or src.stat().st_mtime > built_at]
+
+
+# -----------------------------
+# Template helper
+# -----------------------------
+
+_cache = {"mtime": None, "data": {}}
+_cache_lock = threading.Lock()
+
+
+def _manifest() -> dict:
+    path = _manifest_path(_static_root())
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return {}
+    with _cache_lock:
+        if _cache["mtime"] != mtime:
+            try:
+                _cache["data"] = json.loads(path.read_text())
+            except ValueError:
+                _cache["data"] = {}
+            _cache["mtime"] = mtime
+        return _cache["data"]
+
+
+def _srcset(variants) -> str:
+    return ", ".join(f"{url_for('static', filename=v['file'])} {v['w']}w" for v in variants)
+
+
+def picture(src: str, alt: str = "", *, sizes: str = "100vw", loading: str = "lazy",
+            cls: str | None = None, width: int | None = None, height: int | None = None,
+            fetchpriority: str | None = None) -> Markup:
+    entry = _manifest().get(src)
+    attrs = {
+        "alt": alt, "class": cls, "loading": loading, "decoding": "async",
+        "fetchpriority": fetchpriority,
+        "width": width or (entry and entry["width"]), "height": height or (entry and entry["height"]),
+    }
+    if not entry:
+        attrs["src"] = url_for("static", filename=src)
+        return Markup(f"<img {_attrs(attrs)}>")
+
+    variants = entry["variants"]
+    fallback = variants.get("png") or []
+    sources = "".join(
+        f'<source type="{FORMATS[fmt][1]}" srcset="{escape(_srcset(variants[fmt]))}" sizes="{escape(sizes)}">'
+        for fmt in ("avif", "webp") if variants.get(fmt)
+    )
+    attrs["src"] = url_for("static", filename=fallback[-1]["file"] if fallback else src)
+    if fallback:
+        attrs["srcset"] = _srcset(fallback)
+        attrs["sizes"] = sizes
+    # display:contents keeps the <img> laying out exactly as it did without the wrapper
+    return Markup(f'<picture style="display: contents">{sources}<img {_attrs(attrs)}></picture>')
+
+
+def _attrs(attrs: dict) -> str:
+    return " ".join(f'{k}="{escape(v)}"' for k, v in attrs.items() if v not in (None, ""))
+
+
+def init_app(app) -> None:
+    app.add_template_global(picture)
+    autobuild = app.config.get("IMAGE_AUTOBUILD")
+    if autobuild is None:
+        autobuild = app.debug
+    if autobuild and os.environ.get("WERKZEUG_RUN_MAIN") != "true":  # once, not again in the reloader child
+        try:
+            stale = stale_images(app)
+        except Exception:
+            log.warning("image variant check failed", exc_info=True)
+            return
+        if stale:
+            # originals are served until the manifest is replaced
+            log.info("rebuilding image variants for %s", ", ".join(stale))
+            threading.Thread(target=_autobuild, args=(app,), name="image-variants", daemon=True).start()
+
+
+def _autobuild(app) -> None:
+    try:
+        build_images(app)
+    except Exception:
+        log.warning("image variant build failed; serving originals", exc_info=True)
@@ -0,0 +1,230 @@
+# app/logging_queue.py
+"""
+Non-blocking application logging.
+
+``app.logger`` (and every ``app.*`` module logger, which propagate to it) has
+a single handler, a ``QueueHandler``. Logging on a request thread only merges
+the message arguments, stamps the request's correlation ID (app/request_id.py)
+and appends the record to a bounded in-memory queue. A ``QueueListener``
+thread does the formatting (JSON or text) and the file/stream I/O.
+
+The queue never blocks the caller. When it is full (disk stalled, log storm)
+the oldest record is dropped, and the listener reports how many were lost
+once it catches up.
+
+Every gunicorn worker writes to the same file. ``SharedRotatingFileHandler``
+rotates under an fcntl lock next to the log, and a worker whose file was
+rotated away by another reopens the new one instead of writing on into the
+renamed backup.
+
+The listener thread is per process: a forked worker starts its own (with a
+fresh queue) on its first log call.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from flask import g, has_app_context
+from flask.logging import default_handler
+
+from .ratelimit import fcntl
+
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s in %(module)s [%(request_id)s]: %(message)s"
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request's correlation ID ("-" outside one)."""
+
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = (g.get("request_id") if has_app_context() else None) or "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        doc = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "pid": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            doc["exc"] = "".join(traceback.format_exception(*record.exc_info))
+        elif record.exc_text:
+            doc["exc"] = record.exc_text
+        return json.dumps(doc, default=str)
+
+
+class DropOldestQueue(queue.Queue):
+    """Bounded queue whose ``put`` never blocks: when full, the oldest item makes room."""
+
+    def __init__(self, maxsize):
+        super().__init__(maxsize)
+        self.dropped = 0
+
+    def put(self, item, block=True, timeout=None):
+        with self.not_full:
+            if 0 < self.maxsize <= self._qsize():
+                self._get()
+                self.dropped += 1
+            else:
+                self.unfinished_tasks += 1
+            self._put(item)
+            self.not_empty.notify()
+
+
+class _Listener(QueueListener):
+    def handle(self, record):
+        dropped = self.queue.dropped
+        if dropped != getattr(self, "_reported", 0):
+            self._reported = dropped
+            note = logging.LogRecord("app.logging", logging.WARNING, __file__, 0,
+                                     "log queue full: %s records dropped so far", (dropped,), None)
+            note.request_id = "-"
+            super().handle(note)
+        super().handle(record)
+
+
+class AsyncQueueHandler(QueueHandler):
+    def __init__(self, handlers, maxsize):
+        self.targets, self.maxsize = handlers, maxsize
+        self._pid, self._listener = None, None
+        self._start_lock = threading.Lock()
+        super().__init__(DropOldestQueue(maxsize))
+        self.addFilter(RequestIdFilter())
+        self._start()
+
+    def _start(self):
+        if self._pid is not None:  # forked: the old queue's locks may be held by a thread that no longer exists
+            self.queue = DropOldestQueue(self.maxsize)
+        self._listener = _Listener(self.queue, *self.targets, respect_handler_level=True)
+        self._listener.start()
+        self._pid = os.getpid()
+
+    def prepare(self, record):
+        # Cheap, on the caller's thread: freeze the message text; formatting happens on the listener
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg, record.args = record.getMessage(), None
+        return record
+
+    def enqueue(self, record):
+        if self._pid != os.getpid():
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self._start()
+        self.queue.put_nowait(record)
+
+    def stop(self):
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()  # drains what is queued
+        self._listener = None
+        for h in self.targets:
+            h.close()
+
+
+class SharedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that several processes can share (POSIX; plain rotation elsewhere)."""
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+        self._lock_path = self.baseFilename + ".lock"
+        self._lock_fd, self._lock_pid = None, None
+
+    def _lockf(self, op):
+        if fcntl is None:
+            return
+        if self._lock_pid != os.getpid():
+            self._lock_fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._lock_pid = os.getpid()
+        fcntl.lockf(self._lock_fd, op)
+
+    def _reopen_if_rotated(self):
+        try:
+            disk = os.stat(self.baseFilename)
+            mine = os.fstat(self.stream.fileno())
+            if (disk.st_dev, disk.st_ino) == (mine.st_dev, mine.st_ino):
+                return
+        except FileNotFoundError:
+            pass
+        self.stream.close()
+        self.stream = self._open()
+
+    def emit(self, record):
+        try:
+            self._lockf(fcntl.LOCK_EX if fcntl else None)
+            try:
+                if self.stream is None:
+                    self.stream = self._open()
+                else:
+                    self._reopen_if_rotated()
+                if self.shouldRollover(record):
+                    self.doRollover()
+                logging.FileHandler.emit(self, record)
+            finally:
+                self._lockf(fcntl.LOCK_UN if fcntl else None)
+        except Exception:
+            self.handleError(record)
+
+
+_installed: list[AsyncQueueHandler] = []
+
+
+def _shutdown():
+    for handler in _installed:
+        handler.stop()
+    _installed.clear()
+
+
+atexit.register(_shutdown)
+
+
+def init_app(app) -> None:
+    level = getattr(logging, str(app.config.get("LOG_LEVEL", "INFO")).upper(), logging.INFO)
+    formatter = JsonFormatter() if app.config.get("LOG_JSON", False) else logging.Formatter(TEXT_FORMAT)
+
+    log_dir = app.config.get("LOG_DIR", "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    file_handler = SharedRotatingFileHandler(
+        os.path.join(log_dir, app.config.get("LOG_FILENAME", "taskdesk.log")),
+        maxBytes=int(app.config.get("LOG_MAX_BYTES", 5_000_000)),
+        backupCount=int(app.config.get("LOG_BACKUP_COUNT", 5)),
+        encoding="utf-8",
+    )
+    # Stream to stderr as well (useful on dev/heroku/docker)
+    stream_handler = logging.StreamHandler()
+    for h in (file_handler, stream_handler):
+        h.setLevel(level)
+        h.setFormatter(formatter)
+
+    logger = app.logger
+    logger.setLevel(level)
+    logger.removeHandler(default_handler)  # ours replaces Flask's stderr handler
+    for old in [h for h in logger.handlers if isinstance(h, AsyncQueueHandler)]:  # create_app() called again
+        logger.removeHandler(old)
+        old.stop()
+        if old in _installed:
+            _installed.remove(old)
+    handler = AsyncQueueHandler([file_handler, stream_handler], int(app.config.get("LOG_QUEUE_SIZE", 10000)))
+    logger.addHandler(handler)
+    _installed.append(handler)
+
+
+def flush(timeout: float = 5.0) -> None:
+    """Wait until the records queued so far in this process have been written."""
+    deadline = time.monotonic() + timeout
+    for handler in _installed:
+        while handler.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
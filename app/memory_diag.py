@@ -0,0 +1,235 @@
+# app/memory_diag.py
+"""
+Memory diagnostics for a running worker (``/admin/memory``).
+
+For RSS that creeps up over days, without attaching a debugger:
+
+* ``tracemalloc`` can be started and stopped at runtime. Snapshots are dumped
+  to ``instance/memsnaps`` and any two can be diffed by file or by line
+  (``diff_snapshots``), which shows which lines allocated memory that is still
+  held.
+* ``object_counts()`` counts live objects by type, with the change since the
+  last call in this process.
+* ``session_stats()`` lists every live SQLAlchemy session with the size of its
+  identity map, broken down by model. A session that outlives its request or
+  job shows up here.
+* With ``MEMDIAG_AUTOSNAPSHOT_SECONDS`` set, or when started from the admin
+  page, a background thread takes a snapshot every N seconds (at least
+  ``MIN_AUTOSNAPSHOT_SECONDS``) and keeps the newest ``MEMDIAG_KEEP`` per
+  process. Diff the first against the last to see the growth. Snapshots of
+  processes that have exited (recycled gunicorn workers) are deleted on the
+  next dump.
+
+Everything here is per process. Under gunicorn each admin request lands on
+one worker, which the page names by pid. Snapshot files carry the pid, and
+only snapshots from the same pid are worth diffing. ``tracemalloc`` slows
+allocation (roughly 1.3-2x, more with ``MEMDIAG_FRAMES`` > 1), so leave it
+off except while hunting.
+"""
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import re
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+MIN_AUTOSNAPSHOT_SECONDS = 30.0  # each dump walks every traced allocation
+_NAME = re.compile(r"^[\w.-]+$")
+_IGNORE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+# --- tracemalloc ---
+
+def snapshot_dir(app) -> str:
+    return app.config.get("MEMDIAG_DIR") or os.path.join(app.instance_path, "memsnaps")
+
+
+def start_tracing(app) -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(int(app.config.get("MEMDIAG_FRAMES", 1)))
+        log.info("tracemalloc started (%s frames)", tracemalloc.get_traceback_limit())
+
+
+def stop_tracing() -> None:
+    """Stop tracing and free its bookkeeping; snapshots already on disk are kept."""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+        log.info("tracemalloc stopped")
+
+
+def tracing_status() -> dict:
+    if not tracemalloc.is_tracing():
+        return {"tracing": False}
+    current, peak = tracemalloc.get_traced_memory()
+    return {"tracing": True, "frames": tracemalloc.get_traceback_limit(), "current": current, "peak": peak,
+            "overhead": tracemalloc.get_tracemalloc_memory()}
+
+
+def take_snapshot(app, label: str = "manual") -> str:
+    """Dump a snapshot of this process's traced allocations; returns its name."""
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not running")
+    snap = tracemalloc.take_snapshot().filter_traces(_IGNORE)
+    directory = snapshot_dir(app)
+    os.makedirs(directory, exist_ok=True)
+    label = re.sub(r"[^\w]", "_", label)
+    name = f"{datetime.utcnow():%Y%m%d-%H%M%S-%f}-{os.getpid()}-{label}"
+    snap.dump(os.path.join(directory, name + ".snap"))
+    _prune(directory, os.getpid(), int(app.config.get("MEMDIAG_KEEP", 24)))
+    return name
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # exists, owned by someone else
+        return True
+    return True
+
+
+def _prune(directory: str, pid: int, keep: int) -> None:
+    """Keep this process's newest ``keep`` snapshots; drop those of processes that have exited."""
+    by_pid: dict[str, list[str]] = {}
+    for f in os.listdir(directory):
+        parts = f.split("-")
+        if f.endswith(".snap") and len(parts) > 4:
+            by_pid.setdefault(parts[3], []).append(f)
+    stale = sorted(by_pid.pop(str(pid), []))[:-keep] if keep > 0 else []
+    for other, files in by_pid.items():
+        if not other.isdigit() or not _pid_alive(int(other)):
+            stale.extend(files)
+    for f in stale:
+        try:
+            os.remove(os.path.join(directory, f))
+        except FileNotFoundError:  # another worker pruned it first
+            pass
+
+
+def list_snapshots(app) -> list[dict]:
+    """Snapshots on disk (all processes), newest first."""
+    directory = snapshot_dir(app)
+    if not os.path.isdir(directory):
+        return []
+    out = []
+    for f in sorted((f for f in os.listdir(directory) if f.endswith(".snap")), reverse=True):
+        parts = f[:-len(".snap")].split("-", 4)
+        if len(parts) < 5:
+            continue
+        out.append({
+            "name": f[:-len(".snap")],
+            "at": datetime.strptime("-".join(parts[:3]), "%Y%m%d-%H%M%S-%f"),
+            "pid": int(parts[3]) if parts[3].isdigit() else None,
+            "label": parts[4],
+            "size": os.path.getsize(os.path.join(directory, f)),
+        })
+    return out
+
+
+def _load(app, name: str) -> tracemalloc.Snapshot:
+    if not _NAME.match(name or ""):
+        raise FileNotFoundError(name)
+    return tracemalloc.Snapshot.load(os.path.join(snapshot_dir(app), name + ".snap"))
+
+
+def top_allocations(app, name: str, group_by: str = "lineno", limit: int = 30) -> list[dict]:
+    stats = _load(app, name).statistics(group_by)
+    return [{"where": _where(s.traceback), "size": s.size, "count": s.count} for s in stats[:limit]]
+
+
+def diff_snapshots(app, old: str, new: str, group_by: str = "lineno", limit: int = 50) -> list[dict]:
+    """Largest differences from ``old`` to ``new``, grouped by "filename" or "lineno"."""
+    stats = _load(app, new).compare_to(_load(app, old), group_by)
+    return [{"where": _where(s.traceback), "size": s.size, "size_diff": s.size_diff,
+             "count": s.count, "count_diff": s.count_diff} for s in stats[:limit]]
+
+
+def _where(tb) -> str:
+    frame = tb[0]
+    return f"{frame.filename}:{frame.lineno}" if frame.lineno else frame.filename
+
+
+# --- live objects ---
+
+_last_counts: Counter = Counter()
+
+
+def object_counts(limit: int = 40) -> list[tuple[str, int, int]]:
+    """``(type, live objects, change since the previous call in this process)``, most numerous first."""
+    global _last_counts
+    gc.collect()
+    counts = Counter(f"{type(o).__module__}.{type(o).__qualname__}" for o in gc.get_objects())
+    previous, _last_counts = _last_counts, counts
+    return [(t, n, n - previous[t] if previous else 0) for t, n in counts.most_common(limit)]
+
+
+def session_stats() -> list[dict]:
+    """Live SQLAlchemy sessions in this process with their identity-map sizes per model."""
+    from sqlalchemy.orm.session import _sessions  # weak registry of every open Session
+
+    out = []
+    for session in list(_sessions.values()):
+        by_model = Counter(type(obj).__name__ for obj in list(session.identity_map.values()))
+        out.append({"id": id(session), "size": len(session.identity_map), "new": len(session.new),
+                    "dirty": len(session.dirty), "by_model": by_model.most_common(10)})
+    return sorted(out, key=lambda s: s["size"], reverse=True)
+
+
+# --- periodic snapshots ---
+
+_auto: dict = {"thread": None, "pid": None, "stop": None, "interval": None}
+_auto_lock = threading.Lock()
+
+
+def autosnapshot_running() -> float | None:
+    """This process's auto-snapshot interval in seconds, or None when it isn't running."""
+    t = _auto["thread"]
+    return _auto["interval"] if t is not None and _auto["pid"] == os.getpid() and t.is_alive() else None
+
+
+def start_autosnapshot(app, interval: float | None = None) -> bool:
+    """Trace allocations and dump a snapshot every ``interval`` seconds in this process."""
+    interval = float(interval or app.config.get("MEMDIAG_AUTOSNAPSHOT_SECONDS") or 0)
+    if interval <= 0:
+        return False
+    if interval < MIN_AUTOSNAPSHOT_SECONDS:
+        log.warning("memory auto-snapshot interval %g s raised to %g s", interval, MIN_AUTOSNAPSHOT_SECONDS)
+        interval = MIN_AUTOSNAPSHOT_SECONDS
+    with _auto_lock:
+        if autosnapshot_running():
+            return True
+        start_tracing(app)
+        stop = threading.Event()
+
+        def _loop():
+            while not stop.wait(interval):
+                try:
+                    take_snapshot(app, "auto")
+                except Exception as e:  # tracing stopped from the admin page, disk full, ...
+                    log.warning("auto memory snapshot failed: %s", e)
+
+        t = threading.Thread(target=_loop, name="memdiag-snapshot", daemon=True)
+        _auto.update(thread=t, pid=os.getpid(), stop=stop, interval=interval)
+        t.start()
+        take_snapshot(app, "auto")  # the baseline to diff against
+    log.info("memory auto-snapshots every %.0f s in pid %s", interval, os.getpid())
+    return True
+
+
+def stop_autosnapshot() -> None:
+    with _auto_lock:
+        if autosnapshot_running():
+            _auto["stop"].set()
+        _auto.update(thread=None, pid=None, stop=None, interval=None)
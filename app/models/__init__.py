@@ -6,3 +6,5 @@ from .work import WorkSubmission
 from .meeting import Meeting
 from .invoice import Invoice
 from .payout import Payout
+from .task_history import TaskStatusEvent, TaskStatusRollup, RollupCursor
+from .audit import AdminAudit
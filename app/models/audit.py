@@ -0,0 +1,27 @@
+# app/models/audit.py
+from datetime import datetime
+from ..extensions import db
+
+
+class AdminAudit(db.Model):
+    """One row per (admin action, target). Rows from one action share group_id."""
+    __tablename__ = "admin_audit"
+
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    actor_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
+    action = db.Column(db.String(64), nullable=False)
+    target_type = db.Column(db.String(32), nullable=False, default="user")
+    target_id = db.Column(db.Integer, nullable=True)
+    group_id = db.Column(db.String(32), nullable=True)
+    ip = db.Column(db.String(45), nullable=True)
+    meta = db.Column(db.JSON, nullable=True)
+
+    actor = db.relationship("User", foreign_keys=[actor_id])
+
+    __table_args__ = (
+        db.Index("ix_admin_audit_created_at", "created_at"),
+        db.Index("ix_admin_audit_actor_created", "actor_id", "created_at"),
+        db.Index("ix_admin_audit_action_created", "action", "created_at"),
+        db.Index("ix_admin_audit_target", "target_type", "target_id", "created_at"),
+    )
@@ -8,6 +8,8 @@ class Rating(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     # ⬇️ fix FK target
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    # Freelancer being rated (NULL = feedback about the site itself)
+    freelancer_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True, index=True)
 
     name = db.Column(db.String(120), nullable=True)
     email = db.Column(db.String(255), nullable=True)
@@ -20,9 +22,43 @@ class Rating(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     # (optional)
-    user = db.relationship("User", lazy="joined")
+    user = db.relationship("User", lazy="joined", foreign_keys=[user_id])
 
     __table_args__ = (
         db.Index("ix_ratings_created_at", "created_at"),
         db.Index("ix_ratings_is_deleted_public", "is_deleted", "is_public"),
     )
+
+
+class RatingAggregate(db.Model):
+    """Running count / sum / 1-5 histogram of visible ratings (public, not deleted).
+
+    One row per (scope, scope_key): ("site", ""), ("freelancer", "<user id>")
+    and ("day", "YYYY-MM-DD"). Kept in step with ``ratings`` by
+    services/rating_aggregates.py inside the same transaction.
+    """
+    __tablename__ = "rating_aggregate"
+
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(16), nullable=False)
+    scope_key = db.Column(db.String(32), nullable=False, default="")
+    count = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    stars_1 = db.Column(db.Integer, nullable=False, default=0)
+    stars_2 = db.Column(db.Integer, nullable=False, default=0)
+    stars_3 = db.Column(db.Integer, nullable=False, default=0)
+    stars_4 = db.Column(db.Integer, nullable=False, default=0)
+    stars_5 = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("scope", "scope_key", name="uq_rating_aggregate_scope"),
+    )
+
+    @property
+    def average(self) -> float:
+        return round(self.total / self.count, 2) if self.count else 0.0
+
+    @property
+    def histogram(self) -> list[int]:
+        return [self.stars_1, self.stars_2, self.stars_3, self.stars_4, self.stars_5]
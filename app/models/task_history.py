@@ -0,0 +1,54 @@
+# app/models/task_history.py
+from datetime import datetime
+from ..extensions import db
+
+
+class TaskStatusEvent(db.Model):
+    """Append-only log of task status transitions (one row per change)."""
+    __tablename__ = "task_status_event"
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, db.ForeignKey("task_request.id", ondelete="CASCADE"), nullable=False)
+    from_status = db.Column(db.String(30), nullable=True)   # None for the initial status
+    to_status = db.Column(db.String(30), nullable=False)
+    # snapshot at transition time so rollups never join back to task_request
+    category = db.Column(db.String(50), nullable=True)
+    priority = db.Column(db.String(20), nullable=True)
+    dwell_seconds = db.Column(db.Float, nullable=True)      # time spent in from_status
+    actor_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_task_status_event_task_created", "task_id", "created_at"),
+        db.Index("ix_task_status_event_created_at", "created_at"),
+    )
+
+
+class TaskStatusRollup(db.Model):
+    """Daily time-in-status percentiles per (status, category, priority)."""
+    __tablename__ = "task_status_rollup"
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(30), nullable=False)
+    category = db.Column(db.String(50), nullable=False, default="")
+    priority = db.Column(db.String(20), nullable=False, default="")
+    samples = db.Column(db.Integer, nullable=False, default=0)
+    p50_seconds = db.Column(db.Float)
+    p90_seconds = db.Column(db.Float)
+    p95_seconds = db.Column(db.Float)
+    max_seconds = db.Column(db.Float)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("day", "status", "category", "priority", name="uq_task_status_rollup_key"),
+    )
+
+
+class RollupCursor(db.Model):
+    """High-water mark for incremental rollup jobs (last source row processed)."""
+    __tablename__ = "rollup_cursor"
+
+    name = db.Column(db.String(64), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
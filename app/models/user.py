@@ -1,8 +1,9 @@
 # app/models/user.py
 from datetime import datetime, date
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 from flask_login import UserMixin
 from ..extensions import db
+from ..services.password_hashing import hash_password, needs_rehash
 
 
 # ------- Core Models -------
@@ -88,11 +89,15 @@ class User(UserMixin, db.Model):
 
     # --- Auth helpers ---
     def set_password(self, password: str):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
         return check_password_hash(self.password_hash, password)
 
+    def password_needs_rehash(self) -> bool:
+        """Stored hash predates the current PASSWORD_HASH_METHOD."""
+        return needs_rehash(self.password_hash)
+
     # --- Convenience flags ---
     @property
     def is_active_account(self) -> bool:
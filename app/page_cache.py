@@ -0,0 +1,297 @@
+# app/page_cache.py
+"""
+Full-page cache for the public marketing pages.
+
+    @main_bp.route("/about")
+    @cache_page()
+    def about(): ...
+
+Anonymous GET/HEAD responses are stored under (path + the query args the view
+declares, locale, cookie consent state) in a per-process LRU, backed by files
+under ``instance/page_cache`` so that other workers (and this one, after a
+restart) can reuse a render. Requests with any other query arg are not cached,
+so ``/?x=<random>`` can't mint entries, and the disk tier is swept down to
+``PAGE_CACHE_MAX_DISK_ENTRIES`` (expired entries first, then the oldest). A hit skips the view, its queries and the context
+processors entirely.
+
+The cache is bypassed whenever the request carries anything user-specific:
+a login (session user or remember cookie), flashed messages, or any other
+session key besides the CSRF token and language. Pages embed a CSRF token,
+so it is cut out of the stored body and the current visitor's token is
+spliced back in on every hit; for the same reason responses are
+``Cache-Control: private`` and revalidated by ETag (304 when unchanged).
+
+Entries expire after ``PAGE_CACHE_TTL`` seconds and are dropped early when a
+committed transaction touches a model in ``INVALIDATE_ON`` (job postings,
+ratings): that bumps a generation counter shared by all workers, and entries
+from an older generation count as misses.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+from urllib.parse import urlencode
+
+from flask import current_app, g, has_app_context, make_response, request, session
+from flask_babel import get_locale
+from flask_wtf.csrf import generate_csrf
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .models.careers import JobPosting
+from .models.feedback import Rating
+from .ratelimit import open_table
+
+log = logging.getLogger(__name__)
+
+CSRF_PLACEHOLDER = b"__PAGE_CACHE_CSRF__"
+SWEEP_EVERY = 64  # disk writes per process between sweeps of the disk tier
+
+# Session keys that don't make a page user-specific
+_NEUTRAL_SESSION_KEYS = {"csrf_token", "lang", "_permanent", "_fresh"}
+
+
+class _Entry:
+    __slots__ = ("body", "etag", "created", "generation", "mimetype")
+
+    def __init__(self, body, etag, created, generation, mimetype):
+        self.body, self.etag, self.created = body, etag, created
+        self.generation, self.mimetype = generation, mimetype
+
+
+class PageCache:
+    def __init__(self, app):
+        self.ttl = float(app.config.get("PAGE_CACHE_TTL", 300))
+        self.max_entries = int(app.config.get("PAGE_CACHE_MAX_ENTRIES", 256))
+        self.max_disk_entries = int(app.config.get("PAGE_CACHE_MAX_DISK_ENTRIES", 2000))
+        self._writes = 0
+        self.dir = Path(app.config.get("PAGE_CACHE_DIR") or Path(app.instance_path) / "page_cache")
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.generations = open_table(app, "page_cache_generation", "Qd", slots=16)
+        self._lru: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- generation (shared across workers) ---
+
+    def generation(self) -> int:
+        return self.generations.update(b"pagegen!", lambda v: ((v or (0, 0.0)), (v or (0,))[0]))
+
+    def bump(self) -> int:
+        now = time.time()
+        return self.generations.update(
+            b"pagegen!", lambda v: (((v[0] if v else 0) + 1, now), (v[0] if v else 0) + 1))
+
+    # --- tiers ---
+
+    def _path(self, key: str) -> Path:
+        return self.dir / (hashlib.sha256(key.encode()).hexdigest() + ".page")
+
+    def _fresh(self, entry: _Entry | None, generation: int) -> bool:
+        return entry is not None and entry.generation == generation and time.time() - entry.created < self.ttl
+
+    def get(self, key: str) -> _Entry | None:
+        generation = self.generation()
+        with self._lock:
+            entry = self._lru.get(key)
+            if self._fresh(entry, generation):
+                self._lru.move_to_end(key)
+                return entry
+        entry = self._read_disk(key)
+        if not self._fresh(entry, generation):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, entry: _Entry) -> None:
+        self._remember(key, entry)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        header = json.dumps({"etag": entry.etag, "created": entry.created,
+                             "generation": entry.generation, "mimetype": entry.mimetype}).encode()
+        try:
+            tmp.write_bytes(header + b"\n" + entry.body)
+            tmp.replace(path)
+        except OSError:
+            log.warning("page cache: could not write %s", path, exc_info=True)
+        with self._lock:
+            self._writes += 1
+            sweep = self._writes % SWEEP_EVERY == 1
+        if sweep:
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Delete expired disk entries, then the oldest beyond ``max_disk_entries``; returns how many."""
+        entries = []
+        for path in self.dir.glob("*.page"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:  # another worker swept it
+                continue
+        entries.sort()
+        cutoff = time.time() - self.ttl
+        expired = sum(1 for mtime, _ in entries if mtime < cutoff)
+        doomed = entries[:max(expired, len(entries) - self.max_disk_entries)]
+        for _, path in doomed:
+            path.unlink(missing_ok=True)
+        return len(doomed)
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _read_disk(self, key: str) -> _Entry | None:
+        try:
+            header, body = self._path(key).read_bytes().split(b"\n", 1)
+            meta = json.loads(header)
+        except (OSError, ValueError):
+            return None
+        return _Entry(body, meta["etag"], meta["created"], meta["generation"], meta["mimetype"])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+        for path in self.dir.glob("*.page"):
+            path.unlink(missing_ok=True)
+        self.bump()
+
+
+def get_cache(app=None) -> PageCache:
+    app = app or current_app._get_current_object()
+    cache = app.extensions.get("page_cache")
+    if cache is None:
+        cache = app.extensions["page_cache"] = PageCache(app)
+    return cache
+
+
+def invalidate(app=None) -> None:
+    """Drop every cached page on every worker (cheap: bumps the shared generation)."""
+    app = app or current_app._get_current_object()
+    if app.config.get("PAGE_CACHE_ENABLED", True):
+        get_cache(app).bump()
+
+
+# -----------------------------
+# Request side
+# -----------------------------
+
+def _user_specific() -> bool:
+    if set(session.keys()) - _NEUTRAL_SESSION_KEYS:  # login, flashes, carts, ...
+        return True
+    return bool(request.cookies.get(current_app.config.get("REMEMBER_COOKIE_NAME", "remember_token")))
+
+
+def _cache_key(args: tuple[str, ...]) -> str:
+    consent = getattr(g, "cookie_consent", {}) or {}
+    consent_state = "%s%s%s" % (
+        int("td.consent" in request.cookies), int(bool(consent.get("analytics"))), int(bool(consent.get("marketing"))),
+    )
+    query = urlencode(sorted((k, v) for k in args for v in request.args.getlist(k) if v))
+    return f"{request.path}?{query}|{get_locale() or 'en'}|{consent_state}"
+
+
+def _csrf_etag(etag: str) -> str:
+    # The visitor's copy embeds a CSRF token: it is only reusable while the
+    # session's raw token is unchanged and a token issued now is still valid.
+    raw = str(session.get("csrf_token", ""))
+    limit = current_app.config.get("WTF_CSRF_TIME_LIMIT", 3600)
+    bucket = int(time.time() // max(1, limit // 2)) if limit else 0
+    return hashlib.sha256(f"{etag}|{raw}|{bucket}".encode()).hexdigest()[:32]
+
+
+def _respond(entry: _Entry, status: str):
+    token = generate_csrf().encode()
+    etag = _csrf_etag(entry.etag)
+    # Weak comparison (RFC 9110 13.1.2): CompressionMiddleware sends our ETag back as W/"..."
+    if request.if_none_match.contains_weak(etag):
+        resp = make_response("", 304)
+    else:
+        resp = make_response(entry.body.replace(CSRF_PLACEHOLDER, token))
+        resp.mimetype = entry.mimetype
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "private, no-cache"
+    resp.vary.update(("Cookie", "Accept-Language"))
+    resp.headers["X-Page-Cache"] = status
+    return resp
+
+
+def cache_page(args: tuple[str, ...] = ()):
+    """Serve a view from the page cache for anonymous visitors.
+
+    ``args`` names the query args the view reads; they become part of the key.
+    A request carrying any other arg is rendered uncached.
+    """
+    allowed = frozenset(args)
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*a, **kwargs):
+            if (not current_app.config.get("PAGE_CACHE_ENABLED", True)
+                    or request.method not in ("GET", "HEAD") or _user_specific()
+                    or not allowed.issuperset(request.args.keys())):
+                return fn(*a, **kwargs)
+
+            cache = get_cache()
+            key = _cache_key(tuple(sorted(allowed)))
+            entry = cache.get(key)
+            if entry is not None:
+                return _respond(entry, "HIT")
+
+            generation = cache.generation()
+            resp = make_response(fn(*a, **kwargs))
+            # Only plain, successful, still-anonymous renders are shareable
+            if resp.status_code != 200 or resp.direct_passthrough or _user_specific():
+                return resp
+            body = resp.get_data()
+            token = g.get("csrf_token")
+            if token:
+                body = body.replace(token.encode(), CSRF_PLACEHOLDER)
+            entry = _Entry(body, hashlib.sha256(body).hexdigest()[:32], time.time(), generation, resp.mimetype)
+            cache.put(key, entry)
+            return _respond(entry, "MISS")
+        return wrapper
+    return decorator
+
+
+# -----------------------------
+# Invalidation
+# -----------------------------
+
+_DIRTY_KEY = "page_cache.dirty"
+INVALIDATE_ON = (JobPosting, Rating)
+
+
+@event.listens_for(Session, "before_flush")
+def _mark_dirty(session, flush_context, instances):
+    if any(isinstance(obj, INVALIDATE_ON) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_dirty(state):
+    mapper = state.bind_mapper
+    if (state.is_update or state.is_delete) and mapper is not None and mapper.class_ in INVALIDATE_ON:
+        state.session.info[_DIRTY_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop(_DIRTY_KEY, False) and has_app_context():
+        try:
+            invalidate()
+        except Exception:
+            log.exception("page cache invalidation failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_dirty(session):
+    session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,262 @@
+# app/profiler.py
+"""
+On-demand sampling profiler for live requests.
+
+Off by default, and when ``PROFILER_ENABLED`` is off ``init_app`` registers
+nothing: there is no per-request check at all. When it is on, a request is
+profiled if either
+
+* it carries ``X-Profile: <token>``, a signed, time-limited token an admin
+  copies from ``/admin/profiles`` (so the header can't be forged or replayed
+  after ``PROFILER_TOKEN_TTL``), or
+* it wins a ``PROFILER_SAMPLE_RATE`` draw; ``PROFILER_ENDPOINTS`` limits the
+  draw to named endpoints, e.g. ``admin.task_triage``.
+
+A profiled request gets a ``StackSampler``, a helper thread that reads the
+request thread's Python stack every ``PROFILER_INTERVAL_MS`` (pure stdlib;
+the request itself runs uninstrumented). Sampling stops when the request is
+torn down or after ``PROFILER_MAX_SECONDS``. The result is written to
+``instance/profiles`` as ``<name>.collapsed``, one ``frame;frame;... count``
+line per distinct stack, which flamegraph.pl, speedscope and inferno read as
+is. A ``<name>.json`` sidecar holds the endpoint, status, timing and request
+ID. Only the newest ``PROFILER_KEEP`` profiles are kept.
+
+Any object with ``start()``, ``stop() -> seconds``, ``counts`` (stack ->
+samples) and ``samples`` can replace the sampler:
+``app.extensions["profiler"]["sampler"] = MySampler`` (called with the thread
+id, interval and time limit).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import current_app, g, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+log = logging.getLogger(__name__)
+
+HEADER = "X-Profile"
+_NAME = re.compile(r"^[\w.-]+$")
+
+
+class StackSampler:
+    """Counts one thread's Python stacks, sampled from a helper thread every ``interval`` seconds."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005, max_seconds: float = 60.0):
+        self.thread_id, self.interval, self.max_seconds = thread_id, interval, max_seconds
+        self.counts: Counter[str] = Counter()
+        self.samples = 0
+        self._labels: dict = {}  # code object -> "module:qualname"
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> float:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return time.perf_counter() - self._started
+
+    def _run(self):
+        deadline = self._started + self.max_seconds
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or time.perf_counter() > deadline:
+                break
+            self.counts[self._collapse(frame)] += 1
+            self.samples += 1
+            del frame  # don't keep the request's locals alive between samples
+
+    def _collapse(self, frame) -> str:
+        labels, parts = self._labels, []
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                name = getattr(code, "co_qualname", code.co_name)
+                label = labels[code] = f"{frame.f_globals.get('__name__', '?')}:{name}".replace(";", ",").replace(" ", "_")
+            parts.append(label)
+            frame = frame.f_back
+        return ";".join(reversed(parts))
+
+
+# --- tokens ---
+
+def _serializer(app) -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(secret_key=app.config.get("SECRET_KEY"), salt="profiler")
+
+
+def issue_token(user_id: int) -> str:
+    return _serializer(current_app).dumps({"uid": user_id})
+
+
+def _token_valid(app, token: str) -> bool:
+    try:
+        _serializer(app).loads(token, max_age=int(app.config.get("PROFILER_TOKEN_TTL", 3600)))
+        return True
+    except BadSignature:  # includes SignatureExpired
+        return False
+
+
+# --- storage ---
+
+def profile_dir(app) -> str:
+    return app.config.get("PROFILER_DIR") or os.path.join(app.instance_path, "profiles")
+
+
+def _save(app, sampler, meta: dict) -> str:
+    directory = profile_dir(app)
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S-%f")  # names sort by time, so pruning drops the oldest
+    name = re.sub(r"[^\w.-]", "_", f"{stamp}-{meta['endpoint'] or 'none'}-{meta['request_id'] or os.getpid()}")
+    with open(os.path.join(directory, name + ".collapsed"), "w", encoding="utf-8") as fh:
+        for stack, count in sampler.counts.most_common():
+            fh.write(f"{stack} {count}\n")
+    with open(os.path.join(directory, name + ".json"), "w", encoding="utf-8") as fh:
+        json.dump({**meta, "name": name}, fh)
+    _prune(directory, int(app.config.get("PROFILER_KEEP", 200)))
+    return name
+
+
+def _prune(directory: str, keep: int) -> None:
+    names = sorted(f[:-len(".collapsed")] for f in os.listdir(directory) if f.endswith(".collapsed"))
+    for name in names[:-keep] if keep > 0 else []:
+        for ext in (".collapsed", ".json"):
+            try:
+                os.remove(os.path.join(directory, name + ext))
+            except FileNotFoundError:  # another worker pruned it first
+                pass
+
+
+def list_profiles(app, limit: int = 100) -> list[dict]:
+    """Sidecar metadata of the newest profiles, newest first."""
+    directory = profile_dir(app)
+    if not os.path.isdir(directory):
+        return []
+    out = []
+    for f in sorted((f for f in os.listdir(directory) if f.endswith(".json")), reverse=True)[:limit]:
+        try:
+            with open(os.path.join(directory, f), encoding="utf-8") as fh:
+                out.append(json.load(fh))
+        except (OSError, ValueError):
+            continue
+    return out
+
+
+def profile_path(app, name: str) -> str | None:
+    """Path of a stored profile's collapsed stacks, or None for unknown/invalid names."""
+    if not _NAME.match(name or ""):
+        return None
+    path = os.path.join(profile_dir(app), name + ".collapsed")
+    return path if os.path.isfile(path) else None
+
+
+def load_profile(app, name: str) -> tuple[dict, Counter] | None:
+    path = profile_path(app, name)
+    if path is None:
+        return None
+    counts: Counter[str] = Counter()
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            stack, _, n = line.rstrip("\n").rpartition(" ")
+            if stack and n.isdigit():
+                counts[stack] += int(n)
+    try:
+        with open(path[:-len(".collapsed")] + ".json", encoding="utf-8") as fh:
+            meta = json.load(fh)
+    except (OSError, ValueError):
+        meta = {"name": name}
+    return meta, counts
+
+
+def top_frames(counts: Counter, limit: int = 30) -> list[tuple[str, int, int]]:
+    """``(frame, self samples, inclusive samples)`` for the frames with the most self time."""
+    own: Counter[str] = Counter()
+    total: Counter[str] = Counter()
+    for stack, n in counts.items():
+        frames = stack.split(";")
+        own[frames[-1]] += n
+        for frame in set(frames):
+            total[frame] += n
+    return [(f, n, total[f]) for f, n in own.most_common(limit)]
+
+
+# --- hooks ---
+
+def _should_profile(app) -> str | None:
+    token = request.headers.get(HEADER)
+    if token:
+        if _token_valid(app, token):
+            return "header"
+        log.warning("ignoring %s header with an invalid or expired token", HEADER)
+    rate = float(app.config.get("PROFILER_SAMPLE_RATE") or 0)
+    if rate > 0:
+        endpoints = app.config.get("PROFILER_ENDPOINTS") or ()
+        if isinstance(endpoints, str):
+            endpoints = {e.strip() for e in endpoints.split(",") if e.strip()}
+        if (not endpoints or request.endpoint in endpoints) and random.random() < rate:
+            return "sampled"
+    return None
+
+
+def init_app(app) -> None:
+    if not app.config.get("PROFILER_ENABLED"):
+        return  # nothing registered: zero per-request cost
+    ext = app.extensions["profiler"] = {"sampler": StackSampler}
+    interval = float(app.config.get("PROFILER_INTERVAL_MS", 5)) / 1000
+    max_seconds = float(app.config.get("PROFILER_MAX_SECONDS", 60))
+
+    @app.before_request
+    def _start_profile():
+        trigger = _should_profile(app)
+        if trigger:
+            sampler = ext["sampler"](threading.get_ident(), interval, max_seconds)
+            g._profile = {"sampler": sampler, "trigger": trigger, "at": datetime.utcnow()}
+            sampler.start()
+
+    @app.after_request
+    def _note_profile_status(response):
+        if "_profile" in g:
+            g._profile["status"] = response.status_code
+        return response
+
+    @app.teardown_request
+    def _finish_profile(exc):
+        prof = g.pop("_profile", None)
+        if prof is None:
+            return
+        sampler = prof["sampler"]
+        elapsed = sampler.stop()
+        meta = {
+            "endpoint": request.endpoint,
+            "method": request.method,
+            "path": request.path,
+            "status": prof.get("status", 500 if exc else None),
+            "trigger": prof["trigger"],
+            "request_id": g.get("request_id"),
+            "started_at": prof["at"].isoformat(timespec="seconds"),
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "samples": sampler.samples,
+            "interval_ms": interval * 1000,
+            "pid": os.getpid(),
+        }
+        try:
+            name = _save(app, sampler, meta)
+            log.info("profiled %s %s (%s): %s samples in %.0f ms -> %s",
+                     request.method, request.path, prof["trigger"], sampler.samples, elapsed * 1000, name)
+        except OSError as e:
+            log.warning("could not save profile: %s", e)
@@ -0,0 +1,268 @@
+# app/ratelimit.py
+"""
+Token-bucket rate limiting for public endpoints.
+
+    @main_bp.route("/support/new", methods=["POST"])
+    @rate_limit("3/10m", key="ip", scope="support")
+    @rate_limit("3/10m", key="email", scope="support")
+    def support_new(): ...
+
+A limit "N/period" is a bucket of N tokens refilled at N per period, so it
+allows bursts of N and a steady N per period. Buckets live in a fixed-size
+table in a memory-mapped file (``RATELIMIT_STORAGE``, default
+``instance/ratelimit.bin``) shared by every gunicorn worker on the host; each
+check touches a few bytes of that table under a short byte-range lock and
+never the database. ``RATELIMIT_BACKEND=memory`` keeps buckets per process
+(tests, single worker), and a dotted ``module:Class`` path plugs in anything
+with the same ``hit()`` method (e.g. a Redis implementation for multi-host).
+
+When a bucket is empty the view is not called; the client gets 429 with a
+``Retry-After`` header.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from functools import lru_cache, wraps
+
+from flask import current_app, request
+from flask_login import current_user
+from werkzeug.exceptions import TooManyRequests
+
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes: no cross-process locking
+    fcntl = None
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_LIMIT_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*([smhd])\s*$")
+
+
+@lru_cache(maxsize=128)
+def parse_limit(spec: str) -> tuple[int, float]:
+    """'5/10m' -> (burst=5, rate=5/600 tokens per second)."""
+    m = _LIMIT_RE.match(spec or "")
+    if not m:
+        raise ValueError(f"bad rate limit {spec!r}; expected e.g. '5/10m'")
+    burst = int(m.group(1))
+    seconds = int(m.group(2) or 1) * _PERIODS[m.group(3)]
+    return burst, burst / seconds
+
+
+def _refill(tokens, last, now, rate, burst, cost):
+    tokens = min(float(burst), tokens + max(0.0, now - last) * rate)
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / rate
+
+
+# -----------------------------
+# Shared record tables
+# -----------------------------
+
+class MemoryTable:
+    """Per-process record store with the same ``update()`` contract as SlotTable."""
+
+    def __init__(self, fields: str, max_keys: int = 100_000):
+        self._rows: dict[bytes, tuple] = {}
+        self._lock = threading.Lock()
+        self.max_keys = max_keys
+
+    def update(self, key: bytes, fn):
+        with self._lock:
+            new, result = fn(self._rows.get(key))
+            if len(self._rows) >= self.max_keys and key not in self._rows:
+                self._rows.clear()  # crude but bounded; forgotten keys start fresh
+            self._rows[key] = new
+        return result
+
+
+class SlotTable:
+    """Open-addressed record table in a memory-mapped file shared by processes.
+
+    Each slot is an 8-byte key digest followed by ``fields`` (struct codes; the
+    last one must be a float "last touched" time used for eviction). A key
+    probes up to PROBES consecutive slots; if none is free or its own, the
+    stalest slot in the window is recycled and the key starts fresh. Updates
+    hold a byte-range lock on just those slots.
+    """
+    PROBES = 8
+
+    def __init__(self, path: str, slots: int, fields: str):
+        self.path = path
+        self.slots = slots
+        self.record = struct.Struct("<Q" + fields)
+        self.size = slots * self.record.size
+        self._pid = None
+        self._lock = threading.Lock()  # fcntl locks don't exclude threads of one process
+
+    def _map(self):
+        if self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            if os.fstat(fd).st_size < self.size:
+                os.ftruncate(fd, self.size)
+            self._fd = fd
+            self._mm = mmap.mmap(fd, self.size)
+            self._pid = os.getpid()
+        return self._mm
+
+    def update(self, key: bytes, fn):
+        """Call ``fn(values or None) -> (new_values, result)`` under the slot lock."""
+        digest = int.from_bytes(key[:8], "little") or 1  # 0 marks an empty slot
+        size = self.record.size
+        offset = (digest % (self.slots - self.PROBES)) * size
+        length = self.PROBES * size
+
+        with self._lock:
+            mm = self._map()
+            if fcntl:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, length, offset)
+            try:
+                pos, values, free, stalest = None, None, None, None
+                for i in range(self.PROBES):
+                    p = offset + i * size
+                    k, *rest = self.record.unpack_from(mm, p)
+                    if k == digest:
+                        pos, values = p, tuple(rest)
+                        break
+                    if k == 0 and free is None:
+                        free = p
+                    if stalest is None or rest[-1] < stalest[1]:
+                        stalest = (p, rest[-1])
+                if pos is None:
+                    pos = free if free is not None else stalest[0]
+                new, result = fn(values)
+                self.record.pack_into(mm, pos, digest, *new)
+            finally:
+                if fcntl:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, length, offset)
+        return result
+
+
+def open_table(app, name: str, fields: str, *, backend: str | None = None, slots: int | None = None):
+    """A SlotTable at ``instance/<name>.bin`` (or a MemoryTable when asked / no fcntl)."""
+    backend = backend or ("mmap" if fcntl else "memory")
+    if backend == "memory":
+        return MemoryTable(fields)
+    path = os.path.join(app.instance_path, f"{name}.bin")
+    return SlotTable(path, slots or 65536, fields)
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+
+class MemoryBackend:
+    """Per-process buckets. Fine for tests and single-worker deployments."""
+    FIELDS = "dd"  # tokens, last refill
+
+    def __init__(self, app=None):
+        self.table = MemoryTable(self.FIELDS)
+
+    def hit(self, key: bytes, burst: int, rate: float, cost: int = 1):
+        now = time.time()
+
+        def take(values):
+            tokens, last = values or (float(burst), now)
+            ok, tokens, retry = _refill(tokens, last, now, rate, burst, cost)
+            return (tokens, now), (ok, retry)
+
+        return self.table.update(key, take)
+
+
+class MmapBackend(MemoryBackend):
+    """Buckets in a SlotTable shared by every worker on the host; an evicted
+    bucket simply starts full again, which errs on the side of allowing."""
+
+    def __init__(self, app):
+        path = app.config.get("RATELIMIT_STORAGE") or os.path.join(app.instance_path, "ratelimit.bin")
+        self.table = SlotTable(path, int(app.config.get("RATELIMIT_SLOTS", 65536)), self.FIELDS)
+
+
+_BACKENDS = {"memory": MemoryBackend, "mmap": MmapBackend}
+
+
+def _load_backend(app):
+    name = app.config.get("RATELIMIT_BACKEND") or ("mmap" if fcntl else "memory")
+    cls = _BACKENDS.get(name)
+    if cls is None:
+        module, _, attr = name.partition(":")
+        cls = getattr(importlib.import_module(module), attr)
+    return cls(app)
+
+
+def get_backend():
+    app = current_app._get_current_object()
+    backend = app.extensions.get("ratelimit")
+    if backend is None:
+        backend = app.extensions["ratelimit"] = _load_backend(app)
+    return backend
+
+
+# -----------------------------
+# Keys & decorator
+# -----------------------------
+
+def client_ip() -> str:
+    # wsgi.py's ProxyFix has already resolved X-Forwarded-For from the trusted
+    # proxy; the raw header is client-controlled and must not pick the bucket
+    return request.remote_addr or "0.0.0.0"
+
+
+def _key_value(key) -> str | None:
+    if callable(key):
+        return key()
+    if key == "ip":
+        return client_ip()
+    if key == "user":
+        return f"u{current_user.id}" if current_user.is_authenticated else client_ip()
+    if key == "email":
+        email = (request.form.get("email") or "").strip().lower()
+        return email or None  # no email -> nothing to limit on this key
+    raise ValueError(f"unknown rate-limit key {key!r}")
+
+
+def check(scope: str, key_name: str, value: str, limit: str, cost: int = 1) -> float:
+    """Take ``cost`` tokens; returns 0 when allowed, else seconds until retry."""
+    burst, rate = parse_limit(limit)
+    digest = hashlib.blake2b(f"{scope}|{key_name}|{value}".encode(), digest_size=8).digest()
+    ok, retry = get_backend().hit(digest, burst, rate, cost)
+    return 0.0 if ok else retry
+
+
+def rate_limit(limit: str, *, key="ip", scope: str | None = None, methods=("POST",)):
+    """Limit a view per ``key`` ('ip', 'user', 'email' or a callable returning a string).
+
+    ``limit`` may be a callable (evaluated per request, e.g. to read config).
+    ``RATELIMITS`` in config can override the limit per scope, e.g.
+    ``{"support": "5/10m"}``; ``RATELIMIT_ENABLED=0`` turns every limit off.
+    """
+    if not callable(limit):
+        parse_limit(limit)  # fail at import time on a typo
+    key_name = key if isinstance(key, str) else getattr(key, "__name__", "custom")
+
+    def decorator(fn):
+        bucket_scope = scope or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cfg = current_app.config
+            if cfg.get("RATELIMIT_ENABLED", True) and request.method in methods:
+                value = _key_value(key)
+                if value is not None:
+                    spec = (cfg.get("RATELIMITS") or {}).get(bucket_scope) or (limit() if callable(limit) else limit)
+                    retry = check(bucket_scope, key_name, value, spec)
+                    if retry:
+                        raise TooManyRequests(retry_after=max(1, math.ceil(retry)))
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
@@ -0,0 +1,80 @@
+# app/request_id.py
+"""
+Request correlation IDs.
+
+Every request gets an ID generated here or, with ``REQUEST_ID_TRUST_HEADER``,
+taken from a well-formed incoming ``X-Request-ID``. Only turn that on behind
+a proxy or load balancer that sets the header on every request: a client
+could otherwise reuse another request's ID and add entries to its trace.
+The ID lives in ``g.request_id`` and is echoed back in the response header.
+From there:
+
+* every log record made while handling the request carries it
+  (``logging_queue.RequestIdFilter``), in JSON and text logs alike;
+* background jobs inherit the ID of the request that enqueued them
+  (services/jobs.py), so a receipt email sent from the pool logs under the
+  checkout that triggered it;
+* outbound calls (``outbound_headers()``, used for Pesapal) and emails
+  send it along as ``X-Request-ID``;
+* ``REQUEST_LOG`` writes one line per request with method, path, status and
+  time taken, which gives the admin trace view (``/admin/trace``) its
+  durations.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+import uuid
+
+from flask import g, has_app_context, request
+
+log = logging.getLogger(__name__)
+
+HEADER = "X-Request-ID"
+# Accept what proxies commonly send (uuids, hex, "<host>/<n>"-style ids); anything else is replaced
+_VALID = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._:/@+=-]{7,127}$")
+
+
+def new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def is_valid(value: str | None) -> bool:
+    return bool(value) and _VALID.match(value) is not None
+
+
+def current() -> str | None:
+    """The ID of the request (or job) being handled, if any."""
+    return g.get("request_id") if has_app_context() else None
+
+
+def outbound_headers(headers: dict | None = None) -> dict:
+    """``headers`` plus ``X-Request-ID`` for calls made on behalf of the current request."""
+    headers = dict(headers or {})
+    rid = current()
+    if rid:
+        headers.setdefault(HEADER, rid)
+    return headers
+
+
+def init_app(app) -> None:
+    trust_incoming = app.config.get("REQUEST_ID_TRUST_HEADER", False)
+    log_requests = app.config.get("REQUEST_LOG", True)
+
+    @app.before_request
+    def _assign_request_id():
+        incoming = request.headers.get(HEADER, "").strip()
+        g.request_id = incoming if trust_incoming and is_valid(incoming) else new_id()
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _echo_request_id(response):
+        rid = g.get("request_id")
+        if rid:
+            response.headers[HEADER] = rid
+        started = g.get("request_started")
+        if log_requests and started is not None and request.endpoint != "static":
+            log.info("%s %s -> %s in %.1f ms", request.method, request.path, response.status_code,
+                     (time.perf_counter() - started) * 1000)
+        return response
@@ -0,0 +1,33 @@
+# app/services/assignment_notifications.py
+import logging
+
+from sqlalchemy.orm import joinedload
+
+from ..models.assignment import Assignment
+from .email_service import send_email
+
+log = logging.getLogger(__name__)
+
+
+def email_assignment_invites(assignment_ids) -> int:
+    """Send the invite email for each assignment id. Meant to run as one background job."""
+    if not assignment_ids:
+        return 0
+    rows = (Assignment.query
+            .options(joinedload(Assignment.task), joinedload(Assignment.assignee))
+            .filter(Assignment.id.in_(assignment_ids))
+            .all())
+    sent = 0
+    for a in rows:
+        if not a.assignee or not a.assignee.email:
+            continue
+        if send_email(
+            to=a.assignee.email,
+            subject=f"TaskDesk Assignment — Task #{a.task_id}",
+            template='assignment_invite.html',
+            assignment=a,
+            task=a.task,
+        ):
+            sent += 1
+    log.info("assignment invites: %s/%s sent", sent, len(rows))
+    return sent
@@ -0,0 +1,172 @@
+# app/services/audit_log.py
+"""
+Buffered admin audit writes.
+
+``record()`` appends rows to an in-process buffer and returns immediately; a
+daemon thread writes the buffer with one executemany INSERT as soon as it
+reaches ``AUDIT_BATCH_SIZE`` rows, and otherwise every ``AUDIT_FLUSH_SECONDS``.
+Writes use their own engine connection, so they never ride on (or commit) the
+request's session.
+
+Falls back to a synchronous insert when buffering is off, the writer thread is
+not running (e.g. it died, or we are in a freshly forked worker before
+restart), or the buffer is full. A failed batch is retried once on the next
+cycle; rows that fail twice are logged and dropped (counted in ``dropped``),
+so a dead database can't grow the buffer past ``AUDIT_MAX_BUFFER``. The
+buffer is drained at interpreter exit.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+
+from flask import current_app, has_request_context, request
+from sqlalchemy import insert
+
+from ..extensions import db
+from ..models.audit import AdminAudit
+
+log = logging.getLogger(__name__)
+
+
+class AuditBuffer:
+    def __init__(self, app):
+        self.app = app
+        self.batch_size = int(app.config.get("AUDIT_BATCH_SIZE", 100))
+        self.interval = float(app.config.get("AUDIT_FLUSH_SECONDS", 1.0))
+        self.max_rows = int(app.config.get("AUDIT_MAX_BUFFER", 10000))
+        self.pid = os.getpid()
+        self._rows: deque = deque()
+        self._retry: list = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="admin-audit-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        return self.pid == os.getpid() and self._thread.is_alive() and not self._stop.is_set()
+
+    def offer(self, rows) -> bool:
+        """Queue rows; False means the caller must write them itself."""
+        if not self.alive:
+            return False
+        with self._lock:
+            if len(self._retry) + len(self._rows) + len(rows) > self.max_rows:
+                return False
+            self._rows.extend(rows)
+            full = len(self._rows) >= self.batch_size
+        if full:
+            self._wake.set()
+        return True
+
+    def _take(self) -> tuple[list, list]:
+        """(rows already retried once, fresh rows)"""
+        with self._lock:
+            retried, fresh = self._retry, list(self._rows)
+            self._retry = []
+            self._rows.clear()
+        return retried, fresh
+
+    def flush(self) -> int:
+        retried, fresh = self._take()
+        if not retried and not fresh:
+            return 0
+        try:
+            _write(self.app, retried + fresh)
+        except Exception:
+            log.exception("admin audit flush failed (%s rows); retrying %s next cycle, dropping %s",
+                          len(retried) + len(fresh), len(fresh), len(retried))
+            for row in retried:
+                log.error("dropped admin audit row: %s", row)
+            with self._lock:
+                self.dropped += len(retried)
+                self._retry = fresh
+            return 0
+        return len(retried) + len(fresh)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
+
+
+def _write(app, rows) -> None:
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(insert(AdminAudit), rows)
+
+
+_buffer: AuditBuffer | None = None
+_buffer_lock = threading.Lock()
+
+
+def _get_buffer(app) -> AuditBuffer | None:
+    global _buffer
+    if not app.config.get("AUDIT_BUFFERED", True):
+        return None
+    with _buffer_lock:
+        if _buffer is None or _buffer.pid != os.getpid():
+            try:
+                _buffer = AuditBuffer(app)
+            except Exception:
+                log.exception("could not start admin audit writer; writing synchronously")
+                return None
+        return _buffer
+
+
+def start(app) -> bool:
+    """Start this process's writer thread now rather than on the first record (forked workers)."""
+    return _get_buffer(app) is not None
+
+
+def flush() -> int:
+    """Write everything buffered in this process now."""
+    return _buffer.flush() if _buffer is not None and _buffer.pid == os.getpid() else 0
+
+
+def shutdown() -> None:
+    global _buffer
+    if _buffer is not None and _buffer.pid == os.getpid():
+        _buffer.close()
+    _buffer = None
+
+
+atexit.register(shutdown)
+
+
+def record(*, actor_id, action: str, targets=None, meta: dict | None = None,
+           target_type: str = "user") -> None:
+    """Audit one admin action against zero or more targets (one row per target)."""
+    app = current_app._get_current_object()
+    now = datetime.utcnow()
+    group_id = uuid.uuid4().hex
+    ip = request.remote_addr if has_request_context() else None
+    rows = [
+        dict(created_at=now, actor_id=actor_id, action=action, target_type=target_type,
+             target_id=tid, group_id=group_id, ip=ip, meta=meta)
+        for tid in (list(targets) if targets else [None])
+    ]
+
+    buf = _get_buffer(app)
+    if buf is not None and buf.offer(rows):
+        return
+    try:
+        _write(app, rows)
+    except Exception:
+        log.exception("admin audit write failed: %s by %s on %s", action, actor_id, targets)
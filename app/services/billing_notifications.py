@@ -65,3 +65,19 @@ def email_payment_received(task, invoice, payment: dict) -> bool:
     if pdf_bytes:
         kwargs["attachments"] = [(f"receipt_{invoice.id}.pdf", pdf_bytes, "application/pdf")]
     return bool(send_email(**kwargs))
+
+def email_invoices_created(invoice_ids) -> int:
+    """Batch form of email_invoice_created for a background job (takes ids, not objects)."""
+    from sqlalchemy.orm import selectinload
+    from ..models.invoice import Invoice
+    sent = 0
+    invoices = (Invoice.query
+                .options(selectinload(Invoice.task))
+                .filter(Invoice.id.in_(invoice_ids))
+                .all())
+    for invoice in invoices:
+        try:
+            sent += bool(email_invoice_created(invoice.task, invoice))
+        except Exception:
+            current_app.logger.exception("invoice email failed for invoice %s", invoice.id)
+    return sent
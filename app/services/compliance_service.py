@@ -0,0 +1,336 @@
+# app/services/compliance_service.py
+"""
+GDPR data export and erasure, run as background jobs (see services/jobs.py).
+
+Export streams every table section as JSON Lines straight into a ZIP on disk
+(``instance/exports/gdpr``): rows are read with ``yield_per`` partitions and
+uploaded blobs are copied in fixed-size chunks, so memory stays flat however
+much a user has. The requesting admin gets an email with a download link.
+Finished exports are deleted after ``GDPR_EXPORT_RETENTION_DAYS``
+(``sweep_exports``, run before each new export and by
+``flask compliance sweep-exports``).
+
+Erasure anonymises or deletes the user's rows in small batches, committing
+after each one, so no statement holds locks on a busy table for long. It
+covers everything the export contains: uploads (rows and files), support
+tickets with their messages and attachments, and the user's export ZIPs.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import secrets
+import shutil
+import time
+import zipfile
+from datetime import date, datetime
+from pathlib import Path
+
+from flask import current_app, url_for
+from sqlalchemy import case, delete, or_, select, update
+
+from ..extensions import db
+from ..models.assignment import Assignment
+from ..models.careers import JobApplication
+from ..models.feedback import Rating
+from ..models.fileasset import FileAsset
+from ..models.invoice import Invoice
+from ..models.marketing import Subscriber
+from ..models.quote import Quote
+from ..models.support import SupportAttachment, SupportMessage, SupportTicket
+from ..models.task import TaskRequest
+from ..models.user import (ClientProfile, FreelancerEducation, FreelancerExperience,
+                           FreelancerProfile, KycSubmission, User)
+from ..models.work import WorkSubmission
+from . import audit_log
+from .email_service import send_email
+
+log = logging.getLogger(__name__)
+
+READ_CHUNK_ROWS = 500
+COPY_CHUNK_BYTES = 1024 * 1024
+ERASE_BATCH_ROWS = 200
+ERASED_TEXT = "[erased]"
+
+# Never exported, even to the data subject
+_SECRET_COLUMNS = {"password_hash"}
+
+
+def export_dir() -> Path:
+    path = Path(current_app.instance_path) / "exports" / "gdpr"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def upload_path(relpath: str) -> Path | None:
+    """Absolute path of a stored upload, or None if it escapes the upload root."""
+    base = Path(current_app.config.get("UPLOAD_FOLDER") or Path(current_app.instance_path) / "uploads").resolve()
+    full = (base / (relpath or "")).resolve()
+    return full if full.is_relative_to(base) and full != base else None
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+# -----------------------------
+# Export
+# -----------------------------
+
+def _write_jsonl(zf: zipfile.ZipFile, arcname: str, model, *where) -> int:
+    table = model.__table__
+    cols = [c for c in table.c if c.name not in _SECRET_COLUMNS]
+    stmt = select(*cols).where(*where).order_by(table.c.id).execution_options(yield_per=READ_CHUNK_ROWS)
+    n = 0
+    with zf.open(arcname, "w", force_zip64=True) as fh:
+        result = db.session.execute(stmt)
+        try:
+            for partition in result.partitions(READ_CHUNK_ROWS):
+                fh.write("".join(
+                    json.dumps(dict(row._mapping), default=_json_default, ensure_ascii=False) + "\n"
+                    for row in partition
+                ).encode("utf-8"))
+                n += len(partition)
+        finally:
+            result.close()
+    return n
+
+
+def _copy_blobs(zf: zipfile.ZipFile, assets) -> int:
+    copied = 0
+    for asset_id, relpath, filename in assets:
+        src = upload_path(relpath)
+        if src is None or not src.is_file():
+            continue
+        arcname = f"files/{asset_id}_{os.path.basename(filename or src.name)}"
+        with open(src, "rb") as fin, zf.open(arcname, "w", force_zip64=True) as fout:
+            shutil.copyfileobj(fin, fout, COPY_CHUNK_BYTES)
+        copied += 1
+    return copied
+
+
+def build_export(user: User) -> Path:
+    """Write the ZIP for one user and return its path."""
+    uid, email = user.id, (user.email or "").lower()
+    task_ids = select(TaskRequest.id).where(TaskRequest.client_id == uid).scalar_subquery()
+    ticket_ids = select(SupportTicket.id).where(
+        or_(SupportTicket.user_id == uid, SupportTicket.email == email)
+    ).scalar_subquery()
+
+    sections = [
+        ("user.jsonl", User, (User.id == uid,)),
+        ("client_profile.jsonl", ClientProfile, (ClientProfile.user_id == uid,)),
+        ("freelancer_profile.jsonl", FreelancerProfile, (FreelancerProfile.user_id == uid,)),
+        ("experience.jsonl", FreelancerExperience, (FreelancerExperience.user_id == uid,)),
+        ("education.jsonl", FreelancerEducation, (FreelancerEducation.user_id == uid,)),
+        ("kyc_submissions.jsonl", KycSubmission, (KycSubmission.user_id == uid,)),
+        ("tasks.jsonl", TaskRequest, (TaskRequest.client_id == uid,)),
+        ("quotes.jsonl", Quote, (Quote.task_id.in_(task_ids),)),
+        ("invoices.jsonl", Invoice, (Invoice.task_id.in_(task_ids),)),
+        ("assignments.jsonl", Assignment, (Assignment.assignee_id == uid,)),
+        ("work_submissions.jsonl", WorkSubmission, (WorkSubmission.by_user_id == uid,)),
+        ("files.jsonl", FileAsset, (FileAsset.owner_id == uid,)),
+        ("support_tickets.jsonl", SupportTicket, (SupportTicket.id.in_(ticket_ids),)),
+        ("support_messages.jsonl", SupportMessage, (SupportMessage.ticket_id.in_(ticket_ids),)),
+        ("ratings.jsonl", Rating, (or_(Rating.user_id == uid, Rating.email == email),)),
+        ("job_applications.jsonl", JobApplication, (JobApplication.email == email,)),
+        ("subscriptions.jsonl", Subscriber, (Subscriber.email == email,)),
+    ]
+
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    final = export_dir() / f"user-{uid}-{stamp}-{secrets.token_hex(8)}.zip"
+    partial = final.with_suffix(".zip.part")
+
+    counts = {}
+    try:
+        with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for arcname, model, where in sections:
+                counts[arcname] = _write_jsonl(zf, arcname, model, *where)
+            assets = db.session.execute(
+                select(FileAsset.id, FileAsset.path, FileAsset.filename)
+                .where(FileAsset.owner_id == uid)
+                .execution_options(yield_per=READ_CHUNK_ROWS)
+            )
+            counts["files/"] = _copy_blobs(zf, assets)
+            zf.writestr("manifest.json", json.dumps({
+                "user_id": uid, "generated_at": datetime.utcnow().isoformat() + "Z", "counts": counts,
+            }, indent=2))
+        partial.replace(final)
+    except BaseException:
+        _remove_file(partial)  # a half-written ZIP still holds personal data
+        raise
+    return final
+
+
+def sweep_exports(max_age_days: float | None = None) -> int:
+    """Delete export ZIPs (and leftover ``.part`` files) older than the retention period; returns how many."""
+    if max_age_days is None:
+        max_age_days = float(current_app.config.get("GDPR_EXPORT_RETENTION_DAYS", 7))
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in export_dir().glob("user-*.zip*"):
+        try:
+            if path.stat().st_mtime >= cutoff:
+                continue
+        except FileNotFoundError:  # swept by another worker
+            continue
+        _remove_file(path)
+        removed += 1
+    if removed:
+        log.info("removed %s GDPR export file(s) older than %s days", removed, max_age_days)
+    return removed
+
+
+def export_user_data(user_id: int, requested_by: int) -> str | None:
+    """Background job: build the export and email the admin who asked for it."""
+    user = db.session.get(User, user_id)
+    admin = db.session.get(User, requested_by)
+    if not user:
+        return None
+
+    sweep_exports()
+    path = build_export(user)
+    log.info("GDPR export for user %s written to %s (%s bytes)", user_id, path.name, path.stat().st_size)
+    audit_log.record(actor_id=requested_by, action="gdpr_export", targets=[user_id], meta={"file": path.name})
+
+    if admin and admin.email:
+        send_email(
+            to=admin.email,
+            subject=f"Data export ready — user #{user.id}",
+            template="gdpr_export_ready.html",
+            user=user,
+            download_url=url_for("admin.compliance_download", name=path.name, _external=True),
+            size_bytes=path.stat().st_size,
+        )
+    return path.name
+
+
+# -----------------------------
+# Erasure
+# -----------------------------
+
+def _batched(model, where, *, values=None, before=None, chunk: int = ERASE_BATCH_ROWS) -> int:
+    """UPDATE (or DELETE when values is None) matching rows ``chunk`` ids at a time,
+    committing after each batch so locks are short-lived. ``before(ids)`` runs
+    ahead of each batch (e.g. to remove the files those rows point at)."""
+    pk = model.__table__.c.id
+    last_id, total = 0, 0
+    while True:
+        ids = list(db.session.scalars(
+            select(pk).where(*where, pk > last_id).order_by(pk).limit(chunk)
+        ))
+        if not ids:
+            return total
+        if before is not None:
+            before(ids)
+        stmt = (update(model).values(**values) if values is not None else delete(model)).where(pk.in_(ids))
+        db.session.execute(stmt.execution_options(synchronize_session=False))
+        db.session.commit()
+        total += len(ids)
+        last_id = ids[-1]
+
+
+def _remove_file(path: Path | None) -> None:
+    if path is None:
+        return
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        log.warning("could not remove %s", path)
+
+
+def _remove_asset_blobs(ids) -> None:
+    for (relpath,) in db.session.execute(select(FileAsset.path).where(FileAsset.id.in_(ids))):
+        _remove_file(upload_path(relpath))
+
+
+def _remove_support_blobs(ids) -> None:
+    root = Path(current_app.instance_path, "support_uploads").resolve()
+    for (path,) in db.session.execute(select(SupportAttachment.path).where(SupportAttachment.id.in_(ids))):
+        p = (root / (path or "")).resolve()  # stored absolute; anything outside the root is left alone
+        _remove_file(p if p.is_relative_to(root) and p != root else None)
+
+
+def erase_user_data(user_id: int, requested_by: int) -> dict:
+    """Background job: anonymise the user's personal data in bounded transactions."""
+    user = db.session.get(User, user_id)
+    if not user:
+        return {}
+    uid, email = user.id, (user.email or "").lower()
+    placeholder = f"erased+{uid}@invalid.local"
+    counts = {}
+
+    # KYC documents: remove blobs first, then the rows that point at them
+    kyc_file_ids = set()
+    for front, back, selfie in db.session.execute(
+        select(KycSubmission.file_id_front, KycSubmission.file_id_back, KycSubmission.file_id_selfie)
+        .where(KycSubmission.user_id == uid)
+    ):
+        kyc_file_ids.update(i for i in (front, back, selfie) if i)
+    counts["kyc_submissions"] = _batched(KycSubmission, (KycSubmission.user_id == uid,), values=dict(
+        id_number=None, country=None, review_note=None,
+        file_id_front=None, file_id_back=None, file_id_selfie=None,
+    ))
+    if kyc_file_ids:
+        counts["kyc_files"] = _batched(FileAsset, (FileAsset.id.in_(kyc_file_ids),), before=_remove_asset_blobs)
+    # Every other upload the export included
+    counts["files"] = _batched(FileAsset, (FileAsset.owner_id == uid,), before=_remove_asset_blobs)
+
+    counts["experience"] = _batched(FreelancerExperience, (FreelancerExperience.user_id == uid,))
+    counts["education"] = _batched(FreelancerEducation, (FreelancerEducation.user_id == uid,))
+    counts["freelancer_profile"] = _batched(FreelancerProfile, (FreelancerProfile.user_id == uid,), values=dict(
+        headline=None, bio=None, skills=None, location=None, portfolio_url=None, payout_email=None,
+    ))
+    counts["client_profile"] = _batched(ClientProfile, (ClientProfile.user_id == uid,), values=dict(
+        company=None, billing_email=None,
+    ))
+
+    # Messages and attachments first: the ticket lookup matches on the email that is about to be replaced
+    ticket_where = (or_(SupportTicket.user_id == uid, SupportTicket.email == email),)
+    ticket_ids = select(SupportTicket.id).where(*ticket_where).scalar_subquery()
+    counts["support_messages"] = _batched(
+        SupportMessage, (or_(SupportMessage.ticket_id.in_(ticket_ids), SupportMessage.author_user_id == uid),),
+        values=dict(body=ERASED_TEXT, author_user_id=case(
+            (SupportMessage.author_user_id == uid, None), else_=SupportMessage.author_user_id,
+        )),
+    )
+    counts["support_attachments"] = _batched(SupportAttachment, (SupportAttachment.ticket_id.in_(ticket_ids),),
+                                             before=_remove_support_blobs)
+    counts["support_tickets"] = _batched(SupportTicket, ticket_where, values=dict(
+        name="Deleted user", email=placeholder, ip_address=None, message=ERASED_TEXT,
+    ))
+    counts["ratings"] = _batched(Rating, (or_(Rating.user_id == uid, Rating.email == email),), values=dict(
+        name=None, email=None, ip=None, user_agent=None,
+    ))
+
+    resumes_root = Path(current_app.instance_path, "resumes").resolve()
+    for (resume,) in db.session.execute(
+        select(JobApplication.resume_path).where(JobApplication.email == email, JobApplication.resume_path.isnot(None))
+    ):
+        p = (resumes_root / resume).resolve()
+        _remove_file(p if p.is_relative_to(resumes_root) else None)
+    counts["job_applications"] = _batched(JobApplication, (JobApplication.email == email,), values=dict(
+        name="Deleted user", email=placeholder, phone=None, cover_letter=None,
+        resume_path=None, resume_filename=None,
+    ))
+    counts["subscriptions"] = _batched(Subscriber, (Subscriber.email == email,))
+
+    exports = list(export_dir().glob(f"user-{uid}-*.zip")) + list(export_dir().glob(f"user-{uid}-*.zip.part"))
+    for path in exports:
+        _remove_file(path)
+    counts["exports"] = len(exports)
+
+    # The account itself last, so a failed run can simply be re-queued
+    now = datetime.utcnow()
+    db.session.execute(update(User).where(User.id == uid).values(
+        name="Deleted user", email=placeholder, phone=None, password_hash=None,
+        status="deleted", deleted_at=user.deleted_at or now, mfa_enabled=False,
+    ).execution_options(synchronize_session=False))
+    db.session.commit()
+
+    log.info("GDPR erasure for user %s done: %s", uid, counts)
+    audit_log.record(actor_id=requested_by, action="gdpr_erase", targets=[uid], meta=counts)
+    return counts
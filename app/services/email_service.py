@@ -2,6 +2,7 @@
 from flask import current_app, render_template
 from flask_mail import Message
 from ..extensions import mail
+from ..request_id import HEADER as REQUEST_ID_HEADER, current as current_request_id
 import logging, mimetypes
 from email.mime.image import MIMEImage
 
@@ -26,7 +27,10 @@ def send_email(*, to, subject, template, attachments=None, inline_images=None, *
             log.error("send_email: no sender configured")
             return False
 
-        msg = Message(subject=subject, recipients=recipients, sender=sender)
+        # X-Request-ID lets a bounce or forwarded email be traced back to the request that sent it
+        rid = current_request_id()
+        msg = Message(subject=subject, recipients=recipients, sender=sender,
+                      extra_headers={REQUEST_ID_HEADER: rid} if rid else None)
         if txt:
             msg.body = txt
         msg.html = html
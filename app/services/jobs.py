@@ -0,0 +1,103 @@
+# app/services/jobs.py
+"""
+In-process background jobs.
+
+A small bounded thread pool per worker process for work that should not hold
+up the response (notification batches, exports). Each job runs inside its own
+app context plus a request context built from the enqueuing request's base URL,
+so ``url_for(..., _external=True)`` in email templates keeps working. The job
+inherits the enqueuing request's correlation ID (``g.request_id``), so its log
+lines, outbound calls and emails trace back to that request.
+
+The pool is created lazily and is pid-aware: a pool inherited across a fork is
+dropped and rebuilt in the child. Set ``JOBS_SYNC=1`` to run jobs inline
+(tests, one-off scripts).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from flask import current_app, g, has_request_context, request
+
+from .. import request_id
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+
+
+def _get_executor(app) -> ThreadPoolExecutor:
+    global _executor, _executor_pid
+    pid = os.getpid()
+    with _lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(app.config.get("JOBS_MAX_WORKERS", 2)),
+                thread_name_prefix="taskdesk-job",
+            )
+            _executor_pid = pid
+        return _executor
+
+
+def reset_executor() -> None:
+    """Forget the current pool (e.g. after fork); the next enqueue builds a fresh one."""
+    global _executor, _executor_pid
+    with _lock:
+        _executor, _executor_pid = None, None
+
+
+def _base_url(app) -> str:
+    if has_request_context():
+        return request.host_url
+    return app.config.get("EXTERNAL_BASE_URL") or "http://localhost/"
+
+
+def _run(app, base_url, rid, name, fn, args, kwargs):
+    # Fresh app context first so the job gets its own scoped db session,
+    # even when run inline from inside a request.
+    with app.app_context(), app.test_request_context("/", base_url=base_url):
+        g.request_id = rid or request_id.new_id()
+        t0 = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+            log.info("background job %s finished in %.1f ms", name, (time.perf_counter() - t0) * 1000)
+            return result
+        except Exception:
+            log.exception("background job %s failed after %.1f ms", name, (time.perf_counter() - t0) * 1000)
+            raise
+        finally:
+            from ..extensions import db
+            db.session.remove()
+
+
+def enqueue(fn, *args, **kwargs) -> Future:
+    """Run ``fn(*args, **kwargs)`` on the job pool. Pass ids, not ORM objects."""
+    app = current_app._get_current_object()
+    name = getattr(fn, "__name__", repr(fn))
+    base_url = _base_url(app)
+    rid = request_id.current()
+
+    if app.config.get("JOBS_SYNC"):
+        fut: Future = Future()
+        try:
+            fut.set_result(_run(app, base_url, rid, name, fn, args, kwargs))
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+    fut = _get_executor(app).submit(_run, app, base_url, rid, name, fn, args, kwargs)
+    fut.add_done_callback(lambda f: _log_failure(name, f))
+    return fut
+
+
+def _log_failure(name, fut: Future) -> None:
+    # Nobody waits on pool futures; make sure an error that escapes _run's own logging is still seen
+    exc = None if fut.cancelled() else fut.exception()
+    if exc is not None:
+        log.error("background job %s raised %r", name, exc, exc_info=exc)
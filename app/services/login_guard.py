@@ -0,0 +1,210 @@
+# app/services/login_guard.py
+"""
+Credential-stuffing guard for ``auth.login``.
+
+Failed logins are counted per client IP and per account in sliding windows
+(``LOGIN_GUARD_WINDOW`` seconds, estimated from the current and previous
+fixed window). Crossing a threshold locks that IP / account out for
+``LOGIN_GUARD_LOCKOUT_BASE`` seconds, doubling with every further lockout up
+to ``LOGIN_GUARD_LOCKOUT_MAX``; a successful login clears the account's
+record. While locked, ``blocked()`` rejects the attempt *before* the user is
+loaded or the password KDF runs, so a flood costs a few bytes of shared
+memory per request instead of a hash.
+
+Counters live in a SlotTable under ``instance/`` (see app/ratelimit.py), so
+every gunicorn worker on the host sees the same state.
+
+Password verification can be moved onto a small bounded thread pool
+(``LOGIN_KDF_WORKERS`` > 0). A process then never runs more than that many
+KDFs at once, and attempts that cannot get a slot within
+``LOGIN_KDF_WAIT`` seconds are turned away rather than queued behind the
+flood.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from ..ratelimit import open_table
+
+log = logging.getLogger(__name__)
+
+# cur_window_start, cur_count, prev_count, locked_until, strikes, last_seen
+_FIELDS = "dIIdId"
+
+METRICS = ("failures", "lockouts", "rejected_ip", "rejected_account", "kdf_busy")
+_METRIC_FIELDS = "Qd"  # count, last_seen
+
+
+class KdfBusy(Exception):
+    """No KDF slot freed up in time; the caller should ask the user to retry."""
+
+
+def _digest(*parts) -> bytes:
+    return hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).digest()
+
+
+def _settings(app) -> dict:
+    c = app.config
+    return dict(
+        window=float(c.get("LOGIN_GUARD_WINDOW", 900)),
+        ip_max=int(c.get("LOGIN_GUARD_IP_MAX", 20)),
+        account_max=int(c.get("LOGIN_GUARD_ACCOUNT_MAX", 5)),
+        base=float(c.get("LOGIN_GUARD_LOCKOUT_BASE", 30)),
+        cap=float(c.get("LOGIN_GUARD_LOCKOUT_MAX", 3600)),
+    )
+
+
+def _tables(app):
+    guard = app.extensions.get("login_guard")
+    if guard is None:
+        backend = app.config.get("LOGIN_GUARD_BACKEND")
+        guard = app.extensions["login_guard"] = (
+            open_table(app, "login_guard", _FIELDS, backend=backend,
+                       slots=int(app.config.get("LOGIN_GUARD_SLOTS", 16384))),
+            open_table(app, "login_guard_metrics", _METRIC_FIELDS, backend=backend, slots=64),
+        )
+    return guard
+
+
+def _bump(name: str, n: int = 1) -> None:
+    _, metrics = _tables(current_app)
+    now = time.time()
+    metrics.update(_digest("metric", name), lambda v: (((v[0] if v else 0) + n, now), None))
+
+
+def metrics() -> dict:
+    """Host-wide counters since the metrics file was created."""
+    _, table = _tables(current_app)
+    out = {}
+    for name in METRICS:
+        out[name] = table.update(_digest("metric", name), lambda v: ((v or (0, 0.0)), (v or (0,))[0]))
+    return out
+
+
+# -----------------------------
+# Counters
+# -----------------------------
+
+def _roll(values, now, window):
+    """Advance a record to the window containing ``now``."""
+    if values is None:
+        return now, 0, 0, 0.0, 0, now
+    start, cur, prev, locked_until, strikes, _ = values
+    elapsed = now - start
+    if elapsed >= 2 * window:
+        # quiet for a whole window: forget the counts, and the strikes once unlocked
+        return now, 0, 0, locked_until, (strikes if locked_until > now else 0), now
+    if elapsed >= window:
+        return start + window, 0, cur, locked_until, strikes, now
+    return start, cur, prev, locked_until, strikes, now
+
+
+def _estimate(values, now, window) -> float:
+    start, cur, prev = values[0], values[1], values[2]
+    return cur + prev * max(0.0, 1 - (now - start) / window)
+
+
+def _locked_for(table, key, now, window) -> float:
+    def peek(values):
+        values = _roll(values, now, window)
+        return values, max(0.0, values[3] - now)
+    return table.update(key, peek)
+
+
+def _fail(table, key, now, s, limit) -> float:
+    def add(values):
+        start, cur, prev, locked_until, strikes, seen = _roll(values, now, s["window"])
+        cur += 1
+        lock = 0.0
+        if locked_until <= now and _estimate((start, cur, prev), now, s["window"]) >= limit:
+            strikes += 1
+            lock = min(s["cap"], s["base"] * 2 ** (strikes - 1))
+            locked_until = now + lock
+        return (start, cur, prev, locked_until, strikes, seen), lock
+    return table.update(key, add)
+
+
+def blocked(ip: str, email: str) -> float:
+    """Seconds until this IP / account may try again (0 = go ahead). Never touches the DB."""
+    app = current_app._get_current_object()
+    if not app.config.get("LOGIN_GUARD_ENABLED", True):
+        return 0.0
+    table, _ = _tables(app)
+    window, now = _settings(app)["window"], time.time()
+    ip_wait = _locked_for(table, _digest("ip", ip), now, window)
+    acct_wait = _locked_for(table, _digest("acct", email), now, window) if email else 0.0
+    if ip_wait:
+        _bump("rejected_ip")
+    elif acct_wait:
+        _bump("rejected_account")
+    return max(ip_wait, acct_wait)
+
+
+def record_failure(ip: str, email: str) -> None:
+    app = current_app._get_current_object()
+    if not app.config.get("LOGIN_GUARD_ENABLED", True):
+        return
+    table, _ = _tables(app)
+    s, now = _settings(app), time.time()
+    ip_lock = _fail(table, _digest("ip", ip), now, s, s["ip_max"])
+    acct_lock = _fail(table, _digest("acct", email), now, s, s["account_max"]) if email else 0.0
+    _bump("failures")
+    for kind, who, lock in (("ip", ip, ip_lock), ("account", email, acct_lock)):
+        if lock:
+            _bump("lockouts")
+            log.warning("login guard: %s %s locked out for %ss", kind, who, int(lock))
+
+
+def record_success(email: str) -> None:
+    app = current_app._get_current_object()
+    if not app.config.get("LOGIN_GUARD_ENABLED", True) or not email:
+        return
+    table, _ = _tables(app)
+    now = time.time()
+    table.update(_digest("acct", email), lambda v: ((now, 0, 0, 0.0, 0, now), None))
+
+
+# -----------------------------
+# KDF offload
+# -----------------------------
+
+_pool: ThreadPoolExecutor | None = None
+_slots: threading.BoundedSemaphore | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int):
+    global _pool, _slots, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="login-kdf")
+            _slots = threading.BoundedSemaphore(workers)
+            _pool_pid = os.getpid()
+        return _pool, _slots
+
+
+def check_password(user, password: str) -> bool:
+    """``user.check_password`` on the bounded KDF pool when enabled, else inline.
+
+    Raises KdfBusy if no slot frees up within LOGIN_KDF_WAIT seconds.
+    """
+    workers = int(current_app.config.get("LOGIN_KDF_WORKERS", 0))
+    if workers <= 0:
+        return user.check_password(password)
+
+    pool, slots = _get_pool(workers)
+    if not slots.acquire(timeout=float(current_app.config.get("LOGIN_KDF_WAIT", 2.0))):
+        _bump("kdf_busy")
+        raise KdfBusy()
+    try:
+        return pool.submit(user.check_password, password).result()
+    finally:
+        slots.release()
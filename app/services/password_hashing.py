@@ -0,0 +1,90 @@
+# app/services/password_hashing.py
+"""
+Password hash parameters.
+
+``PASSWORD_HASH_METHOD`` picks the Werkzeug method string used for new hashes
+(e.g. ``scrypt:65536:8:1`` or ``pbkdf2:sha256:1000000``; default: Werkzeug's
+``scrypt``). Werkzeug stores that method string in front of every hash, so
+``needs_rehash()`` can tell when a stored hash was made with other parameters;
+``auth.login`` then re-hashes the password it has just verified, and cost
+changes roll out as users sign in, without a forced reset.
+
+``flask security hash-bench`` times the candidates on this machine and
+recommends the strongest one within a target login latency.
+"""
+from __future__ import annotations
+
+import statistics
+import time
+
+from flask import current_app, has_app_context
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt"
+
+# What Werkzeug fills in for omitted parameters
+_SCRYPT_DEFAULTS = ("32768", "8", "1")
+_PBKDF2_DEFAULTS = ("sha256", str(DEFAULT_PBKDF2_ITERATIONS))
+
+CANDIDATES = (
+    "scrypt:16384:8:1", "scrypt:32768:8:1", "scrypt:65536:8:1", "scrypt:131072:8:1",
+    "pbkdf2:sha256:600000", "pbkdf2:sha256:1000000", "pbkdf2:sha256:2000000",
+)
+
+
+def canonical(method: str) -> str:
+    """Method string with Werkzeug's defaults filled in ('scrypt' -> 'scrypt:32768:8:1')."""
+    name, *args = (method or "").split(":")
+    defaults = {"scrypt": _SCRYPT_DEFAULTS, "pbkdf2": _PBKDF2_DEFAULTS}.get(name)
+    if defaults is None:
+        return method
+    return ":".join([name, *args, *defaults[len(args):]])
+
+
+def configured_method() -> str:
+    method = current_app.config.get("PASSWORD_HASH_METHOD") if has_app_context() else None
+    return method or DEFAULT_METHOD
+
+
+def hash_password(password: str, method: str | None = None) -> str:
+    return generate_password_hash(password, method=method or configured_method())
+
+
+def needs_rehash(stored: str | None) -> bool:
+    """True if ``stored`` was made with a different method or cost than configured."""
+    if not stored or "$" not in stored:
+        return False
+    return canonical(stored.split("$", 1)[0]) != canonical(configured_method())
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+
+def benchmark(methods=CANDIDATES, *, rounds: int = 5, password: str = "correct horse battery staple"):
+    """Median hash / verify milliseconds for each method on this machine."""
+    results = []
+    for method in methods:
+        hash_ms, verify_ms = [], []
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            stored = generate_password_hash(password, method=method)
+            t1 = time.perf_counter()
+            check_password_hash(stored, password)
+            t2 = time.perf_counter()
+            hash_ms.append((t1 - t0) * 1000)
+            verify_ms.append((t2 - t1) * 1000)
+        results.append({
+            "method": canonical(method),
+            "hash_ms": statistics.median(hash_ms),
+            "verify_ms": statistics.median(verify_ms),
+        })
+    return results
+
+
+def recommend(results, target_ms: float) -> dict | None:
+    """Slowest (strongest) candidate whose verify time fits the target, preferring scrypt."""
+    fitting = [r for r in results if r["verify_ms"] <= target_ms]
+    if not fitting:
+        return None
+    return max(fitting, key=lambda r: (r["method"].startswith("scrypt"), r["verify_ms"]))
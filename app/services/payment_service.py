@@ -1,13 +1,20 @@
 # app/services/payment_service.py
 from __future__ import annotations
-import time, requests
+import threading
+import time
 from flask import current_app, url_for
 from typing import Tuple, Optional
 import logging
+from ..request_id import outbound_headers
 log = logging.getLogger(__name__)
 
 _token_cache: dict[str, tuple[str, float]] = {}  # {"key": (token, expiry_ts)}
 
+def _http():
+    # requests (+ urllib3, certifi) costs ~100 ms to import; only payment calls need it
+    import requests
+    return requests
+
 def _base_urls():
     if current_app.config.get("PESAPAL_USE_SANDBOX", True):
         return (
@@ -16,23 +23,28 @@ def _base_urls():
         )
     return ("https://pay.pesapal.com/v3/api", "https://pay.pesapal.com/PesapalIframe3")
 
-def _auth_token() -> str:
+def reset_token_cache() -> None:
+    """Forget cached tokens (each forked worker fetches and refreshes its own)."""
+    _token_cache.clear()
+
+def _auth_token(min_ttl: float = 30) -> str:
     """Fetch or reuse short-lived Bearer token (5 min)."""
     key = current_app.config["PESAPAL_CONSUMER_KEY"]
     sec = current_app.config["PESAPAL_CONSUMER_SECRET"]
     cache_key = f"{key}|{int(current_app.config.get('PESAPAL_USE_SANDBOX', True))}"
     tok, exp = _token_cache.get(cache_key, (None, 0))
     now = time.time()
-    if tok and now < exp - 30:
+    if tok and now < exp - min_ttl:
         return tok
 
     api_base, _ = _base_urls()
-    resp = requests.post(
+    resp = _http().post(
         f"{api_base}/Auth/RequestToken",
         json={"consumer_key": key, "consumer_secret": sec},
-        headers={"Accept":"application/json", "Content-Type":"application/json"},
+        headers=outbound_headers({"Accept":"application/json", "Content-Type":"application/json"}),
         timeout=20
     )
+    log.info("Pesapal RequestToken status=%s in %.0f ms", resp.status_code, resp.elapsed.total_seconds() * 1000)
     resp.raise_for_status()
     data = resp.json()
     token = data["token"]
@@ -61,14 +73,14 @@ def submit_order_request(*, merchant_ref: str, amount: float, currency: str,
         }
     }
     try:
-        r = requests.post(
+        r = _http().post(
             f"{api_base}/Transactions/SubmitOrderRequest",
             json=payload,
-            headers={"Authorization": f"Bearer {token}", "Accept":"application/json", "Content-Type":"application/json"},
+            headers=outbound_headers({"Authorization": f"Bearer {token}", "Accept":"application/json", "Content-Type":"application/json"}),
             timeout=20
         )
         # Log both success & failures (sanitize)
-        log.info("Pesapal SubmitOrderRequest status=%s", r.status_code)
+        log.info("Pesapal SubmitOrderRequest status=%s in %.0f ms", r.status_code, r.elapsed.total_seconds() * 1000)
         if r.status_code >= 400:
             log.error("Pesapal error %s | body=%s | payload=%s", r.status_code, r.text, {k: payload[k] for k in ['id','currency','amount','callback_url','notification_id']})
         r.raise_for_status()
@@ -82,11 +94,33 @@ def submit_order_request(*, merchant_ref: str, amount: float, currency: str,
 def get_transaction_status(order_tracking_id: str) -> dict:
     token = _auth_token()
     api_base, _ = _base_urls()
-    r = requests.get(
+    r = _http().get(
         f"{api_base}/Transactions/GetTransactionStatus",
         params={"orderTrackingId": order_tracking_id},
-        headers={"Authorization": f"Bearer {token}", "Accept":"application/json"},
+        headers=outbound_headers({"Authorization": f"Bearer {token}", "Accept":"application/json"}),
         timeout=20
     )
+    log.info("Pesapal GetTransactionStatus status=%s in %.0f ms", r.status_code, r.elapsed.total_seconds() * 1000)
     r.raise_for_status()
     return r.json()
+
+def start_token_refresher(app, interval: float = 60) -> threading.Thread | None:
+    """Keep this worker's token fresh in the background so checkouts never wait on RequestToken.
+
+    Opt-in (PESAPAL_TOKEN_REFRESH) and only with credentials configured.
+    """
+    if not (app.config.get("PESAPAL_TOKEN_REFRESH") and app.config.get("PESAPAL_CONSUMER_KEY")):
+        return None
+
+    def _loop():
+        while True:
+            with app.app_context():
+                try:
+                    _auth_token(min_ttl=interval + 30)  # renew before the next wake-up would find it expired
+                except Exception as e:
+                    log.warning("Pesapal token refresh failed: %s", e)
+            time.sleep(interval)
+
+    t = threading.Thread(target=_loop, name="pesapal-token-refresh", daemon=True)
+    t.start()
+    return t
@@ -5,6 +5,7 @@ import os
 import shutil
 import base64
 import logging
+from functools import lru_cache
 from typing import Optional
 
 from flask import render_template, current_app
@@ -12,33 +13,37 @@ from flask import render_template, current_app
 log = logging.getLogger(__name__)
 
 # -----------------------------
-# Prefer WeasyPrint (Linux)
+# Engines, imported on first render: WeasyPrint (Linux), then wkhtmltopdf/pdfkit,
+# then ReportLab. Loading them at import time cost every process, including
+# the CLI, for a feature only invoices and receipts use.
 # -----------------------------
-try:
-    from weasyprint import HTML  # type: ignore
-    _HAS_WEASY = True
-except Exception:
-    _HAS_WEASY = False
+@lru_cache(maxsize=None)
+def _weasyprint():
+    try:
+        from weasyprint import HTML  # type: ignore
+        return HTML
+    except Exception:
+        return None
 
-# -----------------------------
-# Fallback: wkhtmltopdf/pdfkit
-# -----------------------------
-try:
-    import pdfkit  # type: ignore
-    _HAS_PDFKIT = True
-except Exception:
-    _HAS_PDFKIT = False
 
-# -----------------------------
-# Final fallback: ReportLab
-# -----------------------------
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.units import mm
-    from reportlab.pdfgen import canvas
-    _HAS_REPORTLAB = True
-except Exception:
-    _HAS_REPORTLAB = False
+@lru_cache(maxsize=None)
+def _pdfkit():
+    try:
+        import pdfkit  # type: ignore
+        return pdfkit
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _reportlab():
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import mm
+        from reportlab.pdfgen import canvas
+        return A4, mm, canvas
+    except Exception:
+        return None
 
 
 def _wkhtmltopdf_path() -> Optional[str]:
@@ -76,6 +81,7 @@ def _render_pdf_reportlab(template_name: str, **context) -> bytes:
     """
     from io import BytesIO
 
+    A4, mm, canvas = _reportlab()
     buf = BytesIO()
     c = canvas.Canvas(buf, pagesize=A4)
     W, H = A4
@@ -139,7 +145,8 @@ def render_pdf(template_name: str, **context) -> Optional[bytes]:
     html = render_template(template_name, **context)
 
     # 1) WeasyPrint (best CSS support; use on Linux servers)
-    if _HAS_WEASY:
+    HTML = _weasyprint()
+    if HTML is not None:
         try:
             log.info("PDF: trying WeasyPrint")
             # base_url lets relative /static paths resolve in CSS/images (if you use them)
@@ -150,7 +157,8 @@ def render_pdf(template_name: str, **context) -> Optional[bytes]:
             log.warning("PDF: WeasyPrint failed, falling back to pdfkit: %s", e)
 
     # 2) pdfkit / wkhtmltopdf (works well with simple, inline CSS; avoid flex/grid)
-    if _HAS_PDFKIT:
+    pdfkit = _pdfkit()
+    if pdfkit is not None:
         try:
             log.info("PDF: trying pdfkit/wkhtmltopdf")
             wk = _wkhtmltopdf_path()
@@ -173,7 +181,7 @@ def render_pdf(template_name: str, **context) -> Optional[bytes]:
             log.warning("PDF: pdfkit/wkhtmltopdf failed, falling back to ReportLab: %s", e)
 
     # 3) ReportLab fallback (guarantees we attach a valid PDF)
-    if _HAS_REPORTLAB:
+    if _reportlab() is not None:
         try:
             log.info("PDF: using ReportLab fallback")
             return _render_pdf_reportlab(template_name, **context)
@@ -0,0 +1,195 @@
+# app/services/rating_aggregates.py
+"""
+Incrementally maintained rating aggregates.
+
+An ``after_flush`` hook turns every change to a Rating (insert, hide/unhide,
+delete/restore, a changed star value or freelancer) into +1/-1 deltas on the
+site, freelancer and day rows of ``rating_aggregate``, applied on the flush's
+own connection so they commit or roll back together with the rating. Reading
+an average or the 1-5 histogram is then a single-row lookup instead of an
+AVG over ``ratings``.
+
+Bulk Core UPDATEs bypass the hook; ``rebuild()`` (``flask ratings rebuild``)
+recomputes everything from scratch.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime
+
+from flask import has_app_context
+from sqlalchemy import delete, event, func, insert, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models.feedback import Rating, RatingAggregate
+from ..models.user import FreelancerProfile
+
+log = logging.getLogger(__name__)
+
+SITE = ("site", "")
+SITE_CACHE_KEY = "ratings:site"  # site_summary() in the shared cache (footer)
+_CHANGED_KEY = "rating_aggregates.changed"
+_STAR_COLS = {n: f"stars_{n}" for n in range(1, 6)}
+
+
+def _visible(is_public, is_deleted) -> bool:
+    return bool(is_public) and not is_deleted
+
+
+def _day_key(created_at) -> str:
+    d = created_at or datetime.utcnow()
+    return (d.date() if isinstance(d, datetime) else d).isoformat()
+
+
+def _buckets(freelancer_id, created_at):
+    yield SITE
+    if freelancer_id:
+        yield ("freelancer", str(freelancer_id))
+    yield ("day", _day_key(created_at))
+
+
+def _state(obj, *, old: bool):
+    """(visible, stars, freelancer_id) before or after this flush."""
+    values = {}
+    state = inspect(obj)
+    for attr in ("is_public", "is_deleted", "stars", "freelancer_id"):
+        hist = state.attrs[attr].history
+        values[attr] = (hist.deleted[0] if old and hist.deleted else getattr(obj, attr))
+    return _visible(values["is_public"], values["is_deleted"]), values["stars"], values["freelancer_id"]
+
+
+def _collect(deltas, n, stars, freelancer_id, created_at):
+    """Add ``n`` ratings of ``stars`` (negative to remove) to every bucket they count in."""
+    if stars not in _STAR_COLS:
+        return
+    for bucket in _buckets(freelancer_id, created_at):
+        d = deltas[bucket]
+        d["count"] += n
+        d["total"] += n * stars
+        d[_STAR_COLS[stars]] += n
+
+
+def apply_deltas(connection, deltas) -> None:
+    """Add ``{(scope, key): {"count": n, "total": n, "stars_3": n, ...}}`` to the aggregate rows."""
+    now = datetime.utcnow()
+    t = RatingAggregate.__table__
+    for (scope, key), d in deltas.items():
+        d = {k: v for k, v in d.items() if v}
+        if not d:
+            continue
+        where = (t.c.scope == scope) & (t.c.scope_key == key)
+        stmt = update(t).where(where).values(updated_at=now, **{k: t.c[k] + v for k, v in d.items()})
+        if connection.execute(stmt).rowcount:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(t).values(scope=scope, scope_key=key, updated_at=now, **{
+                    c: d.get(c, 0) for c in ("count", "total", *_STAR_COLS.values())
+                }))
+        except IntegrityError:  # another transaction created the row first
+            connection.execute(stmt)
+
+    freelancers = [int(key) for scope, key in deltas if scope == "freelancer"]
+    if freelancers:
+        _sync_profile_averages(connection, freelancers)
+
+
+def _sync_profile_averages(connection, user_ids) -> None:
+    t = RatingAggregate.__table__
+    averages = dict.fromkeys(user_ids, 0.0)
+    for key, count, total in connection.execute(
+        select(t.c.scope_key, t.c.count, t.c.total)
+        .where(t.c.scope == "freelancer", t.c.scope_key.in_([str(i) for i in user_ids]))
+    ):
+        averages[int(key)] = round(total / count, 2) if count else 0.0
+    fp = FreelancerProfile.__table__
+    for user_id, avg in averages.items():
+        connection.execute(update(fp).where(fp.c.user_id == user_id).values(rating_avg=avg))
+
+
+@event.listens_for(Session, "after_flush")
+def _track_rating_changes(session, flush_context):
+    deltas = defaultdict(lambda: defaultdict(int))
+    for obj in session.new:
+        if isinstance(obj, Rating) and _visible(obj.is_public, obj.is_deleted):
+            _collect(deltas, +1, obj.stars, obj.freelancer_id, obj.created_at)
+    for obj in session.dirty:
+        if not isinstance(obj, Rating) or not session.is_modified(obj, include_collections=False):
+            continue
+        was, now = _state(obj, old=True), _state(obj, old=False)
+        if was != now:
+            if was[0]:
+                _collect(deltas, -1, was[1], was[2], obj.created_at)
+            if now[0]:
+                _collect(deltas, +1, now[1], now[2], obj.created_at)
+    for obj in session.deleted:
+        if isinstance(obj, Rating):
+            was = _state(obj, old=True)
+            if was[0]:
+                _collect(deltas, -1, was[1], was[2], obj.created_at)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+        session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_cached_summary(session):
+    if session.info.pop(_CHANGED_KEY, False) and has_app_context():
+        from .. import shared_cache
+        shared_cache.delete(SITE_CACHE_KEY)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed(session):
+    session.info.pop(_CHANGED_KEY, None)
+
+
+# -----------------------------
+# Reads
+# -----------------------------
+
+def get(scope: str, key: str = "") -> RatingAggregate | None:
+    return db.session.scalar(
+        select(RatingAggregate).where(RatingAggregate.scope == scope, RatingAggregate.scope_key == key)
+    )
+
+
+def site_summary() -> dict:
+    agg = get(*SITE)
+    return {"avg": round(agg.average, 1) if agg else 0.0, "count": agg.count if agg else 0}
+
+
+def daily(days: int = 30) -> list[RatingAggregate]:
+    return list(db.session.scalars(
+        select(RatingAggregate).where(RatingAggregate.scope == "day")
+        .order_by(RatingAggregate.scope_key.desc()).limit(days)
+    ))
+
+
+# -----------------------------
+# Rebuild
+# -----------------------------
+
+def rebuild() -> int:
+    """Recompute every aggregate row from ``ratings``. Commits; returns the row count."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    day = func.date(Rating.created_at)
+    for freelancer_id, d, stars, n in db.session.execute(
+        select(Rating.freelancer_id, day, Rating.stars, func.count())
+        .where(Rating.is_public.is_(True), Rating.is_deleted.is_(False))
+        .group_by(Rating.freelancer_id, day, Rating.stars)
+    ):
+        d = d if isinstance(d, date) else date.fromisoformat(str(d))
+        _collect(deltas, n, stars, freelancer_id, d)
+    conn = db.session.connection()
+    conn.execute(delete(RatingAggregate))
+    conn.execute(update(FreelancerProfile.__table__).values(rating_avg=0.0))
+    apply_deltas(conn, deltas)
+    db.session.commit()
+    from .. import shared_cache
+    shared_cache.delete(SITE_CACHE_KEY)
+    log.info("rating aggregates rebuilt: %s rows", len(deltas))
+    return len(deltas)
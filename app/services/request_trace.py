@@ -0,0 +1,125 @@
+# app/services/request_trace.py
+"""
+Rebuild one request's timeline from the application logs.
+
+Every log line carries its request's correlation ID (app/request_id.py), and
+background jobs log under the ID of the request that enqueued them. So
+grepping the log file and its rotated backups for one ID gives everything that
+happened on its behalf: the request line with its duration, Pesapal calls with
+theirs, jobs, emails and errors, possibly across several workers.
+
+Both log formats are understood: JSON lines (``LOG_JSON=1``, which adds pid and
+thread) and the text format (traceback lines are folded into the record
+above them).
+"""
+from __future__ import annotations
+
+import glob
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from ..request_id import is_valid
+
+# "[2025-01-31 10:00:00,123] INFO in routes [abc123]: message"  (logging_queue.TEXT_FORMAT)
+_TEXT_LINE = re.compile(r"^\[(?P<ts>[\d-]+ [\d:,.]+)\] (?P<level>\w+) in (?P<logger>[\w.]+) \[(?P<rid>[^\]]*)\]: (?P<msg>.*)$")
+_DURATION = re.compile(r"\b(?:in|after) (?P<ms>\d+(?:\.\d+)?) ms\b")
+
+
+@dataclass(slots=True)
+class TraceEvent:
+    at: datetime
+    level: str
+    logger: str
+    msg: str
+    pid: int | None = None
+    thread: str | None = None
+    exc: str | None = None
+    offset_ms: float = 0.0        # since the first event of the trace
+    gap_ms: float = 0.0           # since the previous event
+    duration_ms: float | None = None  # what the line itself reports ("... in 12.3 ms")
+
+
+@dataclass(slots=True)
+class Trace:
+    request_id: str
+    events: list[TraceEvent] = field(default_factory=list)
+    files_scanned: int = 0
+    truncated: bool = False
+
+    @property
+    def span_ms(self) -> float:
+        return self.events[-1].offset_ms if self.events else 0.0
+
+    @property
+    def processes(self) -> list[int]:
+        return sorted({e.pid for e in self.events if e.pid is not None})
+
+
+def log_files(app) -> list[str]:
+    """The current log file and its rotated backups, oldest first."""
+    base = os.path.join(app.config.get("LOG_DIR", "logs"), app.config.get("LOG_FILENAME", "taskdesk.log"))
+    backups = [p for p in glob.glob(base + ".*") if p.rsplit(".", 1)[-1].isdigit()]
+    backups.sort(key=lambda p: int(p.rsplit(".", 1)[-1]), reverse=True)
+    return backups + ([base] if os.path.exists(base) else [])
+
+
+def _parse_json(line: str, rid: str) -> TraceEvent | None:
+    try:
+        doc = json.loads(line)
+    except ValueError:
+        return None
+    if doc.get("request_id") != rid:
+        return None
+    return TraceEvent(at=datetime.fromisoformat(doc["ts"]).replace(tzinfo=None), level=doc.get("level", ""),
+                      logger=doc.get("logger", ""), msg=doc.get("msg", ""), pid=doc.get("pid"),
+                      thread=doc.get("thread"), exc=doc.get("exc"))
+
+
+def _parse_text(line: str, rid: str) -> TraceEvent | None:
+    m = _TEXT_LINE.match(line)
+    if not m or m["rid"] != rid:
+        return None
+    return TraceEvent(at=datetime.strptime(m["ts"].replace(".", ","), "%Y-%m-%d %H:%M:%S,%f"),
+                      level=m["level"], logger=m["logger"], msg=m["msg"])
+
+
+def find_trace(app, rid: str, *, limit: int = 1000) -> Trace:
+    """Collect the log records for ``rid`` into a timeline (at most ``limit`` events)."""
+    trace = Trace(request_id=rid)
+    if not is_valid(rid):
+        return trace
+
+    for path in log_files(app):
+        trace.files_scanned += 1
+        last = None  # text format: the event a traceback line belongs to
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            for line in fh:
+                line = line.rstrip("\n")
+                if rid not in line:
+                    if last is not None and line and not line.startswith("[") and not line.startswith("{"):
+                        last.exc = f"{last.exc}\n{line}" if last.exc else line
+                    else:
+                        last = None
+                    continue
+                event = _parse_json(line, rid) if line.startswith("{") else _parse_text(line, rid)
+                last = event if event is not None and event.pid is None else None
+                if event is None:
+                    continue
+                if len(trace.events) >= limit:
+                    trace.truncated = True
+                    break
+                trace.events.append(event)
+
+    trace.events.sort(key=lambda e: e.at)
+    if trace.events:
+        start = prev = trace.events[0].at
+        for e in trace.events:
+            e.offset_ms = (e.at - start).total_seconds() * 1000
+            e.gap_ms = (e.at - prev).total_seconds() * 1000
+            prev = e.at
+            m = _DURATION.search(e.msg)
+            e.duration_ms = float(m["ms"]) if m else None
+    return trace
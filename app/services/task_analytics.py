@@ -0,0 +1,94 @@
+# app/services/task_analytics.py
+"""
+Time-in-status rollups.
+
+``rollup_status_times()`` is the scheduled job (``flask analytics rollup`` from
+cron). It looks only at task_status_event rows newer than its cursor, works
+out which days they fall on, and recomputes the percentile rows for just those
+days; older days are never rescanned.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+from ..extensions import db
+from ..models.task_history import RollupCursor, TaskStatusEvent, TaskStatusRollup
+
+log = logging.getLogger(__name__)
+
+CURSOR_NAME = "task_status_rollup"
+
+
+def percentile(sorted_values, p: float):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    k = max(0, math.ceil(p * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def _rollup_day(day: date) -> int:
+    start = datetime.combine(day, time.min)
+    groups = defaultdict(list)
+    for status, category, priority, dwell in db.session.execute(
+        select(TaskStatusEvent.from_status, TaskStatusEvent.category,
+               TaskStatusEvent.priority, TaskStatusEvent.dwell_seconds)
+        .where(TaskStatusEvent.created_at >= start,
+               TaskStatusEvent.created_at < start + timedelta(days=1),
+               TaskStatusEvent.from_status.isnot(None),
+               TaskStatusEvent.dwell_seconds.isnot(None))
+    ):
+        groups[(status, category or "", priority or "")].append(dwell)
+
+    now = datetime.utcnow()
+    rows = []
+    for (status, category, priority), values in groups.items():
+        values.sort()
+        rows.append(dict(
+            day=day, status=status, category=category, priority=priority,
+            samples=len(values),
+            p50_seconds=percentile(values, 0.50),
+            p90_seconds=percentile(values, 0.90),
+            p95_seconds=percentile(values, 0.95),
+            max_seconds=values[-1],
+            updated_at=now,
+        ))
+
+    db.session.execute(delete(TaskStatusRollup).where(TaskStatusRollup.day == day))
+    if rows:
+        db.session.execute(insert(TaskStatusRollup), rows)
+    return len(rows)
+
+
+def rollup_status_times(*, rebuild: bool = False) -> dict:
+    """Fold new status events into the daily rollups. Commits."""
+    cursor = db.session.get(RollupCursor, CURSOR_NAME)
+    if cursor is None:
+        cursor = RollupCursor(name=CURSOR_NAME, last_id=0)
+        db.session.add(cursor)
+    if rebuild:
+        cursor.last_id = 0
+        db.session.execute(delete(TaskStatusRollup))
+
+    max_id = db.session.scalar(select(func.max(TaskStatusEvent.id))) or 0
+    if max_id <= cursor.last_id:
+        db.session.commit()
+        return {"events": 0, "days": 0, "rows": 0}
+
+    new_events = TaskStatusEvent.id.between(cursor.last_id + 1, max_id)
+    count = db.session.scalar(select(func.count()).where(new_events)) or 0
+    days = sorted({
+        d if isinstance(d, date) else date.fromisoformat(str(d))
+        for d in db.session.scalars(select(func.date(TaskStatusEvent.created_at)).where(new_events).distinct())
+    })
+
+    rows = sum(_rollup_day(d) for d in days)
+    cursor.last_id = max_id
+    db.session.commit()
+    log.info("task status rollup: %s events over %s day(s) -> %s rows", count, len(days), rows)
+    return {"events": count, "days": len(days), "rows": rows}
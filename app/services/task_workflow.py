@@ -0,0 +1,260 @@
+# app/services/task_workflow.py
+"""
+Task status state machine.
+
+``TRANSITIONS`` maps each target status to the statuses a task may move from.
+``transition()`` applies a move to any number of tasks with one
+``UPDATE ... WHERE id IN (...) AND status IN (allowed_from) RETURNING id``,
+then runs the side effects registered in ``ON_ENTER`` once for exactly the
+rows that changed. Work that must not run before the data is durable (emails)
+is deferred until the session commits.
+
+Every status change, bulk or single-object, is appended to
+``task_status_event`` by ``record_status_changes()``: ``transition()`` calls
+it directly for its Core UPDATE, and an ``after_flush`` hook calls it for
+plain ``task.status = ...`` assignments made anywhere else.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import NamedTuple
+
+from flask import has_request_context
+from flask_login import current_user
+from sqlalchemy import event, func, inspect, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models.invoice import Invoice
+from ..models.quote import Quote
+from ..models.task import TaskRequest
+from ..models.task_history import TaskStatusEvent
+
+log = logging.getLogger(__name__)
+
+ALIASES = {"canceled": "cancelled"}  # UI / older rows use the US spelling
+
+ACTIVE = frozenset({
+    "submitted", "awaiting_quote", "quoted", "pending_accept", "in_progress",
+    "review", "review_scheduled", "awaiting_payment", "delivered",
+})
+ENDED = frozenset({"closed", "cancelled", "canceled", "archived"})
+
+# target -> statuses it may be entered from
+TRANSITIONS: dict[str, frozenset] = {
+    "submitted":        frozenset({"awaiting_quote", "quoted", "pending_accept", "archived", "cancelled", "canceled"}),
+    "quoted":           frozenset({"submitted", "awaiting_quote", "pending_accept"}),
+    "pending_accept":   frozenset({"submitted", "awaiting_quote", "quoted"}),
+    "in_progress":      frozenset({"submitted", "awaiting_quote", "quoted", "pending_accept",
+                                   "review", "review_scheduled", "awaiting_payment"}),
+    "review":           frozenset({"in_progress", "review_scheduled"}),
+    "review_scheduled": frozenset({"in_progress", "review"}),
+    "awaiting_payment": frozenset({"quoted", "pending_accept", "in_progress", "review",
+                                   "review_scheduled", "delivered"}),
+    "delivered":        frozenset({"in_progress", "review", "review_scheduled", "awaiting_payment"}),
+    "closed":           frozenset({"delivered", "awaiting_payment", "review", "review_scheduled"}),
+    "cancelled":        ACTIVE,
+    "archived":         ACTIVE | {"closed", "cancelled", "canceled"},
+}
+
+STATUSES = tuple(TRANSITIONS)
+
+
+def normalize(status: str | None) -> str:
+    s = (status or "").strip().lower()
+    return ALIASES.get(s, s)
+
+
+def can_transition(from_status: str | None, to_status: str) -> bool:
+    allowed = TRANSITIONS.get(normalize(to_status))
+    return bool(allowed) and (from_status or "") in allowed
+
+
+class TransitionResult(NamedTuple):
+    status: str
+    changed: list[int]
+    requested: int
+
+    @property
+    def skipped(self) -> int:
+        return self.requested - len(self.changed)
+
+
+# -----------------------------
+# Deferred (post-commit) work
+# -----------------------------
+
+_DEFERRED_KEY = "task_workflow.after_commit"
+
+
+def defer_until_commit(fn, *args) -> None:
+    """Enqueue ``fn(*args)`` as a background job once the current session commits."""
+    db.session.info.setdefault(_DEFERRED_KEY, []).append((fn, args))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_deferred(session):
+    pending = session.info.pop(_DEFERRED_KEY, None)
+    if not pending:
+        return
+    from .jobs import enqueue
+    for fn, args in pending:
+        try:
+            enqueue(fn, *args)
+        except Exception:
+            log.exception("could not enqueue %s", getattr(fn, "__name__", fn))
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_deferred(session):
+    session.info.pop(_DEFERRED_KEY, None)
+
+
+# -----------------------------
+# Status history (single choke point)
+# -----------------------------
+
+def _actor_id():
+    if has_request_context() and getattr(current_user, "is_authenticated", False):
+        return current_user.id
+    return None
+
+
+def record_status_changes(connection, changes, *, actor_id=None) -> None:
+    """Append one task_status_event per change.
+
+    ``changes`` is a list of (task_id, from_status, to_status, category, priority).
+    dwell_seconds is measured from the task's previous event, looked up for the
+    whole batch in one grouped query.
+    """
+    if not changes:
+        return
+    now = datetime.utcnow()
+    task_ids = {c[0] for c in changes}
+    entered = dict(connection.execute(
+        select(TaskStatusEvent.task_id, func.max(TaskStatusEvent.created_at))
+        .where(TaskStatusEvent.task_id.in_(task_ids))
+        .group_by(TaskStatusEvent.task_id)
+    ).all())
+    if actor_id is None:
+        actor_id = _actor_id()
+    connection.execute(insert(TaskStatusEvent), [
+        dict(task_id=tid, from_status=frm, to_status=to, category=cat, priority=pri,
+             dwell_seconds=((now - entered[tid]).total_seconds() if frm and tid in entered else None),
+             actor_id=actor_id, created_at=now)
+        for tid, frm, to, cat, pri in changes
+    ])
+
+
+@event.listens_for(Session, "after_flush")
+def _capture_orm_status_changes(session, flush_context):
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, TaskRequest) and obj.status:
+            changes.append((obj.id, None, obj.status, obj.category, obj.priority))
+    for obj in session.dirty:
+        if not isinstance(obj, TaskRequest):
+            continue
+        hist = inspect(obj).attrs.status.history
+        if hist.added and hist.deleted and hist.deleted[0] != obj.status:
+            changes.append((obj.id, hist.deleted[0], obj.status, obj.category, obj.priority))
+    if changes:
+        record_status_changes(session.connection(), changes)
+
+
+# -----------------------------
+# Side effects (batched per transition)
+# -----------------------------
+
+def build_review_invoices(task_ids) -> list[Invoice]:
+    """Unpaid invoices for tasks whose latest accepted quote is pay_on_delivery and
+    that have no unpaid invoice yet. Idempotent; adds to the session, no commit."""
+    task_ids = list(task_ids)
+    if not task_ids:
+        return []
+
+    already = set(db.session.scalars(
+        select(Invoice.task_id).where(Invoice.task_id.in_(task_ids), Invoice.status == "unpaid")
+    ))
+    latest: dict[int, tuple] = {}
+    for task_id, price, currency, pay_option in db.session.execute(
+        select(Quote.task_id, Quote.proposed_price, Quote.currency, Quote.pay_option)
+        .where(Quote.task_id.in_(task_ids), Quote.status == "accepted")
+        .order_by(Quote.id.desc())
+    ):
+        latest.setdefault(task_id, (price, currency, pay_option))
+
+    now = datetime.utcnow()
+    invoices = [
+        Invoice(task_id=tid, amount=price, currency=currency, status="unpaid", issued_at=now)
+        for tid, (price, currency, pay_option) in latest.items()
+        if tid not in already and (pay_option or "").lower() == "pay_on_delivery"
+    ]
+    db.session.add_all(invoices)
+    return invoices
+
+
+def _issue_review_invoices(task_ids):
+    invoices = build_review_invoices(task_ids)
+    if invoices:
+        db.session.flush()
+        from .billing_notifications import email_invoices_created
+        defer_until_commit(email_invoices_created, [inv.id for inv in invoices])
+
+
+ON_ENTER = {
+    "review": (_issue_review_invoices,),
+    "review_scheduled": (_issue_review_invoices,),
+}
+
+
+# -----------------------------
+# Engine
+# -----------------------------
+
+def _apply(task_ids, to_status, allowed_from) -> list[int]:
+    # Lock the candidates and keep their current status for the history rows
+    rows = db.session.execute(
+        select(TaskRequest.id, TaskRequest.status, TaskRequest.category, TaskRequest.priority)
+        .where(TaskRequest.id.in_(task_ids), TaskRequest.status.in_(allowed_from))
+        .with_for_update()
+    ).all()
+    if not rows:
+        return []
+
+    stmt = (update(TaskRequest)
+            .where(TaskRequest.id.in_([r.id for r in rows]), TaskRequest.status.in_(allowed_from))
+            .values(status=to_status))
+    bind = db.session.get_bind(mapper=TaskRequest.__mapper__, clause=stmt)
+    if bind.dialect.update_returning:
+        changed = set(db.session.scalars(stmt.returning(TaskRequest.id)))
+    else:  # MySQL: rows are already locked above
+        db.session.execute(stmt)
+        changed = {r.id for r in rows}
+
+    rows = [r for r in rows if r.id in changed]
+    record_status_changes(db.session.connection(),
+                          [(r.id, r.status, to_status, r.category, r.priority) for r in rows])
+    return [r.id for r in rows]
+
+
+def transition(task_ids, to_status: str, *, commit: bool = True) -> TransitionResult:
+    """Move every task in ``task_ids`` that is allowed to enter ``to_status``.
+
+    Raises ValueError for an unknown target status.
+    """
+    to_status = normalize(to_status)
+    allowed_from = TRANSITIONS.get(to_status)
+    if allowed_from is None:
+        raise ValueError(f"unknown task status: {to_status!r}")
+
+    ids = list(dict.fromkeys(int(i) for i in task_ids))
+    changed = _apply(ids, to_status, allowed_from) if ids else []
+
+    if changed:
+        for effect in ON_ENTER.get(to_status, ()):
+            effect(changed)
+    if commit:
+        db.session.commit()
+    return TransitionResult(to_status, changed, len(ids))
@@ -0,0 +1,230 @@
+# app/shared_cache.py
+"""
+Small cross-worker cache for site-wide computed values (rating aggregate,
+global counters).
+
+    avg = shared_cache.get_or_compute("ratings:site", compute_fn, ttl=60)
+
+Values are JSON-serialisable and small. The backend is shared by every
+gunicorn worker on the host, so one worker's recomputation serves the rest:
+
+* ``sqlite`` (default): a WAL-mode SQLite file, ``instance/shared_cache.sqlite``
+* ``mmap``: fixed slots in a SlotTable (values up to VALUE_BYTES of JSON)
+* ``memory``: per process (tests)
+* ``module:Class``: anything with ``get(key)``/``set(key, value, ttl)``/``delete(key)``
+
+A miss is recomputed single-flight: one thread per process, and one process
+per host (an fcntl byte-range lock per key), computes; the others wait and
+then read its result instead of running the same query.
+
+``lazy(fn)`` wraps a lookup so that it only runs when a template actually
+touches the value; context processors can hand it out for free.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from flask import current_app
+
+from .ratelimit import fcntl, open_table
+
+log = logging.getLogger(__name__)
+
+VALUE_BYTES = 240
+_LOCK_SLOTS = 4096
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=8).digest()
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+
+class MemoryBackend:
+    def __init__(self, app=None):
+        self._data: dict[str, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._data.get(key)
+        if hit is None or hit[0] < time.time():
+            return None
+        return hit[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class SqliteBackend:
+    def __init__(self, app):
+        self.path = app.config.get("SHARED_CACHE_PATH") or os.path.join(app.instance_path, "shared_cache.sqlite")
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        self._conn().execute("INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                             (key, json.dumps(value), time.time() + ttl))
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+
+class MmapBackend:
+    """Values in SlotTable records: expires, length, JSON bytes, last write."""
+
+    def __init__(self, app):
+        self.table = open_table(app, "shared_cache", f"dH{VALUE_BYTES}sd", backend="mmap", slots=4096)
+
+    def get(self, key):
+        rec = self.table.update(_digest(key), lambda v: (v or (0.0, 0, b"", 0.0), v))
+        if rec is None or rec[0] < time.time():
+            return None
+        return json.loads(rec[2][:rec[1]])
+
+    def set(self, key, value, ttl):
+        data = json.dumps(value).encode()
+        if len(data) > VALUE_BYTES:
+            raise ValueError(f"shared cache value for {key!r} is {len(data)} bytes (max {VALUE_BYTES})")
+        now = time.time()
+        self.table.update(_digest(key), lambda v: ((now + ttl, len(data), data, now), None))
+
+    def delete(self, key):
+        self.table.update(_digest(key), lambda v: ((0.0, 0, b"", time.time()), None))
+
+
+_BACKENDS = {"memory": MemoryBackend, "sqlite": SqliteBackend, "mmap": MmapBackend}
+
+
+# -----------------------------
+# Cache
+# -----------------------------
+
+class SharedCache:
+    def __init__(self, app):
+        name = app.config.get("SHARED_CACHE_BACKEND") or "sqlite"
+        cls = _BACKENDS.get(name)
+        if cls is None:
+            module, _, attr = name.partition(":")
+            cls = getattr(importlib.import_module(module), attr)
+        self.backend = cls(app)
+        self.lock_path = os.path.join(app.instance_path, "shared_cache.lock")
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self._lock_fd = None
+        self._lock_pid = None
+
+    def _thread_lock(self, key) -> threading.Lock:
+        with self._guard:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _host_lock(self, key, op):
+        if fcntl is None:
+            return
+        if self._lock_pid != os.getpid():
+            self._lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._lock_pid = os.getpid()
+        offset = int.from_bytes(_digest(key), "little") % _LOCK_SLOTS
+        fcntl.lockf(self._lock_fd, op, 1, offset)
+
+    def get(self, key):
+        try:
+            return self.backend.get(key)
+        except Exception:
+            log.warning("shared cache read failed for %s", key, exc_info=True)
+            return None
+
+    def set(self, key, value, ttl):
+        try:
+            self.backend.set(key, value, ttl)
+        except Exception:
+            log.warning("shared cache write failed for %s", key, exc_info=True)
+
+    def delete(self, key):
+        try:
+            self.backend.delete(key)
+        except Exception:
+            log.warning("shared cache delete failed for %s", key, exc_info=True)
+
+    def get_or_compute(self, key, fn, ttl: float):
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._thread_lock(key):
+            value = self.get(key)  # another thread may have filled it meanwhile
+            if value is not None:
+                return value
+            self._host_lock(key, fcntl.LOCK_EX if fcntl else None)
+            try:
+                value = self.get(key)  # ... or another worker
+                if value is None:
+                    value = fn()
+                    self.set(key, value, ttl)
+            finally:
+                self._host_lock(key, fcntl.LOCK_UN if fcntl else None)
+        return value
+
+
+def get_cache(app=None) -> SharedCache:
+    app = app or current_app._get_current_object()
+    cache = app.extensions.get("shared_cache")
+    if cache is None:
+        cache = app.extensions["shared_cache"] = SharedCache(app)
+    return cache
+
+
+def get_or_compute(key, fn, ttl: float = 60):
+    return get_cache().get_or_compute(key, fn, ttl)
+
+
+def delete(key) -> None:
+    get_cache().delete(key)
+
+
+class lazy:
+    """Defer ``fn()`` until an attribute or item of the result is read (once per instance)."""
+    __slots__ = ("_fn", "_value", "_done")
+
+    def __init__(self, fn):
+        self._fn, self._value, self._done = fn, None, False
+
+    def _get(self):
+        if not self._done:
+            self._value, self._done = self._fn(), True
+        return self._value
+
+    def __getattr__(self, name):
+        value = self._get()
+        return value[name] if isinstance(value, dict) else getattr(value, name)
+
+    def __getitem__(self, name):
+        return self._get()[name]
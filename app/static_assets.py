@@ -0,0 +1,211 @@
+# app/static_assets.py
+"""
+Fingerprinted, precompressed static assets.
+
+``flask assets build`` copies every file matching ``ASSET_PATTERNS`` to
+``static/dist/<dir>/<name>.<content hash>.<ext>`` (CSS/JS optionally
+minified first), writes ``.gz`` and, when the ``brotli`` package is
+installed, ``.br`` siblings for text files, and records the mapping in
+``static/dist/manifest.json``.
+
+At runtime ``url_for('static', filename='css/main.css')`` transparently
+returns the hashed path from the manifest (originals are used for anything
+not in it), and the static view serves hashed files with
+``Cache-Control: public, max-age=31536000, immutable`` and the best
+precompressed sibling the client accepts. Content-addressed image variants
+(see image_pipeline.py) get the same immutable header. Those responses
+never carry ``Vary: Cookie`` or a refreshed session cookie
+(``StaticSessionInterface``), so a CDN keeps one copy per encoding rather
+than one per visitor.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import re
+import threading
+from pathlib import Path
+
+from flask import current_app, request, send_from_directory
+from flask.sessions import SecureCookieSessionInterface
+
+try:
+    import brotli
+except ImportError:  # optional: .br siblings are skipped without it
+    brotli = None
+
+# Landing photos are served as variants (image_pipeline.py); only the small icons are copied here
+ASSET_PATTERNS = ("css/*.css", "js/*.js", "img/favicon*.png", "img/logo*.png", "img/*.svg", "img/*.ico")
+DIST_DIR = "dist"
+IMMUTABLE_PREFIXES = (f"{DIST_DIR}/", "img/variants/")
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt"}
+ONE_YEAR = 31536000
+
+
+# -----------------------------
+# Build
+# -----------------------------
+
+def minify_css(text: str) -> str:
+    """Conservative: drop comments and collapse whitespace around braces, semicolons and commas."""
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};,])\s*", r"\1", text)
+    return text.replace(";}", "}").strip()
+
+
+def minify_js(text: str) -> str:
+    try:
+        import rjsmin
+    except ImportError:  # optional dependency; ship unminified
+        return text
+    return rjsmin.jsmin(text)
+
+
+_MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+def _write_compressed(path: Path, data: bytes) -> None:
+    """Write .gz/.br siblings, skipping any that wouldn't be smaller than ``data``."""
+    encoded = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded[".br"] = brotli.compress(data, quality=11)
+    for suffix, blob in encoded.items():
+        if len(blob) < len(data):
+            Path(f"{path}{suffix}").write_bytes(blob)
+
+
+def build_assets(app=None, *, minify: bool = True) -> dict:
+    """Fingerprint and precompress the static assets; returns the manifest."""
+    root = Path((app or current_app).static_folder)
+    dist = root / DIST_DIR
+    manifest = {}
+    for pattern in ASSET_PATTERNS:
+        for src in sorted(root.glob(pattern)):
+            rel = src.relative_to(root).as_posix()
+            data = src.read_bytes()
+            if minify and src.suffix in _MINIFIERS:
+                data = _MINIFIERS[src.suffix](data.decode("utf-8")).encode("utf-8")
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            out_rel = f"{DIST_DIR}/{Path(rel).parent.as_posix()}/{src.stem}.{digest}{src.suffix}"
+            out = root / out_rel
+            if not out.exists():
+                out.parent.mkdir(parents=True, exist_ok=True)
+                out.write_bytes(data)
+                if src.suffix in COMPRESSIBLE:
+                    _write_compressed(out, data)
+            manifest[rel] = out_rel
+
+    # Drop fingerprints no longer referenced (keeps one previous build for in-flight pages)
+    previous = _read_manifest(dist / "manifest.json")
+    keep = set(manifest.values()) | set(previous.values())
+    for path in dist.rglob("*"):
+        if path.is_file() and path.name != "manifest.json":
+            base = path.relative_to(root).as_posix()
+            for suffix in (".gz", ".br"):
+                base = base.removesuffix(suffix)
+            if base not in keep:
+                path.unlink()
+
+    tmp = dist / "manifest.json.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    tmp.replace(dist / "manifest.json")
+    if manifest != previous:
+        # cached pages link the old URLs
+        from .page_cache import invalidate
+        invalidate(app or current_app._get_current_object())
+    return manifest
+
+
+def _read_manifest(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+# -----------------------------
+# Runtime
+# -----------------------------
+
+class AssetManifest:
+    def __init__(self, path: Path, *, watch: bool):
+        self.path, self.watch = path, watch
+        self._mtime, self._data = None, {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            self._mtime, self._data = None, {}
+            return
+        if mtime != self._mtime:
+            self._data, self._mtime = _read_manifest(self.path), mtime
+
+    def get(self, filename):
+        if self.watch:  # debug: pick up `flask assets build` without a restart
+            with self._lock:
+                self._load()
+        return self._data.get(filename)
+
+
+def _pick_encoding(directory: Path, filename: str):
+    accepted = request.accept_encodings
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if accepted[encoding] and (directory / (filename + suffix)).is_file():
+            return encoding, filename + suffix
+    return None, filename
+
+
+class StaticSessionInterface(SecureCookieSessionInterface):
+    """Skips saving an unmodified session on immutable responses.
+
+    Flask-Login reads the session after every request, which would otherwise
+    add ``Vary: Cookie`` (and, for permanent sessions, ``Set-Cookie``) to
+    public assets and make shared caches store them per cookie.
+    """
+
+    def save_session(self, app, session, response):
+        if response.cache_control.immutable and not session.modified:
+            return
+        super().save_session(app, session, response)
+
+
+def init_app(app) -> None:
+    if not app.static_folder:
+        return
+    if type(app.session_interface) is SecureCookieSessionInterface:
+        app.session_interface = StaticSessionInterface()
+    root = Path(app.static_folder)
+    manifest = AssetManifest(root / DIST_DIR / "manifest.json", watch=app.debug)
+    app.extensions["static_assets"] = manifest
+
+    @app.url_defaults
+    def _fingerprint_static(endpoint, values):
+        if endpoint == "static" and app.config.get("STATIC_FINGERPRINT", True):
+            hashed = manifest.get(values.get("filename"))
+            if hashed:
+                values["filename"] = hashed
+
+    serve_default = app.view_functions["static"]
+
+    def static(filename):
+        if not filename.startswith(IMMUTABLE_PREFIXES):
+            return serve_default(filename=filename)
+        encoding, served = _pick_encoding(root, filename) if filename.startswith(DIST_DIR) else (None, filename)
+        resp = send_from_directory(root, served, max_age=ONE_YEAR, conditional=True)
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+            resp.mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        if filename.startswith(DIST_DIR):
+            resp.vary.add("Accept-Encoding")
+        resp.cache_control.public = True
+        resp.cache_control.immutable = True
+        return resp
+
+    app.view_functions["static"] = static
+
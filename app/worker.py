@@ -0,0 +1,71 @@
+# app/worker.py
+"""
+Per-process setup for pre-forking servers (gunicorn ``--preload``; the hooks
+in gunicorn.conf.py call these).
+
+With ``--preload`` create_app() runs once in the master and every worker is
+a fork of it, so anything process-local the master built is duplicated into
+each child: pooled database connections (two processes on one socket corrupt
+each other's protocol state), caches filled in the master, and thread locks
+and pools (threads themselves do not survive a fork). ``after_fork()`` drops
+all of that in the child before it serves a request; ``start_worker_threads()``
+then starts the worker's own background threads.
+
+Most services are already pid-aware (jobs pool, login KDF pool, audit writer,
+rate-limit and shared-cache files) and would rebuild on first use anyway;
+doing it here makes the reset explicit and keeps it off the first request.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import random
+import resource
+
+from .extensions import db
+
+log = logging.getLogger(__name__)
+
+
+def after_fork(app) -> None:
+    """Reset inherited per-process state. Call first thing in a forked worker."""
+    from .services import jobs, payment_service
+
+    with app.app_context():
+        for engine in db.engines.values():
+            # close=False: leave the parent's sockets alone, just forget them here
+            engine.dispose(close=False)
+    payment_service.reset_token_cache()
+    jobs.reset_executor()
+    app.extensions.pop("shared_cache", None)  # key locks and the host-lock fd are per process
+    random.seed()  # don't let every worker draw the same "random" sample sequence
+
+
+def start_worker_threads(app) -> None:
+    """Start this worker's background threads (audit writer, optional token refresher and memory snapshots)."""
+    from . import memory_diag
+    from .services import audit_log, payment_service
+
+    audit_log.start(app)
+    payment_service.start_token_refresher(app)
+    memory_diag.start_autosnapshot(app)  # only with MEMDIAG_AUTOSNAPSHOT_SECONDS
+
+
+def memory_usage() -> dict:
+    """This process's memory in KiB: rss, pss (shared pages split between sharers), uss (private), shared."""
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            fields = {k: int(v.split()[0]) for k, v in (line.split(":", 1) for line in fh if ":" in line)
+                      if v.strip().endswith("kB")}
+    except OSError:  # not Linux: peak RSS is the best we have
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"rss": rss, "pss": None, "uss": None, "shared": None}
+    uss = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {"rss": fields.get("Rss"), "pss": fields.get("Pss"), "uss": uss,
+            "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)}
+
+
+def log_memory(label: str) -> dict:
+    mem = memory_usage()
+    log.info("%s pid=%s memory KiB: %s", label, os.getpid(), " ".join(f"{k}={v}" for k, v in mem.items()))
+    return mem
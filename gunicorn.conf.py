@@ -0,0 +1,59 @@
+# gunicorn.conf.py
+"""
+gunicorn settings for wsgi:app.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Preloads the app in the master by default so workers share its memory
+copy-on-write; the hooks below make that fork-safe (see app/worker.py).
+Every setting can be overridden with the GUNICORN_* variables below or on the
+command line.
+"""
+import multiprocessing
+import os
+
+
+def _as_bool(v):
+    return str(v).lower() in {"1", "true", "yes", "on"}
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+preload_app = _as_bool(os.getenv("GUNICORN_PRELOAD", "1"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Recycle workers now and then so slow leaks can't grow without bound
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-")
+errorlog = "-"
+
+# Compile every template in the master (only useful when preloading)
+if preload_app:
+    os.environ.setdefault("TEMPLATES_PRELOAD", "1")
+
+
+def _flask_app(server):
+    # wsgi.py's module-level Flask app; already loaded in the master when preloading
+    return server.app.wsgi()
+
+
+def when_ready(server):
+    if preload_app:
+        from app.worker import log_memory
+        log_memory("master (preloaded)")
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from app.worker import after_fork
+        after_fork(_flask_app(server))
+
+
+def post_worker_init(worker):
+    from app.worker import log_memory, start_worker_threads
+
+    start_worker_threads(worker.wsgi)
+    log_memory(f"worker {worker.age}")
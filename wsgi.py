@@ -1,5 +1,8 @@
 from app import create_app
+from app.compression import CompressionMiddleware
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 app = create_app()
+if app.config.get("COMPRESS_ENABLED", True):
+    app.wsgi_app = CompressionMiddleware.from_config(app.wsgi_app, app.config)
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_for=1, x_host=1, x_port=1, x_prefix=1)